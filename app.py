@@ -3,15 +3,16 @@ import time
 import bcrypt
 from dotenv import load_dotenv
 import os
-import sys
-import subprocess
 
 from utils.handle_sql import get_data, execute_query
-from rag_agent.main_agent import run_fintech_agent, reset_global_context
-from rag_agent.finrag_agent import load_knowledge_base
+from rag_agent.main_agent import run_fintech_agent, stream_fintech_agent, reset_conversation_memory
+from rag_agent.kb_bootstrap import ensure_knowledge_base, get_status as get_knowledge_base_status
 
 load_dotenv()
 
+# 스트리밍 답변 재렌더링 최소 간격(초)
+STREAM_RENDER_INTERVAL = float(os.getenv("STREAM_RENDER_INTERVAL", "0.05"))
+
 # ==========================================
 # 1. 페이지 설정 및 디자인
 # ==========================================
@@ -143,29 +144,12 @@ def local_css():
     
 local_css()
 
-# ChromaDB 연결 캐싱 및 초기 데이터 구축
+# 금융 용어 지식 베이스 백그라운드 구축 (manifest 검증 -> 필요 시 재구축 -> 벡터 저장소 연결)
+# 구축이 끝날 때까지 FinRAG 는 용어 일치 / BM25 / 웹 검색으로 답변하므로 첫 화면을 막지 않음
 @st.cache_resource
 def init_chroma_connection():
-    target_dir = "data/financial_terms/"
-    needs_setup = False
-    
-    if not os.path.exists(target_dir):
-        needs_setup = True
-    else:
-        files = os.listdir(target_dir)
-        if len(files) == 0 or (len(files) == 1 and files[0] == "chroma.sqlite3"):
-            needs_setup = True
-            
-    if needs_setup:
-        print(f"DB 데이터가 비어있어 'utils/set_chromaDB.py' 스크립트를 실행합니다.")
-        try:
-            subprocess.run([sys.executable, "utils/set_chromaDB.py"], check=True)
-            print("DB 초기화 및 데이터 임베딩이 성공적으로 완료되었습니다.")
-        except subprocess.CalledProcessError as e:
-            print(f"DB 초기화 중 오류가 발생했습니다: {e}")
-            return False
-            
-    load_knowledge_base()
+    status = ensure_knowledge_base()
+    print(f"지식 베이스 준비 상태: {status['status']}")
     return True
 
 init_chroma_connection()
@@ -183,6 +167,8 @@ if 'page' not in st.session_state:
     st.session_state['page'] = 'login'
 if 'allowed_views' not in st.session_state:
     st.session_state['allowed_views'] = []
+if 'preferred_language' not in st.session_state:
+    st.session_state['preferred_language'] = None
 
 if 'messages' not in st.session_state:
     st.session_state['messages'] = [{"role": "assistant", "content": "안녕하세요! 저는 당신의 금융 친구 버디에요! 무엇을 도와드릴까요?"}]
@@ -221,7 +207,7 @@ def login_page():
             
             if submitted:
                 try:
-                    sql = "SELECT pin_code, password, korean_name FROM members WHERE username = %s"
+                    sql = "SELECT pin_code, password, korean_name, preferred_language FROM members WHERE username = %s"
                     user_data = get_data(sql, (username,))
                     
                     if user_data:
@@ -237,10 +223,11 @@ def login_page():
                                 target_hash = target_hash.encode('utf-8')
                             
                             if bcrypt.checkpw(password_input.encode('utf-8'), target_hash):
-                                reset_global_context()
+                                reset_conversation_memory(username)
                                 st.session_state['logged_in'] = True
                                 st.session_state['current_user'] = username
                                 st.session_state['user_name_real'] = korean_name
+                                st.session_state['preferred_language'] = user_data[0].get('preferred_language')
                                 
                                 st.session_state['messages'] = [{"role": "assistant", "content": "안녕하세요! 저는 당신의 금융 친구 버디에요! 무엇을 도와드릴까요?"}]
                                 st.session_state["transfer_context"] = None
@@ -248,6 +235,9 @@ def login_page():
                                 from utils.create_view import create_user_views
                                 view_names = create_user_views(username)
                                 st.session_state['allowed_views'] = view_names
+                                # 첫 DATABASE 질문 전에 스키마 캐시를 백그라운드로 채움
+                                from rag_agent.schema_cache import warm_async
+                                warm_async(view_names)
 
                                 st.session_state['page'] = 'chat'
                                 st.rerun()
@@ -338,11 +328,12 @@ def chat_page():
                         
             with col_logout:
                 if st.button("로그아웃", use_container_width=True):
-                    reset_global_context()
+                    reset_conversation_memory(st.session_state['current_user'])
                     
                     st.session_state['logged_in'] = False
                     st.session_state['current_user'] = None
                     st.session_state['user_name_real'] = None
+                    st.session_state['preferred_language'] = None
                     
                     st.session_state['messages'] = [{"role": "assistant", "content": "안녕하세요! 저는 당신의 금융 친구 버디에요! 무엇을 도와드릴까요?"}]
                     st.session_state['transfer_context'] = None
@@ -354,11 +345,22 @@ def chat_page():
 
         # 2. 새 대화 시작 버튼
         if st.button("✨ 새 대화 시작", use_container_width=True):
+            reset_conversation_memory(st.session_state['current_user'])
             st.session_state['messages'] = [{"role": "assistant", "content": "안녕하세요! 저는 당신의 금융 친구 버디에요! 무엇을 도와드릴까요?"}]
             st.session_state["transfer_context"] = None
             st.session_state["last_result"] = None
             st.rerun()
 
+        # 3. 금융 용어 사전 준비 상태 (백그라운드 구축 중일 때만 표시)
+        kb_status = get_knowledge_base_status()
+        if kb_status["status"] in ("checking", "building"):
+            done, total = kb_status["done"], kb_status["total"]
+            label = f"📚 금융 용어 사전 준비 중... {done} / {total}" if total else "📚 금융 용어 사전 확인 중..."
+            st.progress(kb_status["progress"], text=label)
+            st.caption("준비되는 동안에는 용어 일치 검색과 웹 검색으로 답변해요.")
+        elif kb_status["status"] == "failed":
+            st.warning("금융 용어 사전을 최신 상태로 만들지 못했어요. 기존 사전과 웹 검색으로 답변해요.")
+
     st.caption("🔒 BeoTT Service | Powered by Buddy-Agent")
 
     # 1. 기존 메시지 렌더링 (아바타 로직 추가)
@@ -381,7 +383,8 @@ def chat_page():
                 signal,
                 st.session_state['current_user'],
                 st.session_state["transfer_context"],
-                st.session_state['allowed_views']
+                st.session_state['allowed_views'],
+                preferred_language=st.session_state.get('preferred_language')
             )
             if isinstance(result, dict):
                 st.session_state["transfer_context"] = result.get("context")
@@ -417,54 +420,65 @@ def chat_page():
         # [요구사항 반영] 1단계: '생각 중' 상태를 보여줄 임시 컨테이너 생성
         thinking_placeholder = st.empty()
         
-        # [요구사항 반영] 2단계: 임시 컨테이너에 '생각' 아바타 적용
+        # [요구사항 반영] 2단계: 임시 컨테이너에 '생각' 아바타 적용 (첫 토큰이 도착할 때까지 표시)
         with thinking_placeholder.chat_message("assistant", avatar="img/버디_생각.png"):
-            with st.spinner("버디가 답변을 생성하고 있어요..."):
-                try:
-                    result = run_fintech_agent(
-                        user_input,
-                        st.session_state['current_user'],
-                        st.session_state.get("transfer_context"),
-                        st.session_state['allowed_views']
-                    )
-
-                    if isinstance(result, dict):
-                        if result.get("context"):
-                            st.session_state["transfer_context"] = result["context"]
-                        else:
-                            st.session_state["transfer_context"] = None
+            st.markdown("버디가 답변을 생성하고 있어요...")
 
-                        st.session_state["last_result"] = result
-                        final_response = result.get("message", "")
+        # [요구사항 반영] 3단계: 토큰이 도착하는 대로 '답변' 아바타 블록에 렌더링
+        # 토큰마다 다시 그리면 재렌더링 비용이 커지므로 STREAM_RENDER_INTERVAL 간격으로 모아서 출력
+        message_placeholder = None
+        streamed_text = ""
+        last_render = 0.0
+        result = None
 
-                        if result.get("status") in ["SUCCESS", "CANCEL", "FAIL"]:
-                            st.session_state["transfer_context"] = None
-                            st.session_state["last_result"] = None
-                    else:
-                        st.session_state["transfer_context"] = None
-                        st.session_state["last_result"] = None
-                        final_response = result
+        def open_answer_block():
+            thinking_placeholder.empty()
+            return st.chat_message("assistant", avatar="img/버디_답변.png").empty()
 
-                except Exception as e:
-                    final_response = f"미안해요, 오류가 발생했어요: {e}"
+        try:
+            for event in stream_fintech_agent(
+                user_input,
+                st.session_state['current_user'],
+                st.session_state.get("transfer_context"),
+                st.session_state['allowed_views'],
+                preferred_language=st.session_state.get('preferred_language')
+            ):
+                if event["type"] == "token":
+                    if message_placeholder is None:
+                        message_placeholder = open_answer_block()
+                    streamed_text += event["text"]
+                    if time.time() - last_render >= STREAM_RENDER_INTERVAL:
+                        message_placeholder.markdown(streamed_text + "▌")
+                        last_render = time.time()
+                elif event["type"] == "final":
+                    result = event["result"]
+
+            if isinstance(result, dict):
+                if result.get("context"):
+                    st.session_state["transfer_context"] = result["context"]
+                else:
+                    st.session_state["transfer_context"] = None
+
+                st.session_state["last_result"] = result
+                final_response = result.get("message", "")
+
+                if result.get("status") in ["SUCCESS", "CANCEL", "FAIL"]:
+                    st.session_state["transfer_context"] = None
                     st.session_state["last_result"] = None
+            else:
+                st.session_state["transfer_context"] = None
+                st.session_state["last_result"] = None
+                final_response = result or streamed_text
 
-        # [요구사항 반영] 3단계: 답변 생성이 완료되면 '생각 중' 임시 컨테이너 완전히 삭제
-        thinking_placeholder.empty()
+        except Exception as e:
+            final_response = f"미안해요, 오류가 발생했어요: {e}"
+            st.session_state["last_result"] = None
 
-        # [요구사항 반영] 4단계: '기본' 아바타로 최종 결과 출력 블록 렌더링
-        with st.chat_message("assistant", avatar="img/버디_답변.png"):
-            message_placeholder = st.empty()
-            
-            # 스트리밍 효과
-            streamed_text = ""
-            for char in final_response:
-                streamed_text += char
-                time.sleep(0.005)
-                message_placeholder.markdown(streamed_text + "▌")
-
-            message_placeholder.markdown(streamed_text)
-            st.session_state['messages'].append({"role": "assistant", "content": streamed_text})
+        # [요구사항 반영] 4단계: 최종 결과(서브 에이전트 포맷/역번역 반영본)로 답변 블록 확정
+        if message_placeholder is None:
+            message_placeholder = open_answer_block()
+        message_placeholder.markdown(final_response)
+        st.session_state['messages'].append({"role": "assistant", "content": final_response})
 
         if st.session_state.get("last_result", {}) and \
            st.session_state["last_result"].get("ui_type") == "confirm_buttons":
@@ -0,0 +1,155 @@
+"""
+비동기 파이프라인 동시성 벤치마크
+
+모든 에이전트의 LLM 을 고정 지연(--latency)의 스텁 모델로 교체하고, 같은 질문 묶음을
+세 가지 방식으로 처리해 처리량 / 지연시간 / 사용 스레드 수를 비교합니다.
+  - sequential: run_fintech_agent 를 하나씩 호출 (요청 1건 기준 지연시간)
+  - threads:    스레드 풀(--threads)에서 동기 래퍼 run_fintech_agent 호출 (요청마다 스레드 1개 대기)
+  - async:      arun_fintech_agent 를 하나의 이벤트 루프에서 asyncio.gather 로 동시 실행
+
+질문은 로컬 언어 식별 + 로컬 라우터로 GENERAL 에 분류되는 한국어 인사/도움말이므로
+요청당 LLM 호출은 1회(node_system)이며 OpenAI API 는 호출하지 않습니다. (MySQL 연결도 필요 없음)
+
+사용법:
+    python benchmark/bench_async.py
+    python benchmark/bench_async.py --concurrency 100 --latency 1.0 --threads 8
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# 캐시 적중으로 LLM 호출이 생략되면 비교가 무의미하므로 답변 캐시는 끔
+os.environ["ANSWER_CACHE"] = "false"
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from rag_agent import main_agent, sql_agent, finrag_agent, transfer_agent, web_search_rag
+from utils.async_runner import run_sync
+
+QUESTIONS = ["안녕하세요", "너는 누구야?", "고마워", "도움말 보여줘", "좋은 아침이야"]
+
+class StubChatModel(BaseChatModel):
+    """고정 지연 후 같은 답변을 돌려주는 스텁 (동기: time.sleep / 비동기: asyncio.sleep)"""
+    latency: float = 0.5
+    reply: str = "안녕하세요! 저는 당신의 금융 친구 버디에요."
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-latency"
+
+    def _result(self) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+class ThreadSampler:
+    """실행 중 최대 활성 스레드 수 측정"""
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+def _install_stub(latency: float):
+    stub = StubChatModel(latency=latency)
+    for module in (main_agent, sql_agent, finrag_agent, transfer_agent, web_search_rag):
+        module.llm = stub
+
+def _timed_sync(question: str, username: str) -> float:
+    t0 = time.perf_counter()
+    main_agent.run_fintech_agent(question, username)
+    return time.perf_counter() - t0
+
+async def _timed_async(question: str, username: str) -> float:
+    t0 = time.perf_counter()
+    await main_agent.arun_fintech_agent(question, username)
+    return time.perf_counter() - t0
+
+async def _gather(questions: list) -> list:
+    return await asyncio.gather(*(_timed_async(q, f"bench_{i}") for i, q in enumerate(questions)))
+
+def run_mode(mode: str, questions: list, threads: int) -> dict:
+    with ThreadSampler() as sampler:
+        t0 = time.perf_counter()
+        if mode == "sequential":
+            latencies = [_timed_sync(q, f"bench_{i}") for i, q in enumerate(questions)]
+        elif mode == "threads":
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                latencies = list(pool.map(_timed_sync, questions, [f"bench_{i}" for i in range(len(questions))]))
+        else:
+            latencies = run_sync(_gather(questions))
+        wall = time.perf_counter() - t0
+
+    latencies = sorted(latencies)
+    p95_idx = max(0, int(round(0.95 * len(latencies))) - 1)
+    return {
+        "wall": wall,
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "p50": statistics.median(latencies),
+        "p95": latencies[p95_idx],
+        "peak_threads": sampler.peak,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="sequential / threads / async 동시 처리 성능 비교 (스텁 LLM)")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시에 처리할 대화 수")
+    parser.add_argument("--latency", type=float, default=0.5, help="스텁 LLM 1회 호출 지연(초)")
+    parser.add_argument("--threads", type=int, default=8, help="threads 모드의 워커 스레드 수")
+    parser.add_argument("--modes", default="sequential,threads,async", help="실행할 모드 (쉼표 구분)")
+    args = parser.parse_args()
+
+    _install_stub(args.latency)
+
+    questions = [QUESTIONS[i % len(QUESTIONS)] for i in range(args.concurrency)]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+
+    # 첫 호출의 그래프 컴파일 / 용어 사전 적재 비용 제외
+    main_agent.run_fintech_agent(QUESTIONS[0], "bench_warmup")
+
+    results = {}
+    for mode in modes:
+        # sequential 은 요청 수만큼 지연이 누적되므로 최대 10건만 측정
+        sample = questions[:10] if mode == "sequential" else questions
+        results[mode] = (len(sample), run_mode(mode, sample, args.threads))
+
+    print("\n" + "=" * 78)
+    print(f"대화 수: {args.concurrency} / 스텁 LLM 지연: {args.latency:.2f}초 / threads 모드 워커: {args.threads}")
+    print("=" * 78)
+    print(f"{'mode':<12}{'requests':>10}{'wall(s)':>10}{'req/s':>10}{'p50(s)':>10}{'p95(s)':>10}{'threads':>10}")
+    for mode, (n, r) in results.items():
+        print(f"{mode:<12}{n:>10}{r['wall']:>10.2f}{r['throughput']:>10.2f}{r['p50']:>10.3f}{r['p95']:>10.3f}{r['peak_threads']:>10}")
+
+if __name__ == "__main__":
+    main()
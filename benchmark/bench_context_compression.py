@@ -0,0 +1,105 @@
+"""
+컨텍스트 압축(rag_agent/context_compressor.py) 전/후 프롬프트 토큰 수와 답변 생성 지연시간 비교
+
+고정 질문 목록에 대해 같은 검색 결과로 컨텍스트를 두 번 만들고 (압축 off / on),
+답변 프롬프트에 들어가는 컨텍스트 토큰 수와 답변 LLM 호출 지연시간을 측정합니다.
+  - finrag: retrieve_relevant_docs 로 찾은 용어 정의 -> finrag_01_system.md
+  - web:    Tavily 검색 결과 (질문당 1회만 호출) -> web_search_01_response.md
+off / on 호출 순서는 라운드마다 번갈아 실행합니다.
+
+사용법:
+    python benchmark/bench_context_compression.py                     # finrag + web, 1라운드
+    python benchmark/bench_context_compression.py --targets finrag --rounds 3
+    python benchmark/bench_context_compression.py --skip-llm          # 토큰 수만 (API 비용 없음)
+"""
+import os
+import sys
+import csv
+import time
+import argparse
+import statistics
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from rag_agent import prompt_registry
+from rag_agent.memory_store import count_tokens
+from utils.async_runner import run_sync
+
+QUERY_FILES = {
+    "finrag": os.path.join(project_root, "benchmark", "queries", "knowledge_queries.csv"),
+    "web": os.path.join(project_root, "benchmark", "queries", "web_queries.csv"),
+}
+
+def load_queries(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [r["query"] for r in csv.DictReader(f)]
+
+def prepare_finrag(queries: list) -> tuple:
+    """반환: ([(질문, 압축 전 컨텍스트, 압축 후 컨텍스트)], 프롬프트, llm)"""
+    from rag_agent import finrag_agent
+    finrag_agent.load_knowledge_base()
+    cases = []
+    for q in queries:
+        docs = finrag_agent.retrieve_relevant_docs(q)
+        if docs:
+            cases.append((q, finrag_agent.build_db_context(q, docs, compress=False),
+                          finrag_agent.build_db_context(q, docs, compress=True)))
+    return cases, "finrag/finrag_01_system.md", finrag_agent.get_llm()
+
+def prepare_web(queries: list) -> tuple:
+    from rag_agent import web_search_rag
+    rag = web_search_rag.get_web_rag()
+    cases = []
+    for q in queries:
+        results = run_sync(rag._asearch_once(q)).get("results", [])
+        if results:
+            cases.append((q, web_search_rag.build_web_context(q, results, compress=False)[0],
+                          web_search_rag.build_web_context(q, results, compress=True)[0]))
+    return cases, "web_search/web_search_01_response.md", web_search_rag.get_llm()
+
+def time_answer(chain, question: str, context: str) -> float:
+    t0 = time.perf_counter()
+    run_sync(chain.ainvoke({"question": question, "context": context}))
+    return time.perf_counter() - t0
+
+def main():
+    parser = argparse.ArgumentParser(description="컨텍스트 압축 전/후 토큰 수 및 답변 지연시간 비교")
+    parser.add_argument("--targets", nargs="+", default=["finrag", "web"], choices=list(QUERY_FILES))
+    parser.add_argument("--rounds", type=int, default=1, help="질문별 off/on 답변 생성 반복 횟수")
+    parser.add_argument("--skip-llm", action="store_true", help="답변 생성 없이 토큰 수만 측정")
+    args = parser.parse_args()
+
+    report = {}
+    for target in args.targets:
+        queries = load_queries(QUERY_FILES[target])
+        cases, prompt_name, llm = (prepare_finrag if target == "finrag" else prepare_web)(queries)
+        tokens_off = sum(count_tokens(off) for _, off, _ in cases)
+        tokens_on = sum(count_tokens(on) for _, _, on in cases)
+        latency = {"off": [], "on": []}
+        if not args.skip_llm:
+            chain = prompt_registry.get_chain(prompt_name, llm)
+            for r in range(args.rounds):
+                for q, off, on in cases:
+                    order = (("off", off), ("on", on)) if r % 2 == 0 else (("on", on), ("off", off))
+                    for mode, context in order:
+                        latency[mode].append(time_answer(chain, q, context))
+        report[target] = (len(cases), tokens_off, tokens_on, latency)
+
+    print("\n" + "=" * 86)
+    print(f"{'target':<8} {'cases':>6} {'ctx tokens off':>15} {'on':>8} {'reduction':>10} "
+          f"{'p50 off':>9} {'p50 on':>9} {'mean off':>9} {'mean on':>9}")
+    for target, (n, off, on, latency) in report.items():
+        reduction = (1 - on / off) if off else 0.0
+        cols = []
+        for stat in (statistics.median, statistics.mean):
+            for mode in ("off", "on"):
+                cols.append(f"{stat(latency[mode]):>8.2f}s" if latency[mode] else f"{'-':>9}")
+        print(f"{target:<8} {n:>6} {off:>15} {on:>8} {reduction:>10.1%} {cols[0]} {cols[1]} {cols[2]} {cols[3]}")
+    print("(ctx tokens: 답변 프롬프트에 들어간 컨텍스트 토큰 합계, 지연시간: 답변 LLM 호출 1회)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+프론트 도어 벤치마크: sequential(번역 -> 보정 -> 라우팅) vs fused(단일 호출)
+
+각 질문에 대해 서브 에이전트 직전까지(카테고리 결정까지)의 지연시간과 LLM 호출 횟수를 비교합니다.
+실제 OpenAI API를 호출하므로 .env 의 OPENAI_API_KEY 가 필요합니다.
+
+사용법:
+    python benchmark/bench_front_door.py
+    python benchmark/bench_front_door.py --queries my_queries.txt --repeat 3
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableLambda
+
+from rag_agent import main_agent
+from utils.async_runner import run_sync
+
+DEFAULT_HISTORY = (
+    "**User**: DSR이 뭐야?\n\n**AI**: DSR(총부채원리금상환비율)은 연 소득 대비 모든 대출의 원리금 상환액 비율이에요.\n\n---\n\n"
+    "**User**: 삼성전자랑 SK하이닉스 주가 알려줘\n\n**AI**: 삼성전자는 71,000원, SK하이닉스는 180,000원입니다.\n\n---\n\n"
+)
+
+DEFAULT_QUERIES = [
+    "내 통장 잔액 얼마야?",
+    "엄마한테 10만원 보내줘",
+    "DSR이 뭐야?",
+    "안녕하세요",
+    "그럼 그거랑 DTI는 뭐가 달라?",
+    "How much money is in my account?",
+    "What is the difference between the two stocks?",
+    "Tôi muốn chuyển 50 đô cho bạn tôi",
+    "Apa itu suku bunga?",
+    "두 번째 거 더 자세히 알려줘",
+]
+
+class LLMCallCounter(BaseCallbackHandler):
+    """체인 내부에서 발생한 LLM 호출 횟수 집계"""
+    def __init__(self):
+        self.count = 0
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.count += 1
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self.count += 1
+
+async def _run_sequential(state: dict) -> dict:
+    state = {**state, **(await main_agent.node_translate(state))}
+    if main_agent.check_needs_context(state) == "refine":
+        state = {**state, **(await main_agent.node_refine(state))}
+    state = {**state, **(await main_agent.node_route(state))}
+    return state
+
+async def _run_fused(state: dict) -> dict:
+    state = {**state, **(await main_agent.node_front_door(state))}
+    if main_agent.after_front_door(state) == "translate":
+        state = await _run_sequential(state)
+    return state
+
+def run_front_door(question: str, mode: str, history: str) -> dict:
+    state = {"question": question, "_history": history, "_front_door_mode": mode}
+    counter = LLMCallCounter()
+    runner = RunnableLambda(_run_fused if mode == "fused" else _run_sequential)
+
+    t0 = time.perf_counter()
+    result = run_sync(runner.ainvoke(state, config={"callbacks": [counter]}))
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "elapsed": elapsed,
+        "llm_calls": counter.count,
+        "category": result.get("category"),
+        "refined_query": result.get("refined_query"),
+        "fallback": mode == "fused" and not result.get("_front_door_ok"),
+    }
+
+def _summarize(rows: list) -> dict:
+    latencies = sorted(r["elapsed"] for r in rows)
+    p95_idx = max(0, int(round(0.95 * len(latencies))) - 1)
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[p95_idx],
+        "mean": statistics.mean(latencies),
+        "llm_calls": statistics.mean(r["llm_calls"] for r in rows),
+        "fallbacks": sum(1 for r in rows if r["fallback"]),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="sequential vs fused 프론트 도어 지연시간/LLM 호출 수 비교")
+    parser.add_argument("--queries", help="질문 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--repeat", type=int, default=1, help="질문별 반복 횟수")
+    parser.add_argument("--no-history", action="store_true", help="대화 기록 없이 실행")
+    args = parser.parse_args()
+
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = DEFAULT_QUERIES
+    history = "" if args.no_history else DEFAULT_HISTORY
+
+    results = {"sequential": [], "fused": []}
+    for _ in range(args.repeat):
+        for q in queries:
+            for mode in ("sequential", "fused"):
+                row = run_front_door(q, mode, history)
+                row["question"] = q
+                results[mode].append(row)
+
+    print("\n" + "=" * 90)
+    print(f"{'질문':<40} {'seq(s)':>8} {'seq#':>5} {'fused(s)':>9} {'fused#':>7}  카테고리(seq/fused)")
+    print("-" * 90)
+    for seq, fused in zip(results["sequential"], results["fused"]):
+        print(f"{seq['question'][:38]:<40} {seq['elapsed']:>8.3f} {seq['llm_calls']:>5} "
+              f"{fused['elapsed']:>9.3f} {fused['llm_calls']:>7}  {seq['category']}/{fused['category']}")
+
+    print("=" * 90)
+    for mode in ("sequential", "fused"):
+        s = _summarize(results[mode])
+        print(f"[{mode:<10}] p50 {s['p50']:.3f}s | p95 {s['p95']:.3f}s | 평균 {s['mean']:.3f}s | "
+              f"평균 LLM 호출 {s['llm_calls']:.2f}회 | 폴백 {s['fallbacks']}건")
+    agree = sum(1 for a, b in zip(results["sequential"], results["fused"]) if a["category"] == b["category"])
+    print(f"카테고리 일치율: {agree}/{len(results['fused'])}")
+    print("=" * 90 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+FinRAG 검색 방식별(vector / hybrid) 웹 폴백 비율 리포트
+
+질문 목록(query[,expected_word] CSV)의 각 질문을 retrieve_relevant_docs 로 검색하고,
+검색 방식별로 유효 문서 0개(= node_web_fallback -> Tavily 호출) 비율, 기대 용어 적중률,
+평균 지연시간을 출력합니다. 기본값은 용어 정확 일치 색인(term_index)을 끄고 검색기만 비교합니다.
+(질의 임베딩 캐시 때문에 뒤에 실행되는 방식의 지연시간이 유리하게 측정될 수 있습니다.)
+
+사용법:
+    python benchmark/bench_hybrid_retrieval.py
+    python benchmark/bench_hybrid_retrieval.py --modes hybrid --min-coverage 0.5
+    python benchmark/bench_hybrid_retrieval.py --with-term-index --queries my_queries.csv
+"""
+import os
+import sys
+import csv
+import time
+import argparse
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from rag_agent import finrag_agent, term_index
+from utils.term_normalize import normalize_term
+
+DEFAULT_QUERIES = os.path.join(project_root, "benchmark", "queries", "knowledge_queries.csv")
+
+def _hit(docs: list, expected: str) -> bool:
+    expected = normalize_term(expected)
+    return any(expected in normalize_term(doc.metadata.get("word", "")) for doc, _ in docs)
+
+def main():
+    parser = argparse.ArgumentParser(description="FinRAG vector / hybrid 검색 웹 폴백 비율 비교")
+    parser.add_argument("--queries", default=DEFAULT_QUERIES, help="query[,expected_word] 형식의 CSV")
+    parser.add_argument("--modes", nargs="+", default=["vector", "hybrid"], choices=["vector", "hybrid"])
+    parser.add_argument("--min-coverage", type=float, default=None, help="HYBRID_MIN_COVERAGE 덮어쓰기")
+    parser.add_argument("--with-term-index", action="store_true", help="용어 정확 일치 색인을 먼저 사용")
+    args = parser.parse_args()
+
+    with open(args.queries, "r", encoding="utf-8") as f:
+        rows = [(r["query"], (r.get("expected_word") or "").strip()) for r in csv.DictReader(f)]
+
+    term_index.TERM_INDEX_ENABLED = args.with_term_index
+    if args.min_coverage is not None:
+        finrag_agent.HYBRID_MIN_COVERAGE = args.min_coverage
+    finrag_agent.load_knowledge_base()
+
+    report = {}
+    for mode in args.modes:
+        empty, hits, labeled, elapsed = 0, 0, 0, 0.0
+        misses = []
+        for query, expected in rows:
+            t0 = time.perf_counter()
+            docs = finrag_agent.retrieve_relevant_docs(query, retriever=mode)
+            elapsed += time.perf_counter() - t0
+            if not docs:
+                empty += 1
+                misses.append(query)
+            if expected:
+                labeled += 1
+                hits += _hit(docs, expected)
+        report[mode] = {
+            "fallback_rate": empty / len(rows) if rows else 0.0,
+            "hit_rate": hits / labeled if labeled else 0.0,
+            "avg_ms": elapsed / len(rows) * 1000 if rows else 0.0,
+            "misses": misses,
+        }
+
+    print("\n" + "=" * 70)
+    print(f"질문 {len(rows)}개 (term_index: {'on' if args.with_term_index else 'off'}, "
+          f"min_coverage: {finrag_agent.HYBRID_MIN_COVERAGE})")
+    print(f"{'mode':<8} {'web fallback':>14} {'expected hit':>14} {'avg latency':>14}")
+    for mode, r in report.items():
+        print(f"{mode:<8} {r['fallback_rate']:>13.1%} {r['hit_rate']:>13.1%} {r['avg_ms']:>11.1f} ms")
+    for mode, r in report.items():
+        if r["misses"]:
+            print(f"\n[{mode}] 웹 폴백 질문:")
+            for q in r["misses"]:
+                print(f"  - {q}")
+
+if __name__ == "__main__":
+    main()
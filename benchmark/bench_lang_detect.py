@@ -0,0 +1,92 @@
+"""
+로컬 언어 식별 fast path 벤치마크
+
+질문 목록에 대해 로컬 식별기가 LLM 번역을 생략(fast path)하는 비율과 로컬 식별 소요시간을 측정합니다.
+--with-llm 옵션을 주면 main_01_translation.md 호출 시간을 실제로 측정해 절약 시간을 계산합니다.
+
+사용법:
+    python benchmark/bench_lang_detect.py
+    python benchmark/bench_lang_detect.py --queries my_queries.txt --with-llm
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from rag_agent.lang_detect import detect_language, is_confident_korean
+
+DEFAULT_QUERIES = [
+    ("내 통장 잔액 얼마야?", "ko"),
+    ("엄마한테 10만원 보내줘", "ko"),
+    ("DSR이 뭐야", "ko"),
+    ("연말정산 알려줘", "ko"),
+    ("박영자", "ko"),
+    ("안녕하세요", "ko"),
+    ("ETF랑 펀드 차이", "ko"),
+    ("How much money is in my account?", "en"),
+    ("What is DSR?", "en"),
+    ("John한테 보내줘", "en"),
+    ("Tôi muốn chuyển 50 đô cho bạn tôi", "vi"),
+    ("lãi suất là gì", "vi"),
+    ("Apa itu suku bunga?", "id"),
+    ("berapa saldo saya", "id"),
+    ("ok", "id"),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 언어 식별 fast path 적중률/절약 시간 측정")
+    parser.add_argument("--queries", help="질문 목록 파일 (한 줄에 '질문<TAB>선호언어코드' 또는 질문만)")
+    parser.add_argument("--with-llm", action="store_true", help="LLM 번역 호출 시간을 실제로 측정")
+    args = parser.parse_args()
+
+    if args.queries:
+        queries = []
+        with open(args.queries, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                parts = line.rstrip("\n").split("\t")
+                queries.append((parts[0], parts[1] if len(parts) > 1 else None))
+    else:
+        queries = DEFAULT_QUERIES
+
+    fast, local_times, llm_times = 0, [], []
+    print("\n" + "=" * 80)
+    print(f"{'질문':<40} {'감지 언어':<12} {'신뢰도':>6}  경로")
+    print("-" * 80)
+    for question, preferred in queries:
+        t0 = time.perf_counter()
+        detected = detect_language(question, preferred)
+        local_times.append(time.perf_counter() - t0)
+        hit = is_confident_korean(detected)
+        fast += hit
+        print(f"{question[:38]:<40} {str(detected['language']):<12} {detected['confidence']:>6.2f}  "
+              f"{'fast path' if hit else 'LLM 번역'}")
+
+    if args.with_llm:
+        from rag_agent.main_agent import _translation_chain
+        chain = _translation_chain()
+        for question, _ in queries:
+            t0 = time.perf_counter()
+            chain.invoke({"question": question})
+            llm_times.append(time.perf_counter() - t0)
+
+    print("=" * 80)
+    print(f"fast path 적중: {fast}/{len(queries)} ({fast / len(queries):.0%})")
+    print(f"로컬 식별 평균 소요시간: {statistics.mean(local_times) * 1000:.3f}ms")
+    if llm_times:
+        llm_avg = statistics.mean(llm_times)
+        print(f"LLM 번역 평균 소요시간: {llm_avg:.3f}s")
+        print(f"요청당 평균 절약 시간: {fast * llm_avg / len(queries):.3f}s "
+              f"(전체 {fast * llm_avg:.2f}s / {len(queries)}건)")
+    print("=" * 80 + "\n")
+
+if __name__ == "__main__":
+    main()
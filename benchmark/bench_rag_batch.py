@@ -0,0 +1,168 @@
+"""
+FinRAG 배치 API(get_rag_answers) 처리량 벤치마크 (스텁 OpenAI 서버)
+
+OpenAI 호환 스텁 HTTP 서버(/v1/embeddings, /v1/chat/completions)를 로컬에 띄우고
+OPENAI_BASE_URL 을 그쪽으로 돌린 뒤, 임시 Chroma 컬렉션(합성 용어 --corpus 개)에 대해
+  - loop:  aget_rag_answer 를 질문마다 순서대로 호출 (기존 평가/캐시 워밍 스크립트 방식)
+  - batch: aget_rag_answers 로 한 번에 처리 (임베딩 요청 1회 + 다중 질의 검색 1회 + 동시 답변 생성)
+의 처리량과 스텁 서버가 받은 요청 수를 비교합니다. 실제 OpenAI API / Tavily / MySQL 은 사용하지 않습니다.
+
+사용법:
+    python benchmark/bench_rag_batch.py                         # batch 1000건, loop 100건
+    python benchmark/bench_rag_batch.py --n 1000 --loop-n 1000 --concurrency 16
+    python benchmark/bench_rag_batch.py --embed-latency 0.2 --llm-latency 0.5
+"""
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import asyncio
+import argparse
+import tempfile
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# ---------------------------------------------------------
+# 스텁 OpenAI 서버
+# ---------------------------------------------------------
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    embed_latency = 0.05
+    llm_latency = 0.2
+    dim = 256
+    requests = Counter()
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    @classmethod
+    def embedding(cls, text: str) -> list:
+        rng = random.Random(hashlib.sha256(str(text).encode("utf-8")).digest())
+        vec = [rng.gauss(0.0, 1.0) for _ in range(cls.dim)]
+        norm = sum(v * v for v in vec) ** 0.5 or 1.0
+        return [v / norm for v in vec]
+
+    def _reply(self, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with self.lock:
+            self.requests[self.path] += 1
+        if self.path.endswith("/embeddings"):
+            inputs = request.get("input")
+            inputs = inputs if isinstance(inputs, list) else [inputs]
+            time.sleep(self.embed_latency)
+            self._reply({
+                "object": "list",
+                "model": request.get("model"),
+                "data": [{"object": "embedding", "index": i, "embedding": self.embedding(t)} for i, t in enumerate(inputs)],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            })
+        else:
+            time.sleep(self.llm_latency)
+            self._reply({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "스텁 답변입니다."}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+
+def start_stub_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAIHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# ---------------------------------------------------------
+# 벤치마크
+# ---------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="get_rag_answers 배치 처리량 벤치마크 (스텁 OpenAI 서버)")
+    parser.add_argument("--n", type=int, default=1000, help="batch 모드 질문 수")
+    parser.add_argument("--loop-n", type=int, default=100, help="loop 모드 질문 수 (0 이면 생략)")
+    parser.add_argument("--corpus", type=int, default=2000, help="임시 컬렉션 합성 용어 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="배치 답변 생성 동시 실행 수")
+    parser.add_argument("--embed-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--dim", type=int, default=256, help="스텁 임베딩 차원")
+    args = parser.parse_args()
+
+    StubOpenAIHandler.embed_latency = args.embed_latency
+    StubOpenAIHandler.llm_latency = args.llm_latency
+    StubOpenAIHandler.dim = args.dim
+    server = start_stub_server()
+
+    # 모듈 import 전에 설정해야 ChatOpenAI / OpenAIEmbeddings 가 스텁 서버를 사용
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["EMBEDDING_CACHE"] = "false"      # 같은 질문 재실행 시에도 임베딩 요청을 그대로 측정
+    os.environ["TERM_INDEX_ENABLED"] = "false"   # 모든 질문이 벡터 검색을 거치도록
+    os.environ["TERM_EXPLANATIONS"] = "false"
+
+    from langchain_chroma import Chroma
+    from langchain_openai import OpenAIEmbeddings
+    from rag_agent import finrag_agent
+    from rag_agent.cached_embeddings import CachedEmbeddings
+    from utils.async_runner import run_sync
+
+    embeddings = CachedEmbeddings(OpenAIEmbeddings(model=finrag_agent.EMBEDDING_MODEL, check_embedding_ctx_length=False),
+                                  model_name=finrag_agent.EMBEDDING_MODEL)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Chroma(persist_directory=tmp, embedding_function=embeddings, collection_name="bench_terms",
+                       collection_metadata={"hnsw:space": "l2"})
+        texts = [f"합성용어{i}: 합성용어{i}에 대한 벤치마크용 정의입니다." for i in range(args.corpus)]
+        for start in range(0, len(texts), 500):
+            store.add_texts(texts[start:start + 500],
+                            metadatas=[{"word": f"합성용어{i}"} for i in range(start, min(start + 500, len(texts)))])
+
+        finrag_agent.vectorstore = store
+        finrag_agent.query_embeddings = embeddings
+        finrag_agent.SIMILARITY_THRESHOLD = float("inf")    # 합성 벡터 거리와 무관하게 항상 DB 답변 (웹 폴백 방지)
+
+        queries = [f"합성용어{random.randrange(args.corpus)}에 대해 설명해줘 #{i}" for i in range(args.n)]
+        report = {}
+
+        if args.loop_n:
+            StubOpenAIHandler.requests.clear()
+            t0 = time.perf_counter()
+            for q in queries[:args.loop_n]:
+                run_sync(finrag_agent.aget_rag_answer(q))
+            wall = time.perf_counter() - t0
+            report["loop"] = (args.loop_n, wall, dict(StubOpenAIHandler.requests))
+
+        StubOpenAIHandler.requests.clear()
+        t0 = time.perf_counter()
+        answers = finrag_agent.get_rag_answers(queries, max_concurrency=args.concurrency)
+        wall = time.perf_counter() - t0
+        report["batch"] = (len(answers), wall, dict(StubOpenAIHandler.requests))
+
+    server.shutdown()
+    print("\n" + "=" * 78)
+    print(f"임베딩 지연 {args.embed_latency}s / LLM 지연 {args.llm_latency}s / 코퍼스 {args.corpus}개 / "
+          f"배치 동시 실행 {args.concurrency}")
+    print(f"{'mode':<8} {'questions':>10} {'wall':>10} {'q/s':>10} {'embed req':>10} {'chat req':>10}")
+    for mode, (n, wall, reqs) in report.items():
+        embed = sum(v for k, v in reqs.items() if k.endswith("/embeddings"))
+        chat = sum(v for k, v in reqs.items() if k.endswith("/chat/completions"))
+        print(f"{mode:<8} {n:>10} {wall:>9.2f}s {n / wall if wall else 0:>10.1f} {embed:>10} {chat:>10}")
+
+if __name__ == "__main__":
+    main()
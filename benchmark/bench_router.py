@@ -0,0 +1,96 @@
+"""
+계층형 의도 분류기(로컬 tier -> LLM 라우터) 오프라인 정확도/지연시간 리포트
+
+라벨 파일(query,category CSV)의 각 질문을 node_route 와 같은 순서로 분류하고
+tier 별 처리 비율, 정확도, 평균 지연시간을 출력합니다.
+
+라벨 파일
+  - queries/router_labeled.csv : 규칙 작성/회귀 확인용 (규칙을 이 파일에 맞춰 조정했으므로 정확도 평가로 쓰지 말 것)
+  - queries/router_heldout.csv : 규칙 조정에 사용하지 않은 평가용. 오분류가 나와도 이 파일에 맞춰 규칙을 고치지 말고,
+                                 고친 뒤에는 새 질문으로 held-out 세트를 다시 만들어야 합니다.
+
+사용법:
+    python benchmark/bench_router.py                         # 규칙 tier 만 (LLM 미호출)
+    python benchmark/bench_router.py --embeddings            # 중심점 tier 포함
+    python benchmark/bench_router.py --with-llm              # 임계값 미만 질문은 LLM 라우터 호출
+    python benchmark/bench_router.py --labels benchmark/queries/router_heldout.csv
+    python benchmark/bench_router.py --threshold 0.7 --labels my_labels.csv
+"""
+import os
+import sys
+import csv
+import time
+import argparse
+from collections import defaultdict
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from rag_agent.local_router import classify_locally
+
+DEFAULT_LABELS = os.path.join(project_root, "benchmark", "queries", "router_labeled.csv")
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 라우터 tier 정확도/지연시간 리포트")
+    parser.add_argument("--labels", default=DEFAULT_LABELS, help="query,category 형식의 라벨 CSV")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("ROUTER_CONFIDENCE_THRESHOLD", "0.8")))
+    parser.add_argument("--embeddings", action="store_true", help="중심점(임베딩) tier 사용")
+    parser.add_argument("--with-llm", action="store_true", help="임계값 미만 질문에 LLM 라우터 호출")
+    args = parser.parse_args()
+
+    with open(args.labels, "r", encoding="utf-8") as f:
+        rows = [(r["query"], r["category"]) for r in csv.DictReader(f)]
+
+    router_chain = None
+    if args.with_llm:
+        from rag_agent.main_agent import _router_chain
+        router_chain = _router_chain()
+
+    per_tier = defaultdict(lambda: {"n": 0, "correct": 0, "time": 0.0})
+    errors = []
+    for query, label in rows:
+        t0 = time.perf_counter()
+        decision = classify_locally(query, args.threshold, use_embeddings=args.embeddings)
+        if decision and decision["confidence"] >= args.threshold:
+            tier, predicted = decision["tier"], decision["category"]
+        elif router_chain is not None:
+            tier = "llm"
+            predicted = router_chain.invoke({"question": query}).strip().replace("'", "").replace('"', "").replace(".", "")
+        else:
+            tier, predicted = "unresolved(llm 필요)", None
+        elapsed = time.perf_counter() - t0
+
+        stat = per_tier[tier]
+        stat["n"] += 1
+        stat["time"] += elapsed
+        if predicted == label:
+            stat["correct"] += 1
+        elif predicted is not None:
+            errors.append((query, label, predicted, tier))
+
+    total = len(rows)
+    print("\n" + "=" * 80)
+    print(f"라벨 파일: {args.labels} ({total}건) / 임계값: {args.threshold}")
+    print("-" * 80)
+    print(f"{'tier':<22} {'처리 건수':>10} {'비율':>8} {'정확도':>8} {'평균 지연':>12}")
+    for tier, stat in sorted(per_tier.items(), key=lambda kv: -kv[1]["n"]):
+        acc = f"{stat['correct'] / stat['n']:.0%}" if not tier.startswith("unresolved") else "-"
+        print(f"{tier:<22} {stat['n']:>10} {stat['n'] / total:>8.0%} {acc:>8} {stat['time'] / stat['n'] * 1000:>10.2f}ms")
+
+    resolved = sum(s["n"] for t, s in per_tier.items() if not t.startswith("unresolved"))
+    correct = sum(s["correct"] for s in per_tier.values())
+    if resolved:
+        print("-" * 80)
+        print(f"전체 정확도(처리된 질문 기준): {correct}/{resolved} ({correct / resolved:.0%})")
+    if errors:
+        print("-" * 80)
+        print("오분류 목록:")
+        for query, label, predicted, tier in errors:
+            print(f"  - '{query}': 정답 {label} / 예측 {predicted} ({tier})")
+    print("=" * 80 + "\n")
+
+if __name__ == "__main__":
+    main()
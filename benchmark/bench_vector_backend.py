@@ -0,0 +1,160 @@
+"""
+FinRAG 벡터 검색 백엔드 비교: Chroma(HNSW) vs mmap NumPy 색인(float16 / int8)
+
+- 지연시간: 질의 벡터가 주어진 상태의 순수 검색 시간 (임베딩 API 제외), p50 / p95
+- RSS: 백엔드별로 별도 프로세스를 띄워 로드 + 검색 후 증가한 상주 메모리
+- recall@k: Chroma 에 저장된 float32 벡터로 계산한 정확(brute-force) top-k 대비 일치율
+
+사전 준비:
+    python utils/export_vector_index.py --dtype float16 --out data/vector_index/financial_terms
+    python utils/export_vector_index.py --dtype int8 --out data/vector_index/financial_terms_int8
+
+사용법:
+    python benchmark/bench_vector_backend.py
+    python benchmark/bench_vector_backend.py --k 5 --rounds 20 --mmap-dirs data/vector_index/financial_terms
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import numpy as np
+
+DEFAULT_QUERIES = os.path.join(project_root, "benchmark", "queries", "knowledge_queries.csv")
+CHROMA_DIR = os.path.join(project_root, "data", "financial_terms")
+DEFAULT_MMAP_DIRS = [
+    os.path.join(project_root, "data", "vector_index", "financial_terms"),
+    os.path.join(project_root, "data", "vector_index", "financial_terms_int8"),
+]
+COLLECTION_NAME = "financial_terms"
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+# ---------------------------------------------------------
+# 자식 프로세스: 백엔드 하나를 로드하고 검색
+# ---------------------------------------------------------
+def run_child(backend: str, vectors_path: str, k: int, rounds: int):
+    base_rss = rss_mb()
+    queries = np.load(vectors_path)
+    t0 = time.perf_counter()
+    if backend == "chroma":
+        import chromadb
+        collection = chromadb.PersistentClient(path=CHROMA_DIR).get_collection(COLLECTION_NAME)
+
+        def search(vec):
+            res = collection.query(query_embeddings=[vec.tolist()], n_results=k, include=["metadatas"])
+            return [m.get("word") for m in res["metadatas"][0]]
+    else:
+        from rag_agent.vector_index import MmapVectorIndex
+        index = MmapVectorIndex(backend, embedding_function=None)
+
+        def search(vec):
+            return [doc.metadata.get("word") for doc, _ in index.similarity_search_by_vector_with_score(vec, k=k)]
+    load_sec = time.perf_counter() - t0
+
+    results = [search(vec) for vec in queries]     # 워밍업 겸 결과 수집
+    latencies = []
+    for _ in range(rounds):
+        for vec in queries:
+            t1 = time.perf_counter()
+            search(vec)
+            latencies.append(time.perf_counter() - t1)
+
+    print(json.dumps({
+        "load_sec": load_sec,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "rss_delta_mb": rss_mb() - base_rss,
+        "results": results,
+    }, ensure_ascii=False))
+
+# ---------------------------------------------------------
+# 부모 프로세스: 질의 임베딩 / 정답 top-k 계산 후 백엔드별 자식 실행
+# ---------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Chroma vs mmap 벡터 색인 지연시간 / RSS / recall 비교")
+    parser.add_argument("--queries", default=DEFAULT_QUERIES, help="query 컬럼이 있는 CSV")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=10, help="질문 목록 반복 측정 횟수")
+    parser.add_argument("--mmap-dirs", nargs="+", default=DEFAULT_MMAP_DIRS)
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--vectors", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.vectors, args.k, args.rounds)
+        return
+
+    import chromadb
+    from langchain_openai import OpenAIEmbeddings
+    from rag_agent.cached_embeddings import CachedEmbeddings
+    from rag_agent.finrag_agent import EMBEDDING_MODEL
+
+    with open(args.queries, "r", encoding="utf-8") as f:
+        queries = [r["query"] for r in csv.DictReader(f)]
+    embeddings = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL), model_name=EMBEDDING_MODEL)
+    query_vecs = np.asarray([embeddings.embed_query(q) for q in queries], dtype=np.float32)
+
+    # 정답: 저장된 float32 벡터 기준 정확 top-k (squared L2)
+    data = chromadb.PersistentClient(path=CHROMA_DIR).get_collection(COLLECTION_NAME).get(
+        include=["embeddings", "metadatas"])
+    corpus = np.asarray(data["embeddings"], dtype=np.float32)
+    words = [m.get("word") for m in data["metadatas"]]
+    truth = []
+    for vec in query_vecs:
+        dist = ((corpus - vec) ** 2).sum(axis=1)
+        truth.append([words[i] for i in np.argsort(dist)[:args.k]])
+    del corpus, data
+
+    with tempfile.NamedTemporaryFile(suffix=".npy", delete=False) as tmp:
+        vectors_path = tmp.name
+    np.save(vectors_path, query_vecs)
+
+    backends = ["chroma"] + [d for d in args.mmap_dirs if os.path.exists(os.path.join(d, "meta.json"))]
+    report = {}
+    try:
+        for backend in backends:
+            out = subprocess.run(
+                [sys.executable, current_file_path, "--child", backend, "--vectors", vectors_path,
+                 "--k", str(args.k), "--rounds", str(args.rounds)],
+                capture_output=True, text=True, cwd=project_root, check=True,
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            hits = sum(len(set(r) & set(t)) for r, t in zip(result["results"], truth))
+            result["recall"] = hits / (len(truth) * args.k) if truth else 0.0
+            report[os.path.basename(backend)] = result
+    finally:
+        os.remove(vectors_path)
+
+    print("\n" + "=" * 78)
+    print(f"질문 {len(queries)}개, k={args.k}, 반복 {args.rounds}회 (정답: float32 brute-force)")
+    print(f"{'backend':<26} {'load':>8} {'p50':>9} {'p95':>9} {'RSS +':>9} {f'recall@{args.k}':>10}")
+    for name, r in report.items():
+        print(f"{name:<26} {r['load_sec']:>7.2f}s {r['p50_ms']:>7.2f}ms {r['p95_ms']:>7.2f}ms "
+              f"{r['rss_delta_mb']:>7.1f}MB {r['recall']:>10.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+모듈 import 시간 예산 점검 (python -X importtime)
+
+새 인터프리터에서 대상 모듈을 import 하고 -X importtime 출력(stderr)을 집계해
+  - 대상 모듈의 누적 import 시간과 예산(--budget-ms) 초과 여부
+  - 누적 시간이 큰 최상위 패키지 순위
+  - import 시점에 로드되면 안 되는 무거운 의존성(LLM/Tavily/MySQL/Chroma 클라이언트)이 로드됐는지
+를 출력합니다. DB_HOST 를 닫힌 포트로 바꿔 실행하므로 MySQL 없이도 import 가 성공해야 합니다.
+예산 초과 또는 금지 모듈이 로드되면 종료 코드 1 을 반환합니다. (CI 점검용)
+
+사용법:
+    python benchmark/check_import_time.py
+    python benchmark/check_import_time.py --modules rag_agent.main_agent rag_agent.finrag_agent --budget-ms 800
+    python benchmark/check_import_time.py --top 30 --runs 3
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+DEFAULT_MODULES = ["rag_agent.main_agent"]
+# 첫 사용 시점에 get_llm() / get_web_rag() / get_pool() / load_knowledge_base() 가 로드해야 하는 모듈
+LAZY_ONLY = ["langchain_openai", "langgraph", "tavily", "pymysql", "dbutils", "chromadb", "langchain_chroma", "openai"]
+
+def measure(module: str) -> list:
+    """반환: [(패키지명, self_us, cumulative_us, depth)] (import 순서)"""
+    env = dict(os.environ, DB_HOST="127.0.0.1", DB_PORT="9", PYTHONPATH=project_root)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=project_root, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{proc.stderr.strip().splitlines()[-1]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="python -X importtime 기반 import 시간 예산 점검")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="모듈별 누적 import 시간 예산")
+    parser.add_argument("--top", type=int, default=15, help="출력할 최상위 패키지 수")
+    parser.add_argument("--runs", type=int, default=1, help="반복 측정 후 최솟값 사용 (디스크 캐시 영향 완화)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        runs = [measure(module) for _ in range(max(1, args.runs))]
+        rows = min(runs, key=lambda r: next((c for n, _, c, _ in r if n == module), 0))
+        total_ms = next((c for n, _, c, _ in rows if n == module), 0) / 1000
+        loaded = {name.split(".")[0] for name, _, _, _ in rows}
+        eager = [m for m in LAZY_ONLY if m in loaded]
+
+        print("\n" + "=" * 72)
+        print(f"📦 {module}: 누적 {total_ms:.1f}ms (예산 {args.budget_ms:.0f}ms, 최소값 / {len(runs)}회)")
+        print(f"{'package':<44} {'cumulative':>12} {'self':>10}")
+        top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)
+        for name, self_us, cumulative_us, _ in top_level[:args.top]:
+            print(f"{name:<44} {cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms")
+
+        if eager:
+            failed = True
+            print(f"❌ import 시점에 로드된 지연 로딩 대상: {', '.join(eager)}")
+        if total_ms > args.budget_ms:
+            failed = True
+            print(f"❌ 예산 초과: {total_ms:.1f}ms > {args.budget_ms:.0f}ms")
+        if not eager and total_ms <= args.budget_ms:
+            print("✅ 예산 이내, 무거운 의존성 지연 로딩 확인")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
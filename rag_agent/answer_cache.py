@@ -0,0 +1,162 @@
+import os
+import re
+import threading
+from datetime import datetime
+
+from utils.cache import TTLCache
+from utils import metrics
+
+# ==========================================
+# 비개인(non-personal) 카테고리 답변 캐시
+# ==========================================
+# 키: (정규화된 질의, category, target_language)
+#   질의는 답변을 생성한 입력 (GENERAL: korean_query, 그 외: refined_query -> main_agent._cache_query)
+# - 정확 일치 조회 후, 실패하면 같은 (category, language) 안에서 질의 임베딩 코사인 유사도로 근사 조회
+# - DATABASE / TRANSFER 는 사용자별 데이터이므로 절대 캐시하지 않음
+# - 실시간성이 있는 답변(웹 검색 키워드 포함 질문, FinRAG 가 웹 검색으로 답한 경우)은 짧은 TTL 적용
+
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE", "true").strip().lower() not in ("0", "false", "no")
+ANSWER_CACHE_SEMANTIC = os.getenv("ANSWER_CACHE_SEMANTIC", "false").strip().lower() in ("1", "true", "yes")
+ANSWER_CACHE_MAXSIZE = int(os.getenv("ANSWER_CACHE_MAXSIZE", "2000"))
+SIMILARITY_CUTOFF = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+EMBEDDING_MODEL = os.getenv("ANSWER_CACHE_EMBEDDING_MODEL", "text-embedding-3-small")
+
+# 카테고리별 TTL (초). 여기에 없는 카테고리는 캐시 불가
+CATEGORY_TTL = {
+    "KNOWLEDGE": 24 * 60 * 60,
+    "GENERAL": 6 * 60 * 60,
+    "WEB SEARCH": 5 * 60,
+}
+NEVER_CACHE = ("DATABASE", "TRANSFER")
+
+# 답변 생성 실패 문구가 포함된 답변은 캐시하지 않음
+# (웹 검색 실패로 이전 검색 결과를 대신 제공한 답변 포함)
+_ERROR_MARKERS = ("오류가 발생", "죄송합니다. 웹 검색 중", "답변을 생성하지 못했습니다", "의도를 정확히 파악하지 못했습니다",
+                  "실시간 검색이 원활하지 않아", "웹 검색을 사용할 수 없습니다")
+
+_cache = TTLCache(maxsize=ANSWER_CACHE_MAXSIZE)
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+def normalize_query(query: str) -> str:
+    """공백/문장부호 차이를 무시한 캐시 키용 정규화"""
+    return re.sub(r"[\s\?\!\.,~\"'`]+", "", (query or "")).lower()
+
+def freshness_category(category: str, refined_query: str, answer_source: str = None) -> str:
+    """
+    TTL 을 정할 신선도 등급. KNOWLEDGE 중 웹 검색으로 만든 답변은 WEB SEARCH TTL 적용
+      - answer_source == "web": FinRAG 가 실제로 웹 검색(키워드 또는 용어 검색 0건 폴백)으로 답함
+      - answer_source 를 모르면 (조회 시점) 질의의 웹 검색 키워드로 판단
+    """
+    if category == "KNOWLEDGE":
+        if answer_source == "web":
+            return "WEB SEARCH"
+        if answer_source is None:
+            from rag_agent.finrag_agent import WEB_SEARCH_KEYWORDS
+            if any(kw in refined_query for kw in WEB_SEARCH_KEYWORDS):
+                return "WEB SEARCH"
+    return category
+
+def is_cacheable(category: str) -> bool:
+    return ANSWER_CACHE_ENABLED and category not in NEVER_CACHE and category in CATEGORY_TTL
+
+def _get_embeddings():
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                from langchain_openai import OpenAIEmbeddings
+                from rag_agent.cached_embeddings import CachedEmbeddings
+                _embeddings = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL), model_name=EMBEDDING_MODEL)
+    return _embeddings
+
+def _embed(query: str):
+    import numpy as np
+    vec = np.asarray(_get_embeddings().embed_query(query), dtype=np.float32)
+    norm = float(np.linalg.norm(vec)) or 1.0
+    return vec / norm
+
+def _semantic_lookup(query_vec, category: str, target_language: str):
+    import numpy as np
+    best, best_sim = None, SIMILARITY_CUTOFF
+    for (_, cat, lang), entry in _cache.items():
+        if cat != category or lang != target_language or entry.get("embedding") is None:
+            continue
+        sim = float(np.dot(query_vec, entry["embedding"]))
+        if sim >= best_sim:
+            best, best_sim = entry, sim
+    return best, best_sim
+
+def lookup(refined_query: str, category: str, target_language: str) -> dict:
+    """
+    반환: {"entry": 캐시 항목 | None, "match": "exact" | "semantic" | None, "embedding": 질의 벡터 | None}
+    embedding 은 미적중 시 store() 에 그대로 넘겨 재계산을 피합니다.
+    """
+    result = {"entry": None, "match": None, "embedding": None}
+    if not is_cacheable(category):
+        return result
+
+    key = (normalize_query(refined_query), category, target_language)
+    entry = _cache.get(key)
+    if entry is not None:
+        metrics.incr("answer_cache.hit.exact")
+        result.update(entry=entry, match="exact")
+        return result
+
+    if ANSWER_CACHE_SEMANTIC:
+        try:
+            query_vec = _embed(refined_query)
+            result["embedding"] = query_vec
+            entry, sim = _semantic_lookup(query_vec, category, target_language)
+            if entry is not None:
+                metrics.incr("answer_cache.hit.semantic")
+                result.update(entry=entry, match=f"semantic({sim:.3f})")
+                return result
+        except Exception as e:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ⚠️ [Answer Cache] 근사 조회 실패: {e}")
+
+    metrics.incr("answer_cache.miss")
+    return result
+
+def store(refined_query: str, category: str, target_language: str, korean_answer: str, final_answer: str,
+          embedding=None, answer_source: str = None) -> bool:
+    """answer_source: 답변 출처 ("web" / "db"), 항목 TTL 결정에 사용 (키는 라우팅 카테고리 기준)"""
+    if not is_cacheable(category):
+        return False
+    if not isinstance(final_answer, str) or not final_answer.strip():
+        return False
+    if any(marker in (korean_answer or "") for marker in _ERROR_MARKERS):
+        return False
+
+    if embedding is None and ANSWER_CACHE_SEMANTIC:
+        try:
+            embedding = _embed(refined_query)
+        except Exception:
+            embedding = None
+
+    key = (normalize_query(refined_query), category, target_language)
+    _cache.set(key, {
+        "korean_answer": korean_answer,
+        "final_answer": final_answer,
+        "embedding": embedding,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }, ttl=CATEGORY_TTL[freshness_category(category, refined_query, answer_source)])
+    metrics.incr("answer_cache.store")
+    return True
+
+def clear():
+    _cache.clear()
+
+def get_answer_cache_stats() -> dict:
+    """캐시 크기 산정용 적중/미적중 카운터"""
+    stats = _cache.stats()
+    stats.update({
+        "exact_hits": metrics.get_counter("answer_cache.hit.exact"),
+        "semantic_hits": metrics.get_counter("answer_cache.hit.semantic"),
+        "lookup_misses": metrics.get_counter("answer_cache.miss"),
+        "stores": metrics.get_counter("answer_cache.store"),
+    })
+    lookups = stats["exact_hits"] + stats["semantic_hits"] + stats["lookup_misses"]
+    stats["answer_hit_rate"] = ((stats["exact_hits"] + stats["semantic_hits"]) / lookups) if lookups else 0.0
+    return stats
@@ -0,0 +1,178 @@
+import os
+import re
+import time
+import hashlib
+import threading
+import unicodedata
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+from langchain_core.embeddings import Embeddings
+
+from utils.cache import TTLCache, SQLiteKVStore
+from utils.singleflight import SingleFlight
+from utils import metrics
+
+# ==========================================
+# 질의 임베딩 캐시 (OpenAIEmbeddings 래퍼)
+# ==========================================
+# 키: sha256(모델명 + 정규화된 텍스트)
+# 1차: 프로세스 내 LRU / 2차: SQLite (float32 바이트, 여러 워커 프로세스 공유)
+# 같은 텍스트의 동시 미적중은 single-flight 로 묶어 API 를 한 번만 호출합니다. (embed_documents 배치 포함)
+# 디스크는 EMBEDDING_CACHE_MAX_ROWS 를 넘으면 오래된 항목부터 삭제합니다.
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DB_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", str(PROJECT_ROOT / "data" / "cache" / "embeddings.sqlite3")))
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE", "true").strip().lower() not in ("0", "false", "no")
+MEMORY_MAXSIZE = int(os.getenv("EMBEDDING_CACHE_MAXSIZE", "5000"))
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "200000"))
+# 이 개수만큼 저장할 때마다 디스크 행 수 상한 적용
+TRIM_EVERY = 1000
+
+_store = None
+_store_lock = threading.Lock()
+_saves_since_trim = 0
+
+def _get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store_ = SQLiteKVStore(DB_PATH, table="embeddings")
+                store_.trim(EMBEDDING_CACHE_MAX_ROWS)
+                _store = store_
+    return _store
+
+def normalize_text(text: str) -> str:
+    """유니코드 NFC + 앞뒤 공백 제거 + 연속 공백 축약"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text or "")).strip()
+
+def _pack(vector) -> bytes:
+    return array("f", vector).tobytes()
+
+def _unpack(blob: bytes) -> list:
+    vec = array("f")
+    vec.frombytes(blob)
+    return vec.tolist()
+
+class CachedEmbeddings(Embeddings):
+    def __init__(self, underlying: Embeddings, model_name: str, maxsize: int = MEMORY_MAXSIZE):
+        self.underlying = underlying
+        self.model_name = model_name
+        self._memory = TTLCache(maxsize=maxsize)
+        self._flight = SingleFlight()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\n{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str):
+        vec = self._memory.get(key)
+        if vec is not None:
+            metrics.incr("embed_cache.hit.memory")
+            return vec
+        try:
+            blob = _get_store().get(key)
+        except Exception as e:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ⚠️ [Embedding Cache] 디스크 조회 실패: {e}")
+            blob = None
+        if blob is not None:
+            vec = _unpack(blob)
+            self._memory.set(key, vec)
+            metrics.incr("embed_cache.hit.disk")
+            return vec
+        return None
+
+    def _save(self, key: str, vec: list):
+        global _saves_since_trim
+        self._memory.set(key, vec)
+        try:
+            store_ = _get_store()
+            store_.set(key, _pack(vec), tag=self.model_name)
+            with _store_lock:
+                _saves_since_trim += 1
+                trim = _saves_since_trim >= TRIM_EVERY
+                if trim:
+                    _saves_since_trim = 0
+            if trim:
+                store_.trim(EMBEDDING_CACHE_MAX_ROWS)
+        except Exception as e:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ⚠️ [Embedding Cache] 디스크 저장 실패: {e}")
+
+    def embed_query(self, text: str) -> list:
+        if not EMBEDDING_CACHE_ENABLED:
+            return self.underlying.embed_query(text)
+        key = self._key(text)
+        vec = self._lookup(key)
+        if vec is not None:
+            return vec
+
+        def _fetch():
+            # leader 대기 중 다른 스레드가 이미 저장했을 수 있음
+            cached = self._memory.get(key)
+            if cached is not None:
+                return cached
+            t0 = time.perf_counter()
+            result = self.underlying.embed_query(text)
+            metrics.observe("embed_cache.api_latency", time.perf_counter() - t0)
+            self._save(key, result)
+            return result
+
+        vec, shared = self._flight.do(key, _fetch)
+        metrics.incr("embed_cache.coalesced" if shared else "embed_cache.miss")
+        return vec
+
+    def embed_documents(self, texts: list) -> list:
+        """문서 색인용: 캐시에 없는 텍스트만 한 번에 임베딩"""
+        if not EMBEDDING_CACHE_ENABLED:
+            return self.underlying.embed_documents(texts)
+        keys = [self._key(t) for t in texts]
+        vectors = [self._lookup(k) for k in keys]
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if not missing:
+            return vectors
+        text_by_key = {keys[i]: texts[i] for i in missing}
+
+        def _fetch(batch_keys):
+            # 다른 호출이 방금 저장한 키는 API 대상에서 제외
+            found = {k: self._memory.get(k) for k in batch_keys}
+            todo = [k for k in batch_keys if found[k] is None]
+            if todo:
+                t0 = time.perf_counter()
+                fetched = self.underlying.embed_documents([text_by_key[k] for k in todo])
+                metrics.observe("embed_cache.api_batch_latency", time.perf_counter() - t0)
+                for k, vec in zip(todo, fetched):
+                    self._save(k, vec)
+                    found[k] = vec
+            return [found[k] for k in batch_keys]
+
+        results = self._flight.do_many(text_by_key, _fetch)
+        for i in missing:
+            vectors[i], shared = results[keys[i]]
+            metrics.incr("embed_cache.coalesced" if shared else "embed_cache.miss")
+        return vectors
+
+def get_embedding_cache_stats() -> dict:
+    """적중률과 절약된 API 지연시간 추정치 (평균 API 지연 x 적중 횟수)"""
+    memory_hits = metrics.get_counter("embed_cache.hit.memory")
+    disk_hits = metrics.get_counter("embed_cache.hit.disk")
+    coalesced = metrics.get_counter("embed_cache.coalesced")
+    misses = metrics.get_counter("embed_cache.miss")
+    lookups = memory_hits + disk_hits + coalesced + misses
+    api = metrics.summarize("embed_cache.api_latency")
+    try:
+        disk_size = _get_store().count()
+    except Exception:
+        disk_size = None
+    return {
+        "memory_hits": memory_hits,
+        "disk_hits": disk_hits,
+        "coalesced": coalesced,
+        "misses": misses,
+        "hit_rate": ((memory_hits + disk_hits + coalesced) / lookups) if lookups else 0.0,
+        "avg_api_latency": api["mean"],
+        "estimated_saved_sec": (memory_hits + disk_hits + coalesced) * api["mean"],
+        "disk_size": disk_size,
+    }
@@ -0,0 +1,162 @@
+import os
+import re
+import time
+import threading
+from datetime import datetime
+
+from rag_agent.lexical_index import tokenize
+from rag_agent.memory_store import count_tokens, truncate_tokens
+from utils import metrics
+
+# ==========================================
+# 답변 생성 전 추출 요약(extractive) 컨텍스트 압축
+# ==========================================
+# 웹 검색(Tavily content) / FinRAG(용어 정의 LONGTEXT) 컨텍스트를 문장 단위로 나눠 질의와의 관련도로 점수화하고,
+# 토큰 예산 안에서 상위 문장만 남깁니다. 생성(LLM) 호출 없이 동작합니다.
+#   - 점수: 질의 n-gram 겹침 (lexical_index.tokenize) + (옵션) 캐시 임베딩 코사인 유사도
+#   - 출처 보존: 문장은 원래 출처에 남고 원문 순서를 유지 -> [Source N] / 용어 인용이 그대로 유효
+#   - 각 출처의 첫 문장(정의/요지)에 가산점, 출처마다 최고 점수 문장 1개는 항상 유지
+#     (예산보다 긴 문장은 남은 예산을 출처 수로 나눈 몫까지 잘라서 유지 -> 질의한 용어가 컨텍스트에서 빠지지 않음)
+#   - 전체가 이미 예산 이내면 압축하지 않음
+
+CONTEXT_COMPRESSION_ENABLED = os.getenv("CONTEXT_COMPRESSION", "true").strip().lower() not in ("0", "false", "no")
+CONTEXT_COMPRESSION_EMBEDDINGS = os.getenv("CONTEXT_COMPRESSION_EMBEDDINGS", "false").strip().lower() in ("1", "true", "yes")
+EMBEDDING_MODEL = os.getenv("CONTEXT_COMPRESSION_EMBEDDING_MODEL", "text-embedding-3-small")
+# 임베딩 사용 시 최종 점수 = (1 - w) * lexical + w * cosine
+EMBEDDING_WEIGHT = float(os.getenv("CONTEXT_COMPRESSION_EMBEDDING_WEIGHT", "0.5"))
+LEAD_SENTENCE_BONUS = 0.15
+MIN_SENTENCE_CHARS = 8
+
+_SENTENCE_END = re.compile(r"(?<=[\.\!\?。])\s+|(?<=다\.)|\n+")
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+def _log(icon: str, msg: str):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] {icon} [Context Compression] {msg}", flush=True)
+
+def split_sentences(text: str) -> list:
+    """마침표/물음표/줄바꿈 기준 문장 분리. 너무 짧은 조각은 앞 문장에 붙임"""
+    sentences = []
+    for part in _SENTENCE_END.split(text or ""):
+        part = part.strip()
+        if not part:
+            continue
+        if sentences and len(part) < MIN_SENTENCE_CHARS:
+            sentences[-1] = f"{sentences[-1]} {part}"
+        else:
+            sentences.append(part)
+    return sentences
+
+def _get_embeddings():
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                from langchain_openai import OpenAIEmbeddings
+                from rag_agent.cached_embeddings import CachedEmbeddings
+                _embeddings = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL), model_name=EMBEDDING_MODEL)
+    return _embeddings
+
+def _embedding_scores(query: str, sentences: list) -> list | None:
+    try:
+        import numpy as np
+        vectors = np.asarray(_get_embeddings().embed_documents([query] + sentences), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return (vectors[1:] @ vectors[0]).tolist()
+    except Exception as e:
+        _log("⚠️", f"임베딩 점수 계산 실패 -> lexical 점수만 사용: {e}")
+        return None
+
+def _lexical_score(query_tokens: set, sentence: str) -> float:
+    if not query_tokens:
+        return 0.0
+    return len(query_tokens & set(tokenize(sentence))) / len(query_tokens)
+
+def compress(query: str, sources: list, budget: int, use_embeddings: bool = None, name: str = "default") -> dict:
+    """
+    sources: [{"content": 원문, ...(title/url/word 등 출처 정보)}]
+    반환: {"sources": content 만 압축한 같은 순서의 출처 목록, "original_tokens", "compressed_tokens", "compressed"}
+    content 가 빈 문자열이 된 출처는 컨텍스트에서 생략해도 되지만 번호(출처 순서)는 유지됩니다.
+    """
+    original_tokens = sum(count_tokens(s.get("content", "")) for s in sources)
+    result = {"sources": sources, "original_tokens": original_tokens,
+              "compressed_tokens": original_tokens, "compressed": False}
+    if not CONTEXT_COMPRESSION_ENABLED or original_tokens <= budget:
+        return result
+
+    t0 = time.perf_counter()
+    query_tokens = set(tokenize(query))
+    # (출처 번호, 문장 번호, 문장, 토큰 수)
+    units = []
+    for si, source in enumerate(sources):
+        for pi, sentence in enumerate(split_sentences(source.get("content", ""))):
+            units.append((si, pi, sentence, count_tokens(sentence)))
+    if not units:
+        return result
+
+    scores = [_lexical_score(query_tokens, u[2]) + (LEAD_SENTENCE_BONUS if u[1] == 0 else 0.0) for u in units]
+    use_embeddings = CONTEXT_COMPRESSION_EMBEDDINGS if use_embeddings is None else use_embeddings
+    if use_embeddings:
+        cosine = _embedding_scores(query, [u[2] for u in units])
+        if cosine is not None:
+            scores = [(1 - EMBEDDING_WEIGHT) * s + EMBEDDING_WEIGHT * c for s, c in zip(scores, cosine)]
+
+    ranked = sorted(range(len(units)), key=lambda i: scores[i], reverse=True)
+    # 1차: 출처별 최고 점수 문장 (출처 순서대로) / 2차: 나머지를 점수 순으로 예산까지
+    best_per_source = {}
+    for i in ranked:
+        best_per_source.setdefault(units[i][0], i)
+    firsts = [best_per_source[si] for si in sorted(best_per_source)]
+
+    # 1차: 짧은 문장부터 남은 예산의 균등 몫 이내로 배정, 몫보다 긴 문장은 잘라서 유지
+    texts, selected, seen, used = {}, set(), set(), 0
+    for k, i in enumerate(sorted(firsts, key=lambda i: units[i][3])):
+        sentence, tokens = units[i][2], units[i][3]
+        share = (budget - used) // (len(firsts) - k)
+        if tokens > share:
+            # 말줄임표(" …") 토큰 여유를 두고 자름
+            sentence = truncate_tokens(sentence, share - 2)
+            tokens = count_tokens(sentence)
+            if not sentence:
+                continue
+        texts[i] = sentence
+        selected.add(i)
+        seen.add(units[i][2])
+        used += tokens
+
+    for i in ranked:
+        sentence, tokens = units[i][2], units[i][3]
+        # 질의와 무관한 문장(점수 0) / 중복 문장은 예산이 남아도 제외
+        if i in best_per_source.values() or sentence in seen or scores[i] <= 0 or used + tokens > budget:
+            continue
+        texts[i] = sentence
+        selected.add(i)
+        seen.add(sentence)
+        used += tokens
+
+    compressed_sources = []
+    for si, source in enumerate(sources):
+        kept = [texts[i] for i in sorted(selected) if units[i][0] == si]
+        compressed_sources.append({**source, "content": " ".join(kept)})
+
+    compressed_tokens = sum(count_tokens(s["content"]) for s in compressed_sources)
+    metrics.incr(f"context_compression.{name}.compressed")
+    metrics.observe(f"context_compression.{name}.ratio", compressed_tokens / original_tokens)
+    metrics.observe(f"context_compression.{name}.latency", time.perf_counter() - t0)
+    _log("✂️", f"[{name}] {original_tokens} -> {compressed_tokens} 토큰 "
+              f"(문장 {len(selected)}/{len(units)}개 유지, 예산 {budget})")
+    result.update(sources=compressed_sources, compressed_tokens=compressed_tokens, compressed=True)
+    return result
+
+def get_compression_stats() -> dict:
+    stats = {}
+    for name in ("web_search", "finrag"):
+        ratio = metrics.summarize(f"context_compression.{name}.ratio")
+        stats[name] = {
+            "compressed": metrics.get_counter(f"context_compression.{name}.compressed"),
+            "mean_ratio": ratio["mean"],
+            "latency": metrics.summarize(f"context_compression.{name}.latency"),
+        }
+    return stats
@@ -1,18 +1,22 @@
 import os
+import json
 import time
+import asyncio
 from datetime import datetime
 from pathlib import Path
 from typing import TypedDict, Literal, Any
 from dotenv import load_dotenv
 
 # 벡터 DB 및 LLM (LangChain 호환 유지)
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langgraph.graph import StateGraph, START, END
+from langchain_core.documents import Document
 
-from rag_agent.web_search_rag import WebSearchRAG
+from rag_agent.web_search_rag import get_web_rag
+from utils.async_runner import run_sync
+from rag_agent import prompt_registry
+from rag_agent.lang_detect import CODE_TO_LANGUAGE, KOREAN
+from rag_agent.cached_embeddings import CachedEmbeddings
+from rag_agent import term_index, lexical_index, term_explanations, kb_bootstrap, context_compressor
+from utils import metrics
 
 # 1. 환경 설정
 load_dotenv()
@@ -20,18 +24,43 @@ load_dotenv()
 # 경로 설정
 CURRENT_FILE_PATH = Path(__file__).resolve()
 PROJECT_ROOT = CURRENT_FILE_PATH.parent.parent
-PROMPT_DIR = CURRENT_FILE_PATH.parent / "prompt" / "finrag"
 
 CHROMA_DB_PATH = PROJECT_ROOT / "data" / "financial_terms"
 COLLECTION_NAME = "financial_terms"
+EMBEDDING_MODEL = "text-embedding-3-large"
+# 벡터 검색 백엔드: chroma (기본) | mmap (utils/export_vector_index.py 로 내보낸 NumPy 색인)
+FINRAG_VECTOR_BACKEND = os.getenv("FINRAG_VECTOR_BACKEND", "chroma").strip().lower()
+VECTOR_INDEX_DIR = Path(os.getenv("VECTOR_INDEX_DIR", str(PROJECT_ROOT / "data" / "vector_index" / "financial_terms")))
 
 SIMILARITY_THRESHOLD = 0.6
+BASE_SIMILARITY_THRESHOLD = SIMILARITY_THRESHOLD    # 전체 차원(3072) 기준 임계값
+# 축소 차원 컬렉션 사용 (utils/reindex_dimensions.py 가 만든 설정에서 컬렉션 이름 / 보정된 임계값을 읽음)
+FINRAG_EMBEDDING_DIM = os.getenv("FINRAG_EMBEDDING_DIM", "").strip()
+DIMENSION_CONFIG_PATH = PROJECT_ROOT / "data" / "financial_terms_dims.json"
+EMBEDDING_DIMENSIONS = None
+VECTOR_TOP_K = 5
+MAX_CONTEXT_DOCS = 3
+# 검색 방식: vector (L2 벡터 검색만) | hybrid (벡터 + BM25, RRF 결합)
+FINRAG_RETRIEVER = os.getenv("FINRAG_RETRIEVER", "vector").strip().lower()
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "10"))
+HYBRID_MIN_COVERAGE = float(os.getenv("HYBRID_MIN_COVERAGE", "0.6"))
+# 답변 프롬프트에 넣을 용어 정의 토큰 예산 (긴 LONGTEXT 정의는 질의 관련 문장만 유지)
+FINRAG_CONTEXT_TOKEN_BUDGET = int(os.getenv("FINRAG_CONTEXT_TOKEN_BUDGET", "800"))
+# get_rag_answers 배치의 답변 생성 동시 실행 수
+RAG_BATCH_CONCURRENCY = int(os.getenv("RAG_BATCH_CONCURRENCY", "8"))
 WEB_SEARCH_KEYWORDS = ["현재", "최신", "오늘", "주가", "시세", "뉴스", "전망", "날씨", "검색해줘", "얼마야","지금","검색","검색해"]
 
 # 전역 변수
 vectorstore = None
-llm = ChatOpenAI(model="gpt-5-mini")
-web_rag = WebSearchRAG() # 웹 검색 인스턴스 생성
+query_embeddings = None     # vectorstore 가 사용하는 (캐시) 임베딩 객체 - 배치 검색 시 직접 호출
+llm = None
+
+def get_llm():
+    global llm
+    if llm is None:
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(model="gpt-5-mini")
+    return llm
 
 def print_log(step_name: str, status: str, start_time: float = None, extra_info: str = None):
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
@@ -51,36 +80,90 @@ def print_log(step_name: str, status: str, start_time: float = None, extra_info:
         print(log_msg, flush=True) 
         return elapsed
 
-def load_prompt(filename: str) -> str:
-    file_path = PROMPT_DIR / filename
+def _apply_dimension_config():
+    """FINRAG_EMBEDDING_DIM 이 설정된 경우 해당 차원의 컬렉션 / 임계값으로 전환 (설정이 없으면 전체 차원 유지)"""
+    global COLLECTION_NAME, SIMILARITY_THRESHOLD, EMBEDDING_DIMENSIONS
+    if not FINRAG_EMBEDDING_DIM:
+        return
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
+        with open(DIMENSION_CONFIG_PATH, "r", encoding="utf-8") as f:
+            entry = json.load(f)["dimensions"][FINRAG_EMBEDDING_DIM]
+    except Exception as e:
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        print(f"[{now}] ❌ [Error] 프롬프트 파일을 찾을 수 없습니다: {file_path}")
-        return "{context}\n{question}"
+        print(f"[{now}] ⚠️ 축소 차원 설정({FINRAG_EMBEDDING_DIM}) 로드 실패 -> 전체 차원 사용: {e}")
+        return
+    COLLECTION_NAME = entry["collection"]
+    SIMILARITY_THRESHOLD = float(entry["threshold"])
+    if entry["collection"] != "financial_terms":
+        EMBEDDING_DIMENSIONS = int(FINRAG_EMBEDDING_DIM)
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] 📐 임베딩 {FINRAG_EMBEDDING_DIM}차원 컬렉션 사용: {COLLECTION_NAME} "
+          f"(임계값 {SIMILARITY_THRESHOLD}, recall@{entry.get('recall', '-')})")
+
+def _check_index_freshness(meta: dict):
+    """mmap 색인이 현재 Chroma manifest(utils/set_chromaDB.py) 와 같은 원천에서 내보낸 것인지 확인 (다르면 ValueError)"""
+    try:
+        manifest = json.loads((CHROMA_DB_PATH / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        raise ValueError("Chroma manifest 없음 -> 색인 최신 여부 확인 불가")
+    if meta.get("source_model") != manifest.get("model"):
+        raise ValueError(f"색인 모델({meta.get('source_model')})이 manifest 모델({manifest.get('model')})과 다릅니다")
+    if meta.get("source_hash") != manifest.get("content_hash"):
+        raise ValueError("terms 가 바뀐 뒤 다시 내보내지 않은 색인입니다 (utils/export_vector_index.py 재실행 필요)")
 
 def load_knowledge_base():
-    """ChromaDB 연결 설정"""
-    global vectorstore
+    """벡터 저장소 연결 설정 (FINRAG_VECTOR_BACKEND: chroma | mmap, FINRAG_EMBEDDING_DIM: 축소 차원)"""
+    global vectorstore, query_embeddings
     if vectorstore is not None:
         return
-        
-    t0 = print_log("RAG ChromaDB 연결", "start")
-    try:
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-large")
-        vectorstore = Chroma(
-            persist_directory=str(CHROMA_DB_PATH),
-            embedding_function=embeddings,
-            collection_name=COLLECTION_NAME,
-            collection_metadata={"hnsw:space": "l2"},
-        )
-        print_log("RAG ChromaDB 연결", "end", t0, extra_info=f"Metric: L2, 경로: {CHROMA_DB_PATH}")
-    except Exception as e:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        print(f"[{now}] ❌ ChromaDB 연결 오류: {e}")
-        vectorstore = None
+    if kb_bootstrap.is_building():
+        # 백그라운드 구축 중: 벡터 저장소 없이 lexical / 웹 검색으로 답변, 완료 시 kb_bootstrap 이 다시 호출
+        return
+
+    from langchain_openai import OpenAIEmbeddings
+    _apply_dimension_config()
+    # 동일 질의 반복 시 임베딩 API 호출을 건너뛰도록 캐시 래퍼 사용 (축소 차원은 캐시 키를 분리)
+    if EMBEDDING_DIMENSIONS:
+        embeddings = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL, dimensions=EMBEDDING_DIMENSIONS),
+                                      model_name=f"{EMBEDDING_MODEL}@{EMBEDDING_DIMENSIONS}")
+    else:
+        embeddings = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL), model_name=EMBEDDING_MODEL)
+    query_embeddings = embeddings
+
+    if FINRAG_VECTOR_BACKEND == "mmap":
+        t0 = print_log("RAG mmap 벡터 색인 로드", "start")
+        try:
+            from rag_agent.vector_index import MmapVectorIndex
+            vectorstore = MmapVectorIndex(VECTOR_INDEX_DIR, embeddings)
+            expected_dim = EMBEDDING_DIMENSIONS or vectorstore.meta["dim"]
+            if vectorstore.meta["dim"] != expected_dim:
+                raise ValueError(f"색인 차원({vectorstore.meta['dim']})이 임베딩 차원({expected_dim})과 다릅니다")
+            _check_index_freshness(vectorstore.meta)
+            print_log("RAG mmap 벡터 색인 로드", "end", t0, extra_info=f"Metric: squared L2, 경로: {VECTOR_INDEX_DIR}")
+        except Exception as e:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ⚠️ mmap 벡터 색인 로드 실패 -> ChromaDB 사용: {e}")
+            vectorstore = None
+
+    if vectorstore is None:
+        t0 = print_log("RAG ChromaDB 연결", "start")
+        try:
+            from langchain_chroma import Chroma
+            vectorstore = Chroma(
+                persist_directory=str(CHROMA_DB_PATH),
+                embedding_function=embeddings,
+                collection_name=COLLECTION_NAME,
+                collection_metadata={"hnsw:space": "l2"},
+            )
+            print_log("RAG ChromaDB 연결", "end", t0, extra_info=f"Metric: L2, 경로: {CHROMA_DB_PATH}")
+        except Exception as e:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ❌ ChromaDB 연결 오류: {e}")
+            vectorstore = None
+
+    # 용어 정확 일치 색인 (Chroma 메타데이터 기준, 연결 실패 시 MySQL terms)
+    if term_index.TERM_INDEX_ENABLED:
+        term_index.load_term_index(vectorstore)
 
 def format_web_result(web_result, original_query, translated_query):
     citations = [f"- **{src['title']}**: {src['url']}" for src in web_result.get("sources", [])]
@@ -106,9 +189,14 @@ class FinRAGState(TypedDict, total=False):
     original_query: str
     use_web: bool
     relevant_docs: list
+    prefetched_docs: list     # 메인 에이전트가 라우팅 중 미리 검색해 둔 결과 (없으면 None)
+    target_language: str      # 사용자 언어 (사전 생성 설명을 해당 언어로 바로 출력할 때 사용)
+    output_language: str      # final_output 의 언어 (기본 Korean)
     context_text: str
     citations: list
     final_output: str
+    korean_output: str        # output_language 가 Korean 이 아닐 때의 한국어 출력 (메모리/캐시 저장용)
+    answer_source: str        # "web" (웹 검색 / 용어 검색 0건 폴백) | "db" (용어 사전)
 
 # ---------------------------------------------------------
 # [LangGraph] 노드
@@ -122,29 +210,34 @@ def node_route(state: FinRAGState) -> dict:
     print_log("1. 검색 방식 라우팅 (node_route)", "end", t0, extra_info=extra)
     return {"use_web": use_web}
 
-def node_web_search(state: FinRAGState) -> dict:
+async def node_web_search(state: FinRAGState) -> dict:
     t0 = print_log("2-A. 웹 검색 수행 (node_web_search)", "start")
     korean_query = state["korean_query"]
     original_query = state.get("original_query")
     
-    web_result = web_rag.web_search(korean_query)
+    web_result = await get_web_rag().aweb_search(korean_query)
     final_output = format_web_result(web_result, original_query, korean_query)
     
     print_log("2-A. 웹 검색 수행 (node_web_search)", "end", t0, extra_info="웹 검색 완료 및 포맷팅")
-    return {"final_output": final_output}
+    return {"final_output": final_output, "answer_source": "web"}
 
-def node_db_retrieve(state: FinRAGState) -> dict:
-    t0 = print_log("2-B. 벡터 DB 검색 (node_db_retrieve)", "start")
-    global vectorstore
-    if vectorstore is None:
-        load_knowledge_base()
-        
-    korean_query = state["korean_query"]
+def lookup_term_docs(korean_query: str) -> list:
+    """질의에 등장하는 용어를 정확 일치 색인에서 조회 (임베딩/벡터 검색 없음). 거리는 0.0 으로 표기"""
+    docs = []
+    for term in term_index.match_terms(korean_query, limit=term_index.TERM_INDEX_MAX_TERMS):
+        doc = Document(page_content=f"{term['word']}: {term['definition']}",
+                       metadata={"word": term["word"], "match": "term_index", "alias": term["alias"]})
+        docs.append((doc, 0.0))
+        print(f"      ✅ 용어 일치: {term['word']} (표면형: {term['alias']})")
+    return docs
+
+def _vector_retrieve(korean_query: str, results: list = None) -> list:
+    """벡터 DB 검색 + L2 거리 임계값 필터 (results: 배치 검색으로 미리 받은 후보)"""
     relevant_docs = []
-    
     if vectorstore:
         try:
-            results = vectorstore.similarity_search_with_score(korean_query, k=5)
+            if results is None:
+                results = vectorstore.similarity_search_with_score(korean_query, k=VECTOR_TOP_K)
             print(f"   🔍 [Search] '{korean_query}' DB 검색 수행")
             for doc, score in results:
                 if score <= SIMILARITY_THRESHOLD:
@@ -152,58 +245,282 @@ def node_db_retrieve(state: FinRAGState) -> dict:
                     print(f"      ✅ 채택: {doc.metadata.get('word')} (거리: {score:.4f})")
                 else:
                     print(f"      ❌ 제외: {doc.metadata.get('word')} (거리: {score:.4f} > {SIMILARITY_THRESHOLD})")
-            relevant_docs = relevant_docs[:3]
+            relevant_docs = relevant_docs[:MAX_CONTEXT_DOCS]
         except Exception as e:
             now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
             print(f"[{now}] ⚠️ DB 검색 중 오류: {e}")
+    return relevant_docs
+
+def _hybrid_retrieve(korean_query: str, vector_results: list = None) -> list:
+    """
+    벡터(L2) + BM25(글자 n-gram) 후보를 RRF 로 합친 뒤, 다음 중 하나를 만족하는 문서만 채택
+      - L2 거리 <= SIMILARITY_THRESHOLD
+      - 용어명 n-gram 의 HYBRID_MIN_COVERAGE 이상이 질의에 등장 (약어/복합어 보완)
+    """
+    candidates = {}     # word -> {"doc", "distance", "accepted"}
+    vector_rank, lexical_rank = [], []
+
+    if vectorstore:
+        try:
+            if vector_results is None:
+                vector_results = vectorstore.similarity_search_with_score(korean_query, k=HYBRID_CANDIDATES)
+            for doc, score in vector_results:
+                word = doc.metadata.get("word")
+                vector_rank.append(word)
+                candidates[word] = {"doc": doc, "distance": score, "accepted": score <= SIMILARITY_THRESHOLD}
+        except Exception as e:
+            # 벡터 검색이 실패해도 BM25 결과로 답변 가능
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ⚠️ DB 검색 중 오류 (BM25 결과만 사용): {e}")
+
+    bm25 = lexical_index.load_bm25_index(term_index.load_term_index(vectorstore).terms)
+    for doc_id, score, coverage in bm25.search(korean_query, k=HYBRID_CANDIDATES):
+        term = bm25.terms[doc_id]
+        word = term["word"]
+        lexical_rank.append(word)
+        entry = candidates.get(word)
+        if entry is None:
+            doc = Document(page_content=f"{word}: {term['definition']}", metadata={"word": word, "match": "bm25"})
+            entry = candidates[word] = {"doc": doc, "distance": None, "accepted": False}
+        if coverage >= HYBRID_MIN_COVERAGE:
+            entry["accepted"] = True
+
+    print(f"   🔍 [Hybrid Search] '{korean_query}' 벡터 {len(vector_rank)}건 + BM25 {len(lexical_rank)}건 RRF 결합")
+    relevant_docs = []
+    for word, rrf in lexical_index.reciprocal_rank_fusion([vector_rank, lexical_rank]):
+        entry = candidates[word]
+        if not entry["accepted"]:
+            continue
+        relevant_docs.append((entry["doc"], entry["distance"]))
+        dist = f"{entry['distance']:.4f}" if entry["distance"] is not None else "-"
+        print(f"      ✅ 채택: {word} (RRF: {rrf:.4f}, 거리: {dist})")
+        if len(relevant_docs) >= MAX_CONTEXT_DOCS:
+            break
+    return relevant_docs
+
+def retrieve_relevant_docs(korean_query: str, retriever: str = None) -> list:
+    """
+    용어 정확 일치 -> 없으면 FINRAG_RETRIEVER (vector | hybrid) 검색
+    지식 베이스 구축 중(벡터 저장소 없음)에는 BM25 만 사용 (lexical)
+    (읽기 전용 -> 메인 에이전트의 추측 실행(prefetch)에도 사용)
+    """
+    if vectorstore is None:
+        load_knowledge_base()
+
+    relevant_docs = lookup_term_docs(korean_query)
+    if relevant_docs:
+        metrics.incr("finrag.retrieve.term_index")
+        return relevant_docs
+
+    retriever = retriever or FINRAG_RETRIEVER
+    if vectorstore is None and kb_bootstrap.is_building():
+        # _hybrid_retrieve 는 벡터 저장소가 없으면 BM25 커버리지 조건만으로 채택
+        retriever = "lexical"
+    relevant_docs = _hybrid_retrieve(korean_query) if retriever in ("hybrid", "lexical") else _vector_retrieve(korean_query)
+    metrics.incr(f"finrag.retrieve.{retriever}")
+    if not relevant_docs:
+        # 유효 문서 0개 -> node_web_fallback (Tavily) 로 전환됨
+        metrics.incr(f"finrag.empty.{retriever}")
+    return relevant_docs
+
+def _search_by_vectors(vectors: list, k: int) -> list:
+    """
+    질의 벡터 여러 개 검색 (mmap: 행렬 곱 1회 / Chroma: 공개 API 로 벡터당 1회)
+    Chroma 의 similarity_search_by_vector_with_relevance_scores 는 L2 거리를 그대로 반환합니다.
+    """
+    if hasattr(vectorstore, "similarity_search_by_vectors_with_score"):
+        return vectorstore.similarity_search_by_vectors_with_score(vectors, k=k)
+    return [vectorstore.similarity_search_by_vector_with_relevance_scores(vec, k=k) for vec in vectors]
+
+def retrieve_relevant_docs_batch(korean_queries: list, retriever: str = None) -> list:
+    """
+    retrieve_relevant_docs 의 배치 버전 (입력 순서대로 결과 반환)
+    용어 정확 일치가 없는 질의만 모아 임베딩 요청 1회로 처리합니다. (벡터 검색은 mmap 이면 1회, Chroma 면 질의당 1회)
+    """
+    if vectorstore is None:
+        load_knowledge_base()
+    retriever = retriever or FINRAG_RETRIEVER
+
+    results = [lookup_term_docs(q) for q in korean_queries]
+    metrics.incr("finrag.retrieve.term_index", sum(1 for r in results if r))
+    pending = [i for i, r in enumerate(results) if not r]
+    if not pending:
+        return results
+
+    vector_results = {}
+    if vectorstore and query_embeddings is not None:
+        k = HYBRID_CANDIDATES if retriever == "hybrid" else VECTOR_TOP_K
+        try:
+            t0 = time.perf_counter()
+            vectors = query_embeddings.embed_documents([korean_queries[i] for i in pending])
+            searched = _search_by_vectors(vectors, k)
+            vector_results = dict(zip(pending, searched))
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] 🔍 [Batch Search] 질의 {len(pending)}개 임베딩 + 벡터 검색 "
+                  f"(소요시간: {time.perf_counter() - t0:.3f}초)", flush=True)
+        except Exception as e:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ⚠️ 배치 검색 실패 -> 질의별 검색으로 진행: {e}")
+
+    for i in pending:
+        q = korean_queries[i]
+        if i not in vector_results:
+            results[i] = retrieve_relevant_docs(q, retriever)
+            continue
+        if retriever == "hybrid":
+            results[i] = _hybrid_retrieve(q, vector_results[i])
+        else:
+            results[i] = _vector_retrieve(q, vector_results[i])
+        metrics.incr(f"finrag.retrieve.{retriever}")
+        if not results[i]:
+            metrics.incr(f"finrag.empty.{retriever}")
+    return results
+
+def get_retrieval_stats() -> dict:
+    """검색 방식별 호출 수와 웹 폴백(유효 문서 0개) 비율"""
+    stats = {"retriever": FINRAG_RETRIEVER, "term_index_hits": metrics.get_counter("finrag.retrieve.term_index"),
+             "knowledge_base": kb_bootstrap.get_status()["status"]}
+    for name in ("vector", "hybrid", "lexical"):
+        total = metrics.get_counter(f"finrag.retrieve.{name}")
+        empty = metrics.get_counter(f"finrag.empty.{name}")
+        stats[name] = {"queries": total, "web_fallbacks": empty, "fallback_rate": (empty / total) if total else 0.0}
+    return stats
+
+async def node_db_retrieve(state: FinRAGState) -> dict:
+    t0 = print_log("2-B. 벡터 DB 검색 (node_db_retrieve)", "start")
+    if state.get("prefetched_docs") is not None:
+        relevant_docs = state["prefetched_docs"]
+        extra = f"미리 조회된(prefetch) 문서 사용: {len(relevant_docs)}개"
+    else:
+        # 질의 임베딩(HTTP) + Chroma 검색은 동기 API 이므로 워커 스레드에서 실행
+        relevant_docs = await asyncio.to_thread(retrieve_relevant_docs, state["korean_query"])
+        extra = f"조회된 유효 문서 수: {len(relevant_docs)}개"
             
-    print_log("2-B. 벡터 DB 검색 (node_db_retrieve)", "end", t0, extra_info=f"조회된 유효 문서 수: {len(relevant_docs)}개")
+    print_log("2-B. 벡터 DB 검색 (node_db_retrieve)", "end", t0, extra_info=extra)
     return {"relevant_docs": relevant_docs}
 
-def node_web_fallback(state: FinRAGState) -> dict:
+async def node_web_fallback(state: FinRAGState) -> dict:
     t0 = print_log("3-A. 웹 검색으로 폴백 (node_web_fallback)", "start")
     extra = "내부 DB에 관련 정보 없음 (유효 문서 0개) -> 웹 검색 자동 전환"
     print_log("3-A. 웹 검색으로 폴백 (node_web_fallback)", "end", t0, extra_info=extra)
-    return node_web_search(state)
+    return await node_web_search(state)
 
-def node_db_answer(state: FinRAGState) -> dict:
-    t0 = print_log("3-B. DB 기반 답변 생성 (node_db_answer)", "start")
-    korean_query = state["korean_query"]
-    original_query = state.get("original_query")
-    relevant_docs = state.get("relevant_docs") or []
-    
-    context_text = ""
-    citations = []
-    for doc, score in relevant_docs:
-        word = doc.metadata.get("word", "Term")
-        raw_content = doc.page_content
-        definition = raw_content.split(":", 1)[1].strip() if ":" in raw_content else raw_content
-        context_text += f"- **{word}**: {definition}\n"
-        citations.append(f"- **{word}**: {definition[:60]}... (거리: {score:.4f})")
-
-    system_template = load_prompt("finrag_01_system.md")
-    rag_prompt = PromptTemplate.from_template(system_template)
-    rag_chain = rag_prompt | llm | StrOutputParser()
-    
-    try:
-        ai_answer = rag_chain.invoke({"context": context_text, "question": korean_query})
-    except Exception as e:
-        ai_answer = f"죄송합니다. 답변 생성 중 오류가 발생했습니다. ({e})"
+# 사전 생성 설명을 다른 언어로 바로 내보낼 때 사용하는 머리글
+OUTPUT_HEADERS = {
+    "ko": ("질문", "FinBot의 답변", "내부 참고 문헌", "용어 일치"),
+    "en": ("Question", "FinBot's Answer", "Internal References", "term match"),
+    "vi": ("Câu hỏi", "Câu trả lời của FinBot", "Tài liệu tham khảo nội bộ", "khớp thuật ngữ"),
+    "id": ("Pertanyaan", "Jawaban FinBot", "Referensi Internal", "istilah cocok"),
+}
 
-    final_output = f"""
-### 🌏 질문
+def _split_definition(doc) -> str:
+    raw_content = doc.page_content
+    return raw_content.split(":", 1)[1].strip() if ":" in raw_content else raw_content
+
+def build_db_context(korean_query: str, relevant_docs: list, compress: bool = True) -> str:
+    """검색된 용어 정의 -> 답변 프롬프트 컨텍스트 ("- **용어**: 정의", 용어별 출처 유지)"""
+    items = [{"word": doc.metadata.get("word", "Term"), "content": _split_definition(doc)} for doc, _ in relevant_docs]
+    if compress:
+        items = context_compressor.compress(korean_query, items, FINRAG_CONTEXT_TOKEN_BUDGET, name="finrag")["sources"]
+    return "".join(f"- **{item['word']}**: {item['content']}\n" for item in items if item["content"])
+
+def _format_db_output(original_query, korean_query, answer, citations, code="ko") -> str:
+    question_h, answer_h, refs_h, _ = OUTPUT_HEADERS[code]
+    return f"""
+### 🌏 {question_h}
 - **Original**: {original_query if original_query else korean_query}
 - **Translated**: {korean_query}
 
-### 💡 FinBot의 답변
-{ai_answer}
+### 💡 {answer_h}
+{answer}
 
 ---
-### 📚 내부 참고 문헌
+### 📚 {refs_h}
 {chr(10).join(citations)}
 """
-    print_log("3-B. DB 기반 답변 생성 (node_db_answer)", "end", t0)
-    return {"final_output": final_output}
+
+def _confident_single_term(korean_query: str, relevant_docs: list) -> tuple | None:
+    """검색 결과가 확실한 용어 하나이고 질문이 그 용어의 뜻을 묻는 경우 (용어, 정의) 반환"""
+    if len(relevant_docs) != 1:
+        return None
+    doc, score = relevant_docs[0]
+    word = doc.metadata.get("word")
+    if not word:
+        return None
+    if doc.metadata.get("match") == "term_index":
+        aliases = [doc.metadata.get("alias") or word]
+    elif score is not None and score <= (term_explanations.TERM_EXPLANATION_MAX_DISTANCE
+                                         * SIMILARITY_THRESHOLD / BASE_SIMILARITY_THRESHOLD):
+        aliases = term_index.surface_forms(word)
+    else:
+        return None
+    if not any(term_explanations.is_definition_question(korean_query, a) for a in aliases):
+        return None
+    return word, _split_definition(doc)
+
+def _lookup_precomputed(state: FinRAGState, relevant_docs: list) -> tuple | None:
+    """
+    반환: (설명, 언어 코드, 한국어 설명) - 사용자 언어 생성본 우선, 없으면 한국어 생성본
+    사용자 언어 생성본을 쓸 때도 한국어 설명을 함께 반환 (한국어 생성본이 없으면 용어 정의 원문)
+    """
+    term = _confident_single_term(state["korean_query"], relevant_docs)
+    if term is None:
+        return None
+    word, definition = term
+    target = term_explanations.language_code(state.get("target_language")) or "ko"
+    for code in dict.fromkeys((target, "ko")):
+        text = term_explanations.lookup(word, definition, code)
+        if text is not None:
+            if code == "ko":
+                return text, code, text
+            return text, code, term_explanations.lookup(word, definition, "ko") or definition
+    return None
+
+def _citations(relevant_docs: list, code: str) -> list:
+    citations = []
+    for doc, score in relevant_docs:
+        word = doc.metadata.get("word", "Term")
+        definition = _split_definition(doc)
+        if doc.metadata.get("match") == "term_index":
+            source = OUTPUT_HEADERS[code][3]
+        elif score is None:
+            source = "BM25"
+        else:
+            source = f"거리: {score:.4f}"
+        citations.append(f"- **{word}**: {definition[:60]}... ({source})")
+    return citations
+
+async def node_db_answer(state: FinRAGState) -> dict:
+    t0 = print_log("3-B. DB 기반 답변 생성 (node_db_answer)", "start")
+    korean_query = state["korean_query"]
+    original_query = state.get("original_query")
+    relevant_docs = state.get("relevant_docs") or []
+
+    precomputed = _lookup_precomputed(state, relevant_docs)
+    code = precomputed[1] if precomputed else "ko"
+    citations = _citations(relevant_docs, code)
+
+    if precomputed:
+        ai_answer = precomputed[0]
+        extra = f"사전 생성 설명 사용 (언어: {code}) -> 답변 생성 LLM 생략"
+    else:
+        try:
+            context_text = build_db_context(korean_query, relevant_docs)
+            # "final_answer" 태그: 메인 에이전트 스트리밍(stream_fintech_agent)에서 토큰을 화면으로 전달
+            rag_chain = prompt_registry.get_chain("finrag/finrag_01_system.md", get_llm(), tags=["final_answer"])
+            ai_answer = await rag_chain.ainvoke({"context": context_text, "question": korean_query})
+        except Exception as e:
+            ai_answer = f"죄송합니다. 답변 생성 중 오류가 발생했습니다. ({e})"
+        extra = None
+
+    final_output = _format_db_output(original_query, korean_query, ai_answer, citations, code)
+    korean_output = final_output
+    if code != "ko":
+        korean_output = _format_db_output(original_query, korean_query, precomputed[2],
+                                          _citations(relevant_docs, "ko"), "ko")
+    print_log("3-B. DB 기반 답변 생성 (node_db_answer)", "end", t0, extra_info=extra)
+    return {"final_output": final_output, "korean_output": korean_output,
+            "output_language": CODE_TO_LANGUAGE[code], "answer_source": "db"}
 
 def route_after_start(state: FinRAGState) -> Literal["web_search", "db_retrieve"]:
     return "web_search" if state.get("use_web") else "db_retrieve"
@@ -219,6 +536,7 @@ _finrag_graph = None
 def _get_finrag_graph():
     global _finrag_graph
     if _finrag_graph is None:
+        from langgraph.graph import StateGraph, START, END
         builder = StateGraph(FinRAGState)
         builder.add_node("route", node_route)
         builder.add_node("web_search", node_web_search)
@@ -235,22 +553,76 @@ def _get_finrag_graph():
         _finrag_graph = builder.compile()
     return _finrag_graph
 
-def get_rag_answer(korean_query, original_query=None):
+async def aget_rag_result(korean_query, original_query=None, prefetched_docs=None, target_language=None) -> dict:
+    """
+    반환: {"answer": 최종 출력, "language": 출력 언어, "korean_answer": 한국어 출력, "source": "web" | "db"}
+    target_language 의 사전 생성 설명이 있으면 그 언어로 바로 출력하므로 (language != "Korean"),
+    호출 측은 역번역을 생략할 수 있습니다. 이때도 korean_answer 는 한국어입니다.
+    """
     print("\n" + "-"*50)
     total_t0 = print_log("FinRAG 에이전트 파이프라인", "start")
     
     if vectorstore is None:
-        load_knowledge_base()
+        await asyncio.to_thread(load_knowledge_base)
         
     graph = _get_finrag_graph()
-    initial: FinRAGState = {"korean_query": korean_query, "original_query": original_query}
-    result = graph.invoke(initial)
+    initial: FinRAGState = {"korean_query": korean_query, "original_query": original_query,
+                            "prefetched_docs": prefetched_docs, "target_language": target_language}
+    result = await graph.ainvoke(initial)
     
     print("-"*50)
     print_log("FinRAG 에이전트 파이프라인", "end", total_t0)
     print("-"*50 + "\n")
     
-    return result.get("final_output", "답변을 생성하지 못했습니다.")
+    answer = result.get("final_output", "답변을 생성하지 못했습니다.")
+    return {"answer": answer,
+            "language": result.get("output_language") or KOREAN,
+            "korean_answer": result.get("korean_output") or answer,
+            "source": result.get("answer_source")}
+
+async def aget_rag_answer(korean_query, original_query=None, prefetched_docs=None):
+    """한국어 답변 문자열 반환"""
+    result = await aget_rag_result(korean_query, original_query, prefetched_docs)
+    return result["answer"]
+
+def get_rag_answer(korean_query, original_query=None):
+    """aget_rag_answer 의 동기 래퍼"""
+    return run_sync(aget_rag_answer(korean_query, original_query))
+
+async def aget_rag_answers(korean_queries: list, original_queries: list = None,
+                           max_concurrency: int = RAG_BATCH_CONCURRENCY) -> list:
+    """
+    여러 질문을 한 번에 처리 (오프라인 평가, 캐시 워밍, 복수 용어 질문 등)
+    - 웹 검색 키워드가 없는 질문은 임베딩 요청 1회로 모아 문서를 미리 검색
+    - 답변 생성은 최대 max_concurrency 개씩 동시 실행, 결과는 입력 순서대로 반환
+    """
+    if vectorstore is None:
+        await asyncio.to_thread(load_knowledge_base)
+    original_queries = original_queries or [None] * len(korean_queries)
+    t0 = print_log(f"FinRAG 배치 ({len(korean_queries)}건)", "start")
+
+    db_indices = [i for i, q in enumerate(korean_queries) if not any(kw in q for kw in WEB_SEARCH_KEYWORDS)]
+    retrieved = await asyncio.to_thread(retrieve_relevant_docs_batch, [korean_queries[i] for i in db_indices])
+    prefetched = dict(zip(db_indices, retrieved))
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _answer(i: int) -> str:
+        async with semaphore:
+            try:
+                return await aget_rag_answer(korean_queries[i], original_queries[i], prefetched_docs=prefetched.get(i))
+            except Exception as e:
+                return f"죄송합니다. 답변 생성 중 오류가 발생했습니다. ({e})"
+
+    answers = await asyncio.gather(*(_answer(i) for i in range(len(korean_queries))))
+    print_log(f"FinRAG 배치 ({len(korean_queries)}건)", "end", t0,
+              extra_info=f"내부 DB 검색 {len(db_indices)}건 일괄 처리, 동시 실행 {max_concurrency}")
+    return list(answers)
+
+def get_rag_answers(korean_queries: list, original_queries: list = None,
+                    max_concurrency: int = RAG_BATCH_CONCURRENCY) -> list:
+    """aget_rag_answers 의 동기 래퍼"""
+    return run_sync(aget_rag_answers(korean_queries, original_queries, max_concurrency))
 
 if __name__ == "__main__":
     load_knowledge_base()
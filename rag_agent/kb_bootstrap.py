@@ -0,0 +1,155 @@
+import os
+import time
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from utils import metrics
+
+# ==========================================
+# 금융 용어 지식 베이스 백그라운드 구축
+# ==========================================
+# 앱 시작 시 ensure_knowledge_base() 가 백그라운드 스레드를 띄우고 바로 반환합니다.
+#   1. checking: manifest(행 수 + 내용 해시)를 MySQL terms 와 비교 (utils/set_chromaDB.py)
+#   2. building: 불일치하면 변경분만 다시 임베딩해 ChromaDB 동기화 후 manifest 기록
+#   3. ready:    finrag_agent.load_knowledge_base() 로 벡터 저장소 연결
+# building 동안 FinRAG 는 벡터 검색 대신 용어 일치 / BM25(lexical) 검색 -> 없으면 웹 검색으로 답합니다.
+# 여러 프로세스(Streamlit 워커, 배치 스크립트)가 동시에 구축하지 않도록 잠금 파일을 사용합니다.
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+LOCK_PATH = PROJECT_ROOT / "data" / "financial_terms.build.lock"
+
+# 잠금 파일이 이 시간(초) 이상 갱신되지 않으면 (구축 프로세스 비정상 종료) 제거 후 진행
+KB_LOCK_STALE_SEC = float(os.getenv("KB_LOCK_STALE_SEC", "600"))
+KB_LOCK_POLL_SEC = 2.0
+
+IDLE, CHECKING, BUILDING, READY, FAILED = "idle", "checking", "building", "ready", "failed"
+
+_state = {"status": IDLE, "done": 0, "total": 0, "reason": None, "error": None,
+          "started_at": None, "finished_at": None}
+_state_lock = threading.Lock()
+_thread = None
+
+def _log(icon: str, msg: str):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] {icon} [KB Bootstrap] {msg}", flush=True)
+
+def _update(**fields):
+    with _state_lock:
+        _state.update(fields)
+
+def _on_progress(done: int, total: int):
+    _update(done=done, total=total)
+    # 다른 프로세스가 오래된 잠금으로 오인하지 않도록 갱신
+    try:
+        os.utime(LOCK_PATH)
+    except OSError:
+        pass
+
+# ---------------------------------------------------------
+# 프로세스 간 잠금
+# ---------------------------------------------------------
+def _try_lock() -> bool:
+    LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if time.time() - LOCK_PATH.stat().st_mtime > KB_LOCK_STALE_SEC:
+            _log("⚠️", f"오래된 잠금 파일 제거: {LOCK_PATH}")
+            LOCK_PATH.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        fd = os.open(LOCK_PATH, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        f.write(str(os.getpid()))
+    return True
+
+def _unlock():
+    try:
+        LOCK_PATH.unlink()
+    except FileNotFoundError:
+        pass
+
+# ---------------------------------------------------------
+# 구축 작업
+# ---------------------------------------------------------
+def _run():
+    from utils import set_chromaDB
+
+    t0 = time.perf_counter()
+    try:
+        _update(status=CHECKING)
+        try:
+            rows = set_chromaDB.load_rows()
+        except Exception as e:
+            # MySQL 연결 불가: manifest 와 컬렉션 행 수만 확인
+            _log("⚠️", f"MySQL terms 조회 실패 -> manifest 만 확인: {e}")
+            rows = None
+        ok, reason = set_chromaDB.check_manifest(rows)
+        if not ok:
+            if rows is None:
+                raise RuntimeError(f"색인 검증 불가 ({reason})")
+            _update(status=BUILDING, reason=reason, done=0, total=0)
+            while not _try_lock():
+                # 다른 프로세스가 구축 중 -> 잠금이 풀릴 때까지 대기
+                _update(reason=f"{reason} (다른 프로세스에서 구축 중)")
+                time.sleep(KB_LOCK_POLL_SEC)
+            try:
+                # 기다리는 동안 다른 프로세스가 이미 구축했을 수 있으므로 다시 확인
+                ok, reason = set_chromaDB.check_manifest(rows)
+                if not ok:
+                    _log("🔄", f"지식 베이스 구축 시작: {reason}")
+                    _update(reason=reason)
+                    set_chromaDB.build_index(rows, progress_callback=_on_progress)
+                    metrics.incr("kb_bootstrap.builds")
+                    reason = "구축 완료"
+            finally:
+                _unlock()
+
+        _update(status=READY, reason=reason, error=None)
+        _log("✅", f"지식 베이스 준비 완료 ({reason}, 소요시간: {time.perf_counter() - t0:.1f}초)")
+    except Exception as e:
+        metrics.incr("kb_bootstrap.failures")
+        _update(status=FAILED, error=str(e))
+        _log("❌", f"지식 베이스 구축 실패 -> 기존 컬렉션으로 진행: {e}")
+    finally:
+        _update(finished_at=time.time())
+        metrics.observe("kb_bootstrap.duration", time.perf_counter() - t0)
+
+    # 실패해도 기존 컬렉션(일부/이전 데이터)이 있으면 사용, 비어 있으면 검색 0건 -> 웹 검색
+    try:
+        from rag_agent.finrag_agent import load_knowledge_base
+        load_knowledge_base()
+    except Exception as e:
+        _log("❌", f"벡터 저장소 연결 실패: {e}")
+
+def ensure_knowledge_base() -> dict:
+    """백그라운드 구축 시작 (이미 시작했으면 아무것도 하지 않음). 현재 상태를 바로 반환"""
+    global _thread
+    with _state_lock:
+        if _thread is None:
+            _state.update(status=CHECKING, started_at=time.time())
+            _thread = threading.Thread(target=_run, name="kb-bootstrap", daemon=True)
+            _thread.start()
+    return get_status()
+
+def wait_until_ready(timeout: float = None) -> bool:
+    """배치 스크립트 등 구축 완료를 기다려야 하는 호출자용"""
+    if _thread is not None:
+        _thread.join(timeout)
+    return is_ready()
+
+def get_status() -> dict:
+    with _state_lock:
+        status = dict(_state)
+    status["progress"] = (status["done"] / status["total"]) if status["total"] else 0.0
+    return status
+
+def is_ready() -> bool:
+    return get_status()["status"] == READY
+
+def is_building() -> bool:
+    """구축 작업이 진행 중 (검증 포함) -> FinRAG 는 벡터 저장소 없이 lexical / 웹 검색으로 답변"""
+    return get_status()["status"] in (CHECKING, BUILDING)
@@ -0,0 +1,181 @@
+import re
+import math
+import unicodedata
+from collections import Counter
+
+# ==========================================
+# 로컬 언어 식별기 (LLM 번역 호출 전 fast path)
+# ==========================================
+# 1) 유니코드 스크립트 비율로 한글 / 라틴 문자를 먼저 나누고
+# 2) 라틴 문자열은 베트남어 전용 발음 구별 기호 + 문자 3-gram 통계로 영어/베트남어/인도네시아어를 구분합니다.
+# 3) members.preferred_language 와 세션의 직전 감지 언어를 사전 확률(prior)로 사용합니다.
+# 결과가 확신(CONFIDENCE_THRESHOLD 이상)일 때만 호출 측에서 LLM 번역을 생략할 수 있습니다.
+
+KOREAN = "Korean"
+ENGLISH = "English"
+VIETNAMESE = "Vietnamese"
+INDONESIAN = "Indonesian"
+
+# members.preferred_language 코드 -> LLM 번역 프롬프트가 사용하는 언어명
+CODE_TO_LANGUAGE = {"ko": KOREAN, "en": ENGLISH, "vi": VIETNAMESE, "id": INDONESIAN}
+
+CONFIDENCE_THRESHOLD = 0.85
+KOREAN_RATIO_THRESHOLD = 0.85   # 한글 비율이 이 이상이면 한국어
+LATIN_RATIO_THRESHOLD = 0.15    # 한글 비율이 이 이하이면 라틴 문자 언어
+
+PREFERRED_PRIOR = 0.6           # 로그 오즈 가산치
+LAST_LANGUAGE_PRIOR = 0.9
+
+_HANGUL_RE = re.compile(r"[가-힣ᄀ-ᇿ㄰-㆏]")
+_LATIN_WORD_RE = re.compile(r"[A-Za-zÀ-ɏḀ-ỿ]+")
+# 베트남어에만 등장하는 문자 (ă, ơ, ư, đ 및 성조가 결합된 모음)
+_VIETNAMESE_CHAR_RE = re.compile(r"[ăâđêôơưĂÂĐÊÔƠƯẠ-ỹ]")
+
+# 한국어 문장 안에 섞여 들어오는 영문 약어(ETF, DSR, KOSPI 등)는 언어 판단에서 제외
+_ACRONYM_RE = re.compile(r"^[A-Z0-9]{2,6}$")
+
+# 3-gram 프로파일 학습용 시드 문장 (일상 + 금융 도메인 어휘)
+_SEED_CORPUS = {
+    ENGLISH: """
+        how much money is in my account please show my balance what is the interest rate
+        i want to send money to my mother transfer one hundred dollars to my friend
+        what is the exchange rate today tell me the latest stock price of samsung
+        can you explain what a loan is how do i open a savings account thank you hello
+        show me my recent transactions how much did i spend this month what does this mean
+        the bank will charge a fee for the transfer where can i find the nearest branch
+        yes no cancel confirm please help me with my tax return and credit card payment
+    """,
+    VIETNAMESE: """
+        tài khoản của tôi còn bao nhiêu tiền cho tôi xem số dư lãi suất là gì
+        tôi muốn chuyển tiền cho mẹ tôi chuyển một trăm đô cho bạn tôi
+        tỷ giá hôm nay là bao nhiêu cho tôi biết giá cổ phiếu mới nhất của samsung
+        bạn có thể giải thích khoản vay là gì làm thế nào để mở tài khoản tiết kiệm cảm ơn xin chào
+        cho tôi xem các giao dịch gần đây tháng này tôi đã tiêu bao nhiêu điều này có nghĩa là gì
+        ngân hàng sẽ thu phí chuyển khoản chi nhánh gần nhất ở đâu vâng không hủy xác nhận
+    """,
+    INDONESIAN: """
+        berapa uang di rekening saya tolong tunjukkan saldo saya apa itu suku bunga
+        saya ingin mengirim uang kepada ibu saya transfer seratus dolar ke teman saya
+        berapa kurs hari ini beri tahu harga saham terbaru samsung
+        bisakah kamu menjelaskan apa itu pinjaman bagaimana cara membuka rekening tabungan terima kasih halo
+        tunjukkan transaksi terakhir saya berapa yang saya habiskan bulan ini apa artinya ini
+        bank akan mengenakan biaya untuk transfer di mana cabang terdekat ya tidak batal konfirmasi
+    """,
+}
+
+def _char_ngrams(text: str, n: int = 3) -> list:
+    grams = []
+    for word in _LATIN_WORD_RE.findall(text.lower()):
+        padded = f" {word} "
+        grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+def _build_profiles() -> dict:
+    profiles = {}
+    for lang, corpus in _SEED_CORPUS.items():
+        counts = Counter(_char_ngrams(corpus))
+        total = sum(counts.values())
+        profiles[lang] = (counts, total)
+    return profiles
+
+_PROFILES = _build_profiles()
+_VOCAB_SIZE = len(set().union(*(c for c, _ in _PROFILES.values())))
+
+def _normalize_language(value) -> str | None:
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.lower() in CODE_TO_LANGUAGE:
+        return CODE_TO_LANGUAGE[value.lower()]
+    for lang in CODE_TO_LANGUAGE.values():
+        if lang.lower() == value.lower():
+            return lang
+    return None
+
+def _latin_scores(text: str) -> dict:
+    """라틴 문자열에 대한 언어별 로그 우도"""
+    grams = _char_ngrams(text)
+    scores = {}
+    for lang, (counts, total) in _PROFILES.items():
+        scores[lang] = sum(math.log((counts.get(g, 0) + 1) / (total + _VOCAB_SIZE)) for g in grams)
+
+    # 베트남어 전용 문자는 n-gram 통계보다 강한 신호
+    vi_chars = len(_VIETNAMESE_CHAR_RE.findall(text))
+    if vi_chars:
+        scores[VIETNAMESE] += 4.0 * vi_chars
+    return scores
+
+def _softmax(scores: dict) -> dict:
+    top = max(scores.values())
+    exp = {k: math.exp(v - top) for k, v in scores.items()}
+    total = sum(exp.values())
+    return {k: v / total for k, v in exp.items()}
+
+def detect_language(text: str, preferred_language: str = None, last_language: str = None) -> dict:
+    """
+    로컬 언어 식별.
+    반환: {"language": 언어명 | None, "confidence": 0~1, "mixed": 한글/라틴 혼합 여부}
+    language 가 None 이거나 confidence 가 낮으면 LLM 번역 경로를 사용해야 합니다.
+    """
+    preferred = _normalize_language(preferred_language)
+    last = _normalize_language(last_language)
+    text = unicodedata.normalize("NFC", text or "")
+
+    hangul = len(_HANGUL_RE.findall(text))
+    latin_words = [w for w in _LATIN_WORD_RE.findall(text) if not _ACRONYM_RE.match(w)]
+    latin = sum(len(w) for w in latin_words)
+
+    if hangul + latin == 0:
+        # 숫자/기호만 있는 입력: 스크립트 정보가 없으므로 prior 만으로는 확신하지 않음
+        return {"language": last or preferred, "confidence": 0.0, "mixed": False}
+
+    hangul_ratio = hangul / (hangul + latin)
+    if hangul_ratio >= KOREAN_RATIO_THRESHOLD:
+        return {"language": KOREAN, "confidence": hangul_ratio, "mixed": hangul_ratio < 1.0}
+    if hangul_ratio > LATIN_RATIO_THRESHOLD:
+        return {"language": None, "confidence": 0.0, "mixed": True}
+
+    scores = _latin_scores(" ".join(latin_words))
+    if preferred in scores:
+        scores[preferred] += PREFERRED_PRIOR
+    if last in scores:
+        scores[last] += LAST_LANGUAGE_PRIOR
+    probs = _softmax(scores)
+    best = max(probs, key=probs.get)
+    # 아주 짧은 입력(단어 1~2개)은 n-gram 근거가 부족하므로 신뢰도를 깎음
+    confidence = probs[best] * min(1.0, 0.5 + 0.25 * len(latin_words))
+    return {"language": best, "confidence": confidence, "mixed": hangul_ratio > 0}
+
+def is_confident_korean(result: dict) -> bool:
+    return result.get("language") == KOREAN and result.get("confidence", 0.0) >= CONFIDENCE_THRESHOLD
+
+# ---------------------------------------------------------
+# LLM 없이 문맥 보정 필요 여부 판단 (main_01_translation.md 의 needs_context 규칙과 동일한 기준)
+# ---------------------------------------------------------
+_CONTEXT_MARKERS = [
+    "그거", "이거", "저거", "그것", "이것", "저것", "그건", "이건", "그게", "이게",
+    "그 사람", "그사람", "거기", "방금", "아까", "위에", "앞에서", "말한",
+    "첫 번째", "두 번째", "세 번째", "첫번째", "두번째", "세번째",
+    "그럼", "그러면", "그래서", "왜 그런", "더 자세히", "둘 중", "어느 것", "어느 쪽",
+]
+# 마커는 어절 처음에서만 인정 (조사는 뒤에 붙어도 됨): "차이게" 의 "이게", "11번가" 의 "1번" 제외
+_CONTEXT_MARKER_RE = re.compile(
+    r"(?<!\w)(?:" + "|".join(re.escape(m) for m in sorted(_CONTEXT_MARKERS, key=len, reverse=True)) + r")"
+    r"|(?<!\w)[1-3]\s*번(?![가지])"
+)
+
+def needs_context_heuristic(korean_query: str, has_history: bool, is_known_term=None) -> bool:
+    """
+    is_known_term: 질문에 금융 용어/고유명사가 있는지 판단하는 함수 (선택, 예: term_index.match_terms)
+    """
+    if not has_history:
+        return False
+    query = korean_query.strip()
+    if _CONTEXT_MARKER_RE.search(query):
+        return True
+    # "얼마야?", "왜?" 처럼 주어 없이 짧은 후속 질문 (단, "ETF", "코스피" 처럼 대상이 있는 짧은 질문은 제외)
+    if len(re.sub(r"[\s\?\!\.]", "", query)) > 4:
+        return False
+    if any(_ACRONYM_RE.match(w) for w in re.findall(r"[A-Za-z0-9]+", query) if not w.isdigit()):
+        return False
+    return not (is_known_term and is_known_term(query))
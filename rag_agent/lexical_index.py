@@ -0,0 +1,99 @@
+import os
+import re
+import math
+import time
+import threading
+from collections import Counter
+from datetime import datetime
+
+from utils.term_normalize import normalize_term
+from rag_agent.term_index import surface_forms
+
+# ==========================================
+# 금융 용어 BM25 색인 (하이브리드 검색의 lexical 쪽)
+# ==========================================
+# "word: definition" 문서를 글자 n-gram 으로 색인합니다.
+#   - 한글: 정규화(띄어쓰기 제거) 후 글자 bigram (조사/띄어쓰기 차이에 강함, 형태소 분석기 불필요)
+#   - 영문/숫자: 토큰 그대로 (DSR, LTV, M2 같은 약어)
+# 벡터(L2) 검색이 짧은 약어나 복합어를 놓치는 경우를 보완하고, 결과는 RRF 로 벡터 결과와 합칩니다.
+
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+
+_HANGUL_RUN = re.compile(r"[가-힣]+")
+_ASCII_RUN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> list:
+    # 띄어쓰기를 제거한 뒤 n-gram 을 만들어 "총부채 원리금" / "총부채원리금" 을 같게 취급
+    text = normalize_term(text)
+    tokens = []
+    for run in _HANGUL_RUN.findall(text):
+        # 1글자 조각은 대부분 조사("이", "은") -> 제외
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    tokens.extend(_ASCII_RUN.findall(text))
+    return tokens
+
+class BM25Index:
+    def __init__(self, terms: list):
+        """terms: [{"word", "definition"}]"""
+        self.terms = terms
+        self.postings = {}          # token -> [(doc_id, tf)]
+        self.doc_len = []
+        self.word_tokens = []       # 용어 표면형별 n-gram 집합 (질의 포함률 계산용)
+        for doc_id, term in enumerate(terms):
+            counts = Counter(tokenize(f"{term['word']}: {term['definition']}"))
+            self.doc_len.append(sum(counts.values()))
+            for token, tf in counts.items():
+                self.postings.setdefault(token, []).append((doc_id, tf))
+            forms = [set(tokenize(form)) for form in surface_forms(term["word"])]
+            self.word_tokens.append([f for f in forms if f])
+        self.avg_len = (sum(self.doc_len) / len(self.doc_len)) if self.doc_len else 0.0
+        n = len(terms)
+        self.idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self.postings.items()}
+
+    def search(self, query: str, k: int = 10) -> list:
+        """[(doc_id, bm25 점수, 용어명 포함률)] 점수 내림차순"""
+        q_tokens = set(tokenize(query))
+        scores = {}
+        for token in q_tokens:
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[token]:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[doc_id] / self.avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
+        results = []
+        for doc_id, score in ranked:
+            # 표면형(전체 / 괄호 밖 / 약어) 중 질의에 가장 많이 포함된 것 기준
+            coverage = max((len(f & q_tokens) / len(f) for f in self.word_tokens[doc_id]), default=0.0)
+            results.append((doc_id, score, coverage))
+        return results
+
+def reciprocal_rank_fusion(rankings: list, k: int = RRF_K) -> list:
+    """rankings: [[키, ...], ...] (각 리스트는 순위순) -> [(키, RRF 점수)] 내림차순"""
+    fused = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
+
+# ---------------------------------------------------------
+# 전역 색인 (term_index 와 같은 용어 목록으로 1회 구성)
+# ---------------------------------------------------------
+_index = None
+_lock = threading.Lock()
+
+def load_bm25_index(terms: list) -> BM25Index:
+    global _index
+    if _index is not None and (_index.terms or not terms):
+        return _index
+    with _lock:
+        if _index is None or (not _index.terms and terms):
+            t0 = time.perf_counter()
+            _index = BM25Index(terms)
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ✅ [BM25] 문서 {len(terms)}개 / 토큰 {len(_index.postings)}종 색인 "
+                  f"(소요시간: {time.perf_counter() - t0:.3f}초)", flush=True)
+    return _index
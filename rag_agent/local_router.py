@@ -0,0 +1,227 @@
+import os
+import re
+import csv
+import json
+import math
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from rag_agent.term_index import TERM_INDEX_ENABLED, load_term_index
+
+# ==========================================
+# 로컬 의도 분류기 (LLM 라우터 앞단 tier)
+# ==========================================
+# tier 1) 키워드/정규식 규칙 + terms 테이블 금융 용어 사전
+# tier 2) 시드 질문 임베딩의 카테고리별 중심점(nearest-centroid) 분류 (선택)
+# 각 tier 는 (category, confidence) 를 반환하며, 호출 측(node_route)은 신뢰도가
+# 임계값 미만일 때만 main_03_router.md LLM 라우터를 호출합니다.
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+SEED_FILE = PROJECT_ROOT / "data" / "router_seed_queries.csv"
+CACHE_DIR = PROJECT_ROOT / "data" / "cache"
+CENTROID_CACHE_FILE = CACHE_DIR / "router_centroids.json"
+
+CATEGORIES = ("DATABASE", "KNOWLEDGE", "TRANSFER", "GENERAL")
+
+USE_EMBEDDINGS = os.getenv("LOCAL_ROUTER_EMBEDDINGS", "false").strip().lower() in ("1", "true", "yes")
+EMBEDDING_MODEL = os.getenv("LOCAL_ROUTER_EMBEDDING_MODEL", "text-embedding-3-small")
+CENTROID_MIN_SIMILARITY = 0.35
+
+# ---------------------------------------------------------
+# tier 1: 규칙 (category, 패턴, 가중치)
+# ---------------------------------------------------------
+_AMOUNT = r"\d[\d,]*\s*(?:만|천|백|억)?\s*(?:원|달러|불|동|엔|위안|루피아)|(?:십|백|천|만|억)+\s*(?:원|달러|동|엔)"
+_RECIPIENT = r"[가-힣A-Za-z]+\s*(?:한테|에게|께)"
+_SEND_VERB = r"(?:보내|송금|이체|부쳐|입금해\s*줘)"
+_IDENTITY = r"(?:너\s*(?:는|이름|누구)|넌\s*누구|무엇을\s*할\s*수|뭘\s*도와|도움말)"
+_PAST_OR_LOOKUP = r"(?:내역|기록|했던|한\s*사람|보낸\s*사람|보낸\s*돈|얼마\s*보냈|보냈[어지니나]|이체한|송금한)"
+# 송금 자체가 아니라 송금에 대한 질문 ("5만원 이체하면 수수료 얼마야")
+_INFO_QUESTION = r"(?:수수료|얼마|한도|방법|\?)"
+_SEND_REQUEST = rf"{_SEND_VERB}\s*(?:해\s*줘|해줘|줘|주세요|줄래)"
+
+_RULES = [
+    # TRANSFER: 송금 동사 + (수신인 | 금액)
+    ("TRANSFER", re.compile(rf"(?:{_RECIPIENT}|{_AMOUNT}).*{_SEND_VERB}"), 0.97),
+    ("TRANSFER", re.compile(rf"{_SEND_VERB}\s*(?:해\s*줘|해줘|줘|하고\s*싶|할래|해|주세요|봐)"), 0.9),
+    ("TRANSFER", re.compile(rf"{_RECIPIENT}.*(?:{_AMOUNT})\s*(?:줘|송금|이체)?"), 0.9),
+
+    # DATABASE: 본인 계좌/거래 기록
+    ("DATABASE", re.compile(r"(?:잔액|잔고|통장에\s*(?:남은|있는)|계좌\s*(?:목록|번호|몇)|내\s*(?:주\s*)?(?:계좌|통장))"), 0.95),
+    ("DATABASE", re.compile(r"(?:거래\s*내역|입출금|입금\s*내역|출금\s*내역|거래\s*\d+\s*건|최근\s*거래)"), 0.95),
+    ("DATABASE", re.compile(r"(?:얼마\s*썼|지출|소비\s*(?:내역|금액)|식비|월급\s*(?:들어|통장)|입금된)"), 0.93),
+    ("DATABASE", re.compile(_PAST_OR_LOOKUP), 0.95),
+
+    # KNOWLEDGE: 개념 질문 / 실시간 정보
+    # 금융과 무관한 질문에도 쓰이는 일반 표현("오늘 날씨 뭐야?", "맛집 추천해줘")은 임계값(0.8) 미만 가중치
+    # -> 단독으로는 LLM 라우터로 넘어가고, 용어 사전/다른 규칙과 겹칠 때만 확정
+    ("KNOWLEDGE", re.compile(r"(?:뭐야|뭔가요|무엇|뜻|의미|개념|설명해|차이가?|어떻게\s*(?:돼|되|해|가입|올려|만들))"), 0.7),
+    ("KNOWLEDGE", re.compile(r"(?:추천해|방법|절차|걸려|걸리)"), 0.7),
+    ("KNOWLEDGE", re.compile(r"(?:주가|시세|환율|뉴스|전망|지수|코스피|코스닥|나스닥|기준금리|검색해)"), 0.92),
+    ("KNOWLEDGE", re.compile(r"(?:가입\s*조건|제도|보험|세금|연말정산)"), 0.85),
+    ("KNOWLEDGE", re.compile(r"(?:수수료|한도)"), 0.9),
+
+    # GENERAL: 인사/잡담/도움말
+    ("GENERAL", re.compile(r"^(?:안녕|하이|헬로|반가|고마|감사|좋은\s*(?:아침|저녁|하루)|잘\s*가|바이|종료|심심)"), 0.95),
+    ("GENERAL", re.compile(_IDENTITY), 0.93),
+]
+
+# 규칙끼리 충돌할 때의 우선순위
+# - 과거 송금 조회("송금 내역")는 TRANSFER 가 아니라 DATABASE
+# - 버디 자신에 대한 질문("너 이름이 뭐야?")은 KNOWLEDGE 가 아니라 GENERAL
+# - 송금에 대한 질문("이체하면 수수료 얼마야", "보내면 잔액 얼마 남아?")은 KNOWLEDGE/DATABASE
+#   (단, "보내줘" 같은 송금 요청이 함께 있으면 그대로 두어 신뢰도를 낮추고 LLM 라우터에 맡김)
+def _is_question_about_transfer(q: str) -> bool:
+    return re.search(_INFO_QUESTION, q) is not None and re.search(_SEND_REQUEST, q) is None
+
+_OVERRIDES = [
+    (("TRANSFER", "DATABASE"), "DATABASE", lambda q: re.search(_PAST_OR_LOOKUP, q) is not None),
+    (("TRANSFER", "DATABASE"), "DATABASE", _is_question_about_transfer),
+    (("TRANSFER", "KNOWLEDGE"), "KNOWLEDGE", _is_question_about_transfer),
+    (("KNOWLEDGE", "GENERAL"), "GENERAL", lambda q: re.search(_IDENTITY, q) is not None),
+]
+
+# ---------------------------------------------------------
+# 금융 용어 사전 (terms 테이블 -> rag_agent/term_index.py 의 Aho-Corasick 색인 공용)
+# ---------------------------------------------------------
+def _match_terms(query: str) -> list:
+    if not TERM_INDEX_ENABLED:
+        return []
+    return [t["alias"] for t in load_term_index().match(query)]
+
+# ---------------------------------------------------------
+# tier 1 분류
+# ---------------------------------------------------------
+def _confidence(scores: dict) -> tuple:
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    best, top = ranked[0]
+    second = ranked[1][1] if len(ranked) > 1 else 0.0
+    # 2순위 카테고리가 강할수록 신뢰도 감소
+    return best, max(0.0, top - 0.5 * second)
+
+def classify_by_rules(query: str) -> dict | None:
+    q = query.strip()
+    scores = {}
+    for category, pattern, weight in _RULES:
+        if pattern.search(q):
+            scores[category] = max(scores.get(category, 0.0), weight)
+
+    terms = _match_terms(q)
+    if terms:
+        # 용어 사전 적중 -> KNOWLEDGE (단, 개인 기록/송금 규칙이 있으면 그쪽이 우선)
+        scores["KNOWLEDGE"] = max(scores.get("KNOWLEDGE", 0.0), 0.85 if "KNOWLEDGE" in scores else 0.75)
+
+    if not scores:
+        return None
+
+    for cats, winner, predicate in _OVERRIDES:
+        if all(c in scores for c in cats) and predicate(q):
+            for c in cats:
+                if c != winner:
+                    scores.pop(c)
+
+    category, confidence = _confidence(scores)
+    return {"category": category, "confidence": confidence, "tier": "rules", "scores": scores, "terms": terms}
+
+# ---------------------------------------------------------
+# tier 2: nearest-centroid (시드 질문 임베딩)
+# ---------------------------------------------------------
+_centroids = None
+_embeddings = None
+_centroid_lock = threading.Lock()
+
+def _get_embeddings():
+    global _embeddings
+    if _embeddings is None:
+        from langchain_openai import OpenAIEmbeddings
+        from rag_agent.cached_embeddings import CachedEmbeddings
+        # 시드 질문 임베딩은 디스크 캐시에서 재사용 -> 재시작 시 API 호출 없음
+        _embeddings = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL), model_name=EMBEDDING_MODEL)
+    return _embeddings
+
+def _load_seed_queries() -> list:
+    with open(SEED_FILE, "r", encoding="utf-8") as f:
+        return [(row["query"], row["category"]) for row in csv.DictReader(f)]
+
+def _unit(vec: list) -> list:
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+def load_centroids() -> dict:
+    """시드 파일 해시 + 모델명이 같으면 캐시 파일 재사용, 아니면 임베딩 후 재계산"""
+    global _centroids
+    if _centroids is not None:
+        return _centroids
+    with _centroid_lock:
+        if _centroids is not None:
+            return _centroids
+        seeds = _load_seed_queries()
+        seed_hash = hashlib.sha256(SEED_FILE.read_bytes()).hexdigest()
+
+        if CENTROID_CACHE_FILE.exists():
+            try:
+                cached = json.loads(CENTROID_CACHE_FILE.read_text(encoding="utf-8"))
+                if cached.get("seed_hash") == seed_hash and cached.get("model") == EMBEDDING_MODEL:
+                    _centroids = cached["centroids"]
+                    return _centroids
+            except Exception:
+                pass
+
+        vectors = _get_embeddings().embed_documents([q for q, _ in seeds])
+        sums, counts = {}, {}
+        for (_, category), vec in zip(seeds, vectors):
+            vec = _unit(vec)
+            acc = sums.setdefault(category, [0.0] * len(vec))
+            for i, v in enumerate(vec):
+                acc[i] += v
+            counts[category] = counts.get(category, 0) + 1
+        centroids = {c: _unit([v / counts[c] for v in acc]) for c, acc in sums.items()}
+
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        CENTROID_CACHE_FILE.write_text(
+            json.dumps({"seed_hash": seed_hash, "model": EMBEDDING_MODEL, "centroids": centroids}),
+            encoding="utf-8",
+        )
+        _centroids = centroids
+    return _centroids
+
+def classify_by_centroid(query: str) -> dict | None:
+    centroids = load_centroids()
+    q_vec = _unit(_get_embeddings().embed_query(query))
+    sims = {c: sum(a * b for a, b in zip(q_vec, vec)) for c, vec in centroids.items()}
+    ranked = sorted(sims.items(), key=lambda kv: kv[1], reverse=True)
+    best, top = ranked[0]
+    if top < CENTROID_MIN_SIMILARITY:
+        return None
+    margin = top - (ranked[1][1] if len(ranked) > 1 else 0.0)
+    # 1, 2위 중심점 유사도 차이가 0.1 이상이면 확신으로 간주
+    confidence = min(1.0, 0.5 + margin * 5)
+    return {"category": best, "confidence": confidence, "tier": "centroid", "scores": sims}
+
+# ---------------------------------------------------------
+# 외부 호출 함수
+# ---------------------------------------------------------
+def classify_locally(query: str, threshold: float, use_embeddings: bool = None) -> dict | None:
+    """
+    규칙 -> (선택) 중심점 순서로 분류하고, 임계값을 넘는 첫 결과를 반환.
+    어느 tier 도 임계값을 넘지 못하면 가장 신뢰도가 높은 후보를 반환(호출 측에서 LLM 여부 판단).
+    """
+    if use_embeddings is None:
+        use_embeddings = USE_EMBEDDINGS
+
+    best = classify_by_rules(query)
+    if best and best["confidence"] >= threshold:
+        return best
+
+    if use_embeddings:
+        try:
+            centroid = classify_by_centroid(query)
+        except Exception as e:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ⚠️ [Local Router] 중심점 분류 실패: {e}")
+            centroid = None
+        if centroid and (best is None or centroid["confidence"] > best["confidence"]):
+            best = centroid
+    return best
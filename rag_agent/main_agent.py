@@ -1,33 +1,64 @@
 import os
 import json
 import time
+import uuid
+import asyncio
 from datetime import datetime
 from pathlib import Path
-from typing import TypedDict, Literal
+from typing import TypedDict, Literal, Any
 from dotenv import load_dotenv
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langgraph.graph import StateGraph, START, END
 # ---------------------------------------------------------
 # [Import] 전문가 에이전트 모듈
 # ---------------------------------------------------------
-from rag_agent.sql_agent import get_sql_answer
-from rag_agent.finrag_agent import get_rag_answer
-from rag_agent.transfer_agent import get_transfer_answer
-from rag_agent.web_search_rag import WebSearchRAG
+from rag_agent.sql_agent import aget_sql_answer
+from rag_agent.finrag_agent import aget_rag_result
+from rag_agent.transfer_agent import aget_transfer_answer
+from rag_agent.lang_detect import detect_language, is_confident_korean, needs_context_heuristic
+from rag_agent.local_router import classify_locally
+from rag_agent import answer_cache
+from rag_agent import translation_memory
+from rag_agent import memory_store
+from rag_agent import prompt_registry
+from rag_agent import prefetch
+from rag_agent import term_index
+from utils import metrics
+from utils.async_runner import run_sync, iterate_sync
 
 # 환경 변수 로드
 load_dotenv()
 
 # LLM 설정
-llm = ChatOpenAI(model="gpt-5-mini")
+llm = None
+
+def get_llm():
+    """첫 사용 시 ChatOpenAI 생성 (import 시점 부작용 없음, 벤치마크는 module.llm 을 스텁으로 교체 가능)"""
+    global llm
+    if llm is None:
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(model="gpt-5-mini")
+    return llm
 
 
 CURRENT_DIR = Path(__file__).resolve().parent
-MEMORY_DIR = CURRENT_DIR.parent / "logs"
-MEMORY_FILE = MEMORY_DIR / "memory.md"
+
+# 프론트 도어 모드: "sequential"(번역 -> 보정 -> 라우팅 3단계) / "fused"(단일 LLM 호출)
+FRONT_DOOR_MODE = os.getenv("FRONT_DOOR_MODE", "sequential").strip().lower()
+VALID_CATEGORIES = ("DATABASE", "KNOWLEDGE", "TRANSFER", "GENERAL")
+
+# 로컬 언어 식별 fast path (확신 있는 한국어 입력은 번역 LLM 호출 생략)
+LOCAL_LANG_DETECT = os.getenv("LOCAL_LANG_DETECT", "true").strip().lower() not in ("0", "false", "no")
+
+# 로컬 라우터(규칙/용어 사전/중심점) 신뢰도가 임계값 이상이면 LLM 라우터 생략
+LOCAL_ROUTER = os.getenv("LOCAL_ROUTER", "true").strip().lower() not in ("0", "false", "no")
+ROUTER_CONFIDENCE_THRESHOLD = float(os.getenv("ROUTER_CONFIDENCE_THRESHOLD", "0.8"))
+
+# 스트리밍 대상 LLM 호출 식별용 태그 (서브 에이전트의 최종 답변 체인에도 같은 태그 사용)
+ANSWER_STREAM_TAG = "final_answer"
+TRANSLATION_STREAM_TAG = "re_translate"
+
+# 세션(사용자)별 직전 감지 언어 -> 다음 턴 언어 식별의 prior 로 사용
+_last_detected_language = {}
 
 # ---------------------------------------------------------
 # [로그 출력 유틸리티 함수]
@@ -45,29 +76,10 @@ def print_log(step_name: str, status: str, start_time: float = None, extra_info:
         print(log_msg,flush=True)
         return elapsed
 
-def reset_global_context():
-    MEMORY_DIR.mkdir(parents=True, exist_ok=True)
-    with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-        f.write("# 대화 기록\n\n")
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    print(f"[{now}] 🧹 [Memory] 대화 기록 파일(logs/memory.md)이 초기화되었습니다.")
-
-web_rag = WebSearchRAG()
-
-# ---------------------------------------------------------
-# [설정] 프롬프트 경로 설정 및 로딩 함수
-# ---------------------------------------------------------
-PROMPT_DIR = CURRENT_DIR / "prompt" / "main"
-
-def read_prompt(filename: str) -> str:
-    file_path = PROMPT_DIR / filename
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        print(f"[{now}] ❌ [Error] 프롬프트 파일을 찾을 수 없습니다: {file_path}")
-        return ""
+def reset_conversation_memory(username: str):
+    """로그인/로그아웃/새 대화 시작 시 해당 사용자의 대화 기록(요약 포함) 초기화"""
+    memory_store.reset(username)
+    _last_detected_language.pop(username, None)
 
 # ---------------------------------------------------------
 # [LangGraph] 상태 스키마
@@ -87,34 +99,42 @@ class MainAgentState(TypedDict, total=False):
     allowed_views: list
     _history: str
     _skip_re_translate: bool
+    preferred_language: str   # members.preferred_language (ko/en/vi/id)
+    _last_language: str       # 같은 세션의 직전 감지 언어
+    _route_tier: str          # 카테고리를 결정한 단계 (rules / centroid / llm / fused)
+    _cache_hit: bool          # 답변 캐시 적중 여부
+    _cache_embedding: Any     # 답변 캐시 근사 조회에 사용한 질의 임베딩 (저장 시 재사용)
+    _answer_source: str       # FinRAG 답변 출처 ("web" | "db") -> 답변 캐시 TTL 결정
+    _front_door_mode: str     # "sequential" | "fused"
+    _front_door_ok: bool      # fused 출력 검증 통과 여부 (실패 시 3단계 경로로 폴백)
+    _request_id: str          # 요청 식별자 (추측 실행 결과 매칭용)
 
 # ---------------------------------------------------------
 # [LangGraph] 프롬프트/체인 빌더
 # ---------------------------------------------------------
+# 체인은 prompt_registry 에 캐시되며 프롬프트 파일이 바뀐 경우에만 다시 조립됩니다.
 def _translation_chain():
-    t = read_prompt("main_01_translation.md")
-    return PromptTemplate.from_template(t) | llm | StrOutputParser()
+    return prompt_registry.get_chain("main/main_01_translation.md", get_llm())
 
 def _refinement_chain():
-    t = read_prompt("main_02_refinement.md")
-    return PromptTemplate.from_template(t) | llm | StrOutputParser()
+    return prompt_registry.get_chain("main/main_02_refinement.md", get_llm())
 
 def _router_chain():
-    t = read_prompt("main_03_router.md")
-    return PromptTemplate.from_template(t) | llm | StrOutputParser()
+    return prompt_registry.get_chain("main/main_03_router.md", get_llm())
 
 def _system_prompt_chain():
-    t = read_prompt("main_04_system.md")
-    return PromptTemplate.from_template(t) | llm | StrOutputParser()
+    return prompt_registry.get_chain("main/main_04_system.md", get_llm(), tags=[ANSWER_STREAM_TAG])
 
 def _re_translation_chain():
-    t = read_prompt("main_05_re_translation.md")
-    return PromptTemplate.from_template(t) | llm | StrOutputParser()
+    return prompt_registry.get_chain("main/main_05_re_translation.md", get_llm(), tags=[TRANSLATION_STREAM_TAG])
+
+def _front_door_chain():
+    return prompt_registry.get_chain("main/main_07_front_door.md", get_llm())
 
 # ---------------------------------------------------------
 # 역번역 헬퍼 함수
 # ---------------------------------------------------------
-def translate_answer(korean_text: str, target_language: str) -> str:
+async def atranslate_answer(korean_text: str, target_language: str, category: str = None) -> str:
     if not korean_text:
         return korean_text
     
@@ -122,12 +142,22 @@ def translate_answer(korean_text: str, target_language: str) -> str:
         return korean_text
     
     t0 = print_log(f"역번역 (한국어 -> {target_language})", "start")
+    # 번역 메모리는 SQLite 디스크 계층까지 조회하므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    cached = await asyncio.to_thread(translation_memory.lookup, korean_text, target_language)
+    if cached is not None:
+        stats = await asyncio.to_thread(translation_memory.get_translation_memory_stats)
+        print_log(f"역번역 (한국어 -> {target_language})", "end", t0,
+                  extra_info=f"번역 메모리 적중 (누적 적중률 {stats['hit_rate']:.0%})")
+        return cached
+
     try:
         chain = _re_translation_chain()
-        translated = chain.invoke({
+        translated = (await chain.ainvoke({
             "target_language": target_language,
             "korean_answer": korean_text
-        }).strip()
+        })).strip()
+        # category: 개인 데이터(DATABASE/TRANSFER) 답변은 번역 메모리에 저장하지 않음
+        await asyncio.to_thread(translation_memory.store, korean_text, target_language, translated, category)
         print_log(f"역번역 (한국어 -> {target_language})", "end", t0)
         return translated
     except Exception as e:
@@ -135,17 +165,124 @@ def translate_answer(korean_text: str, target_language: str) -> str:
         print(f"[{now}] ⚠️ 역번역 실패: {e}, 원본 반환")
         return korean_text
 
+def translate_answer(korean_text: str, target_language: str, category: str = None) -> str:
+    """atranslate_answer 의 동기 래퍼"""
+    return run_sync(atranslate_answer(korean_text, target_language, category))
+
+# ---------------------------------------------------------
+# 로컬 언어 식별 fast path 헬퍼
+# ---------------------------------------------------------
+def _local_language(question: str, preferred_language=None, last_language=None) -> dict:
+    """로컬 언어 식별 수행 + fast path 적중 여부 메트릭 기록"""
+    if not LOCAL_LANG_DETECT:
+        return {"language": None, "confidence": 0.0, "mixed": False}
+    t0 = time.perf_counter()
+    detected = detect_language(question, preferred_language, last_language)
+    metrics.observe("lang_detect.local_latency", time.perf_counter() - t0)
+    metrics.incr("lang_detect.total")
+    if is_confident_korean(detected):
+        metrics.incr("lang_detect.fast_path")
+    return detected
+
+async def _ainvoke_translation_llm(question: str) -> dict:
+    """main_01_translation.md 호출 (소요시간은 fast path 절약량 추정에 사용)"""
+    t0 = time.perf_counter()
+    try:
+        chain = _translation_chain()
+        trans_result_str = (await chain.ainvoke({"question": question})).strip()
+    finally:
+        metrics.observe("lang_detect.llm_latency", time.perf_counter() - t0)
+    trans_result_str = trans_result_str.replace("```json", "").replace("```", "")
+    return json.loads(trans_result_str)
+
+def get_lang_detect_stats() -> dict:
+    """fast path 적중률 및 절약 시간 추정치 (LLM 번역 평균 소요시간 x 적중 횟수)"""
+    total = metrics.get_counter("lang_detect.total")
+    fast = metrics.get_counter("lang_detect.fast_path")
+    llm_avg = metrics.summarize("lang_detect.llm_latency")["mean"]
+    local_avg = metrics.summarize("lang_detect.local_latency")["mean"]
+    return {
+        "total": total,
+        "fast_path": fast,
+        "fast_path_rate": (fast / total) if total else 0.0,
+        "avg_llm_latency": llm_avg,
+        "avg_local_latency": local_avg,
+        "estimated_saved_sec": fast * max(0.0, llm_avg - local_avg),
+    }
+
+def _parse_front_door_output(raw: str) -> dict:
+    """fused 프론트 도어 JSON 파싱 및 검증. 검증 실패 시 ValueError"""
+    text = raw.strip().replace("```json", "").replace("```", "")
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("JSON 객체가 아닙니다.")
+
+    parsed = {}
+    for key in ("source_language", "korean_query", "refined_query", "category"):
+        value = data.get(key)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"'{key}' 값이 비어있거나 문자열이 아닙니다.")
+        parsed[key] = value.strip()
+
+    category = parsed["category"].replace("'", "").replace('"', "").replace(".", "").upper()
+    if category not in VALID_CATEGORIES:
+        raise ValueError(f"알 수 없는 카테고리: {parsed['category']}")
+    parsed["category"] = category
+    return parsed
+
 # ---------------------------------------------------------
 # [LangGraph] 노드 함수
 # ---------------------------------------------------------
-def node_translate(state: MainAgentState) -> dict:
+async def node_front_door(state: MainAgentState) -> dict:
+    t0 = print_log("Step 1-3: 언어 감지 + 문맥 보정 + 라우팅 단일 호출 (node_front_door)", "start")
+    question = state["question"]
+    history_context = state.get("_history") or "이전 대화 기록 없음(No previous conversation history)."
+    try:
+        chain = _front_door_chain()
+        parsed = _parse_front_door_output(await chain.ainvoke({"history": history_context, "question": question}))
+    except Exception as e:
+        print_log("Step 1-3: 언어 감지 + 문맥 보정 + 라우팅 단일 호출 (node_front_door)", "end", t0,
+                  extra_info=f"검증 실패 -> 3단계 경로로 폴백: {e}")
+        return {"_front_door_ok": False}
+
+    extra = (f"감지 언어: {parsed['source_language']} / 변환 쿼리: '{parsed['korean_query']}' / "
+             f"보정 쿼리: '{parsed['refined_query']}' / 분류된 카테고리: [{parsed['category']}]")
+    print_log("Step 1-3: 언어 감지 + 문맥 보정 + 라우팅 단일 호출 (node_front_door)", "end", t0, extra_info=extra)
+    metrics.incr("router.tier.fused")
+    return {
+        "_front_door_ok": True,
+        "_route_tier": "fused",
+        "source_lang": parsed["source_language"],
+        "korean_query": parsed["korean_query"],
+        "refined_query": parsed["refined_query"],
+        "category": parsed["category"],
+    }
+
+async def node_translate(state: MainAgentState) -> dict:
     t0 = print_log("Step 1: 입력 언어 감지 및 한국어 번역 (node_translate)", "start")
     question = state["question"]
+    detected = _local_language(question, state.get("preferred_language"), state.get("_last_language"))
+
+    if is_confident_korean(detected):
+        # 확신 있는 한국어: 번역 LLM 없이 원문 그대로 사용, 문맥 보정 여부는 로컬 규칙으로 판단
+        has_history = "**User**" in (state.get("_history") or "")
+        # 짧은 질문은 용어 사전(term_index) 적중 여부도 확인 -> 첫 호출 시 색인 로딩이 있을 수 있어 스레드에서 실행
+        needs_context = await asyncio.to_thread(needs_context_heuristic, question, has_history,
+                                                lambda q: bool(term_index.match_terms(q)))
+        stats = get_lang_detect_stats()
+        extra = (f"로컬 감지(fast path): Korean (신뢰도 {detected['confidence']:.2f}) / 보정 필요: {needs_context}"
+                 f" / 누적 적중률 {stats['fast_path_rate']:.0%}, 절약 추정 {stats['estimated_saved_sec']:.1f}초")
+        print_log("Step 1: 입력 언어 감지 및 한국어 번역 (node_translate)", "end", t0, extra_info=extra)
+        _start_prefetch(state, question)
+        return {
+            "korean_query": question,
+            "source_lang": "Korean",
+            "needs_context": needs_context,
+            "refined_query": question,
+        }
+
     try:
-        chain = _translation_chain()
-        trans_result_str = chain.invoke({"question": question}).strip()
-        trans_result_str = trans_result_str.replace("```json", "").replace("```", "")
-        trans_result = json.loads(trans_result_str)
+        trans_result = await _ainvoke_translation_llm(question)
         
         source_lang = trans_result.get("source_language", "Korean")
         korean_query = trans_result.get("korean_query", question)
@@ -154,12 +291,14 @@ def node_translate(state: MainAgentState) -> dict:
         
         extra = f"감지 언어: {source_lang} / 변환 쿼리: '{korean_query}' / 보정 필요: {needs_context}"
     except Exception as e:
-        source_lang = "Korean"
+        # 번역 실패 시 로컬 감지 결과가 있으면 언어 정보만이라도 유지
+        source_lang = detected.get("language") or "Korean"
         korean_query = question
         needs_context = True # 파싱 에러 시 무조건 보정 단계를 거치도록 안전장치 설정
         extra = f"번역 오류로 원본 유지: {e}"
         
     print_log("Step 1: 입력 언어 감지 및 한국어 번역 (node_translate)", "end", t0, extra_info=extra)
+    _start_prefetch(state, korean_query)
     
     # [NEW] 보정 단계(refine)를 건너뛸 수 있으므로 refined_query를 미리 korean_query로 설정
     return {
@@ -169,13 +308,13 @@ def node_translate(state: MainAgentState) -> dict:
         "refined_query": korean_query
     }
 
-def node_refine(state: MainAgentState) -> dict:
+async def node_refine(state: MainAgentState) -> dict:
     t0 = print_log("Step 2: 컨텍스트 기반 질문 보정 (node_refine)", "start")
     history_context = state.get("_history") or "이전 대화 기록 없음(No previous conversation history)."
     korean_query = state["korean_query"]
     
     chain = _refinement_chain()
-    refined_query = chain.invoke({"history": history_context, "question": korean_query}).strip()
+    refined_query = (await chain.ainvoke({"history": history_context, "question": korean_query})).strip()
     
     if refined_query != korean_query:
         extra = f"보정됨: '{korean_query}' -> '{refined_query}'"
@@ -185,31 +324,90 @@ def node_refine(state: MainAgentState) -> dict:
     print_log("Step 2: 컨텍스트 기반 질문 보정 (node_refine)", "end", t0, extra_info=extra)
     return {"refined_query": refined_query}
 
-def node_route(state: MainAgentState) -> dict:
+async def node_route(state: MainAgentState) -> dict:
     t0 = print_log("Step 3: 의도 분류 및 라우팅 (node_route)", "start")
-    chain = _router_chain()
     # 만약 보정 노드를 거치지 않았더라도 node_translate에서 넣은 refined_query(기본 원문)가 사용됨
-    category = chain.invoke({"question": state["refined_query"]}).strip()
-    category = category.replace("'", "").replace('"', "").replace(".", "")
-    
-    print_log("Step 3: 의도 분류 및 라우팅 (node_route)", "end", t0, extra_info=f"분류된 카테고리: [{category}]")
-    return {"category": category}
+    question = state["refined_query"]
+
+    decision = None
+    if LOCAL_ROUTER:
+        t_local = time.perf_counter()
+        # 용어 사전 적재(DB) / 중심점 임베딩(HTTP)이 첫 호출에 발생할 수 있어 워커 스레드에서 실행
+        decision = await asyncio.to_thread(classify_locally, question, ROUTER_CONFIDENCE_THRESHOLD)
+        metrics.observe("router.local_latency", time.perf_counter() - t_local)
+
+    if decision and decision["confidence"] >= ROUTER_CONFIDENCE_THRESHOLD:
+        category = decision["category"]
+        tier = decision["tier"]
+        extra = f"분류된 카테고리: [{category}] (tier: {tier}, 신뢰도 {decision['confidence']:.2f})"
+    else:
+        t_llm = time.perf_counter()
+        chain = _router_chain()
+        category = (await chain.ainvoke({"question": question})).strip()
+        category = category.replace("'", "").replace('"', "").replace(".", "")
+        metrics.observe("router.llm_latency", time.perf_counter() - t_llm)
+        tier = "llm"
+        local_info = f"{decision['category']}@{decision['confidence']:.2f}" if decision else "후보 없음"
+        extra = f"분류된 카테고리: [{category}] (tier: llm, 로컬 후보: {local_info})"
+
+    metrics.incr(f"router.tier.{tier}")
+    print_log("Step 3: 의도 분류 및 라우팅 (node_route)", "end", t0, extra_info=extra)
+    return {"category": category, "_route_tier": tier}
+
+def _cache_query(state: dict) -> str:
+    """답변 캐시 키 질의: 답변을 생성한 입력과 같아야 함 (GENERAL 은 node_system 이 korean_query 로 답변)"""
+    if (state.get("category") or "").strip() == "GENERAL":
+        return state.get("korean_query") or state.get("refined_query", "")
+    return state.get("refined_query", "")
+
+async def node_cache_lookup(state: MainAgentState) -> dict:
+    t0 = print_log("Step 4: 답변 캐시 조회 (node_cache_lookup)", "start")
+    category = (state.get("category") or "").strip()
+    source_lang = state.get("source_lang", "Korean")
+    found = await asyncio.to_thread(answer_cache.lookup, _cache_query(state), category, source_lang)
+    entry = found["entry"]
+
+    if entry is None:
+        print_log("Step 4: 답변 캐시 조회 (node_cache_lookup)", "end", t0,
+                  extra_info=f"캐시 미적중 (카테고리: {category})" if answer_cache.is_cacheable(category) else f"캐시 대상 아님 (카테고리: {category})")
+        return {"_cache_hit": False, "_cache_embedding": found["embedding"]}
 
-def node_sql(state: MainAgentState) -> dict:
+    print_log("Step 4: 답변 캐시 조회 (node_cache_lookup)", "end", t0,
+              extra_info=f"캐시 적중 ({found['match']}) -> 서브 에이전트/역번역 생략")
+    return {
+        "_cache_hit": True,
+        "_skip_re_translate": True,
+        "korean_answer": entry["korean_answer"],
+        "final_answer": entry["final_answer"],
+    }
+
+async def node_sql(state: MainAgentState) -> dict:
     t0 = print_log("Sub-Agent: SQL Agent 호출", "start")
-    answer = get_sql_answer(state["refined_query"], state["username"], state.get("allowed_views") or [])
+    allowed_views = state.get("allowed_views") or []
+    schema = await prefetch.claim(state.get("_request_id"), "DATABASE", tuple(sorted(allowed_views)))
+    answer = await aget_sql_answer(state["refined_query"], state["username"], allowed_views, schema=schema)
     print_log("Sub-Agent: SQL Agent 호출", "end", t0)
     return {"korean_answer": answer}
 
-def node_finrag(state: MainAgentState) -> dict:
+async def node_finrag(state: MainAgentState) -> dict:
     t0 = print_log("Sub-Agent: FinRAG Agent 호출", "start")
-    answer = get_rag_answer(state["refined_query"], original_query=state["question"])
+    docs = await prefetch.claim(state.get("_request_id"), "KNOWLEDGE", state["refined_query"])
+    source_lang = state.get("source_lang", "Korean")
+    result = await aget_rag_result(state["refined_query"], original_query=state["question"], prefetched_docs=docs,
+                                   target_language=source_lang)
+    if result["language"] != "Korean" and result["language"] == source_lang:
+        # 사용자 언어로 사전 생성된 용어 설명 -> 역번역 생략
+        print_log("Sub-Agent: FinRAG Agent 호출", "end", t0, extra_info=f"{source_lang} 사전 생성 설명 사용 -> 역번역 생략")
+        # korean_answer 는 한국어 유지 (대화 메모리 / 답변 캐시의 korean_answer 로 저장됨)
+        return {"korean_answer": result["korean_answer"], "final_answer": result["answer"], "_skip_re_translate": True,
+                "_answer_source": result["source"]}
     print_log("Sub-Agent: FinRAG Agent 호출", "end", t0)
-    return {"korean_answer": answer}
+    return {"korean_answer": result["answer"], "_answer_source": result["source"]}
 
-def node_transfer(state: MainAgentState) -> dict:
+async def node_transfer(state: MainAgentState) -> dict:
     t0 = print_log("Sub-Agent: Transfer Agent 호출", "start")
-    result = get_transfer_answer(state["refined_query"], state["username"], context={})
+    preload = await prefetch.claim(state.get("_request_id"), "TRANSFER", state["username"])
+    result = await aget_transfer_answer(state["refined_query"], state["username"], context={}, preload=preload)
     
     if isinstance(result, dict):
         if result.get("context") and not result["context"].get("source_language"):
@@ -221,10 +419,10 @@ def node_transfer(state: MainAgentState) -> dict:
     print_log("Sub-Agent: Transfer Agent 호출", "end", t0, extra_info="일반 텍스트 반환")
     return {"korean_answer": result, "transfer_result": None}
 
-def node_system(state: MainAgentState) -> dict:
+async def node_system(state: MainAgentState) -> dict:
     t0 = print_log("Sub-Agent: System Prompt 호출 (일반 대화)", "start")
     chain = _system_prompt_chain()
-    answer = chain.invoke({"question": state["korean_query"]})
+    answer = await chain.ainvoke({"question": state["korean_query"]})
     print_log("Sub-Agent: System Prompt 호출 (일반 대화)", "end", t0)
     return {"korean_answer": answer}
 
@@ -235,36 +433,53 @@ def node_fallback(state: MainAgentState) -> dict:
     return {"korean_answer": korean_answer}
 
 def node_summarize(state: MainAgentState) -> dict:
-    t0 = print_log("대화 기록 저장 (node_summarize -> 파일 Append)", "start")
+    t0 = print_log("대화 기록 저장 (node_summarize -> 사용자 메모리)", "start")
     refined_query = state.get("refined_query", "")
     korean_answer = state.get("korean_answer") or ""
     
     if not isinstance(korean_answer, str):
-        print_log("대화 기록 저장 (node_summarize -> 파일 Append)", "end", t0, extra_info="답변이 문자열이 아니므로 스킵")
+        print_log("대화 기록 저장 (node_summarize -> 사용자 메모리)", "end", t0, extra_info="답변이 문자열이 아니므로 스킵")
         return {}
         
     try:
-        MEMORY_DIR.mkdir(parents=True, exist_ok=True)
-        with open(MEMORY_FILE, "a", encoding="utf-8") as f:
-            f.write(f"**User**: {refined_query}\n\n**AI**: {korean_answer}\n\n---\n\n")
-        extra = "메모리 파일에 성공적으로 Append 되었습니다."
+        # 윈도우 밖으로 밀려난 턴의 요약은 백그라운드에서 진행 (응답 지연 없음)
+        memory_store.append_turn(state["username"], refined_query, korean_answer)
+        extra = "사용자 메모리에 저장되었습니다."
     except Exception as e:
         extra = f"메모리 업데이트 실패: {e}"
         
-    print_log("대화 기록 저장 (node_summarize -> 파일 Append)", "end", t0, extra_info=extra)
+    print_log("대화 기록 저장 (node_summarize -> 사용자 메모리)", "end", t0, extra_info=extra)
     return {}
 
-def node_re_translate(state: MainAgentState) -> dict:
+async def node_re_translate(state: MainAgentState) -> dict:
+    if state.get("_skip_re_translate"):
+        return {}
     t0 = print_log("최종 답변 역번역 (node_re_translate)", "start")
     source_lang = state.get("source_lang", "Korean")
     korean_answer = state.get("korean_answer", "")
-    final_answer = translate_answer(korean_answer, source_lang)
+    final_answer = await atranslate_answer(korean_answer, source_lang, state.get("category"))
     print_log("최종 답변 역번역 (node_re_translate)", "end", t0)
     return {"final_answer": final_answer}
 
 # ---------------------------------------------------------
 # 라우터 함수들
 # ---------------------------------------------------------
+def select_front_door(state: MainAgentState) -> Literal["front_door", "translate"]:
+    if state.get("_front_door_mode") == "fused":
+        return "front_door"
+    return "translate"
+
+def after_front_door(state: MainAgentState) -> Literal["cache_lookup", "translate"]:
+    """fused 출력이 검증을 통과하면 바로 캐시 조회(-> 서브 에이전트)로, 실패하면 기존 3단계 경로로 폴백"""
+    if not state.get("_front_door_ok"):
+        return "translate"
+    return "cache_lookup"
+
+def after_cache_lookup(state: MainAgentState) -> Literal["sql", "finrag", "transfer", "system", "fallback", "summarize"]:
+    if state.get("_cache_hit"):
+        return "summarize"
+    return route_by_category(state)
+
 def check_needs_context(state: MainAgentState) -> Literal["refine", "route"]:
     """[NEW] 번역 노드에서 판단한 needs_context 값에 따라 보정 노드를 거칠지 결정"""
     if state.get("needs_context", True):
@@ -292,11 +507,14 @@ def after_transfer(state: MainAgentState) -> Literal["summarize", "end_transfer"
 # [LangGraph] 그래프 빌드 및 컴파일
 # ---------------------------------------------------------
 def _build_main_graph():
+    from langgraph.graph import StateGraph, START, END
     builder = StateGraph(MainAgentState)
 
+    builder.add_node("front_door", node_front_door)
     builder.add_node("translate", node_translate)
     builder.add_node("refine", node_refine)
     builder.add_node("route", node_route)
+    builder.add_node("cache_lookup", node_cache_lookup)
     builder.add_node("sql", node_sql)
     builder.add_node("finrag", node_finrag)
     builder.add_node("transfer", node_transfer)
@@ -305,7 +523,14 @@ def _build_main_graph():
     builder.add_node("summarize", node_summarize)
     builder.add_node("re_translate", node_re_translate)
 
-    builder.add_edge(START, "translate")
+    builder.add_conditional_edges(START, select_front_door, {
+        "front_door": "front_door",
+        "translate": "translate",
+    })
+    builder.add_conditional_edges("front_door", after_front_door, {
+        "cache_lookup": "cache_lookup",
+        "translate": "translate",
+    })
     
     # [NEW] 기존의 무조건 연결 대신 조건부 연결(Conditional Edge) 적용
     builder.add_conditional_edges(
@@ -319,12 +544,14 @@ def _build_main_graph():
     
     builder.add_edge("refine", "route")
     
-    builder.add_conditional_edges("route", route_by_category, {
+    builder.add_edge("route", "cache_lookup")
+    builder.add_conditional_edges("cache_lookup", after_cache_lookup, {
         "sql": "sql",
         "finrag": "finrag",
         "transfer": "transfer",
         "system": "system",
         "fallback": "fallback",
+        "summarize": "summarize",
     })
     builder.add_conditional_edges("transfer", after_transfer, {"end_transfer": END, "summarize": "summarize"})
     builder.add_edge("sql", "summarize")
@@ -341,79 +568,79 @@ _compiled_graph = None
 def get_main_graph():
     global _compiled_graph
     if _compiled_graph is None:
+        # 프롬프트 검증(전 에이전트 프롬프트 파일 로드)은 import 가 아니라 첫 그래프 생성 시 1회
+        # 필수 변수가 빠진 프롬프트가 있으면 첫 요청에서 KeyError 가 나기 전에 여기서 실패
+        # (_compiled_graph 가 None 으로 남으므로 프롬프트를 고친 뒤 다음 호출에서 다시 검증)
+        prompt_registry.validate_prompts(strict=True)
         _compiled_graph = _build_main_graph()
     return _compiled_graph
 
 # ---------------------------------------------------------
 # 메인 에이전트 실행 함수 (Orchestrator)
 # ---------------------------------------------------------
-def run_fintech_agent(question, username="test_user", transfer_context=None, allowed_views=None):
-    print("\n" + "="*60)
-    total_t0 = print_log("Main Agent 전체 파이프라인", "start")
-    print(f"   [User Input]: {question}")
-    print("="*60)
-
-    if transfer_context:
-        t0_ctx = print_log("진행 중인 송금 컨텍스트(Transfer Context) 처리", "start")
-        source_lang = transfer_context.get("source_language", "Korean")
-        
-        if question.strip().upper() in ("__YES__", "__NO__"):
-            korean_query = question
-        elif question.strip().isdigit() or (len(question.strip()) <= 10 and not any(c.isalpha() for c in question)):
+async def _arun_transfer_context(question, username, transfer_context, preferred_language, total_t0):
+    t0_ctx = print_log("진행 중인 송금 컨텍스트(Transfer Context) 처리", "start")
+    source_lang = transfer_context.get("source_language", "Korean")
+    
+    if question.strip().upper() in ("__YES__", "__NO__"):
+        korean_query = question
+    elif question.strip().isdigit() or (len(question.strip()) <= 10 and not any(c.isalpha() for c in question)):
+        korean_query = question
+    elif is_confident_korean(_local_language(question, preferred_language, source_lang)):
+        # 연락처 이름 등 한글 단답은 번역 LLM 없이 그대로 사용
+        korean_query = question
+    else:
+        try:
+            trans_result = await _ainvoke_translation_llm(question)
+            detected_lang = trans_result.get("source_language", "Korean")
+            korean_query = trans_result.get("korean_query", question)
+            
+            if source_lang == "Korean" and detected_lang != "Korean":
+                source_lang = detected_lang
+                transfer_context["source_language"] = source_lang
+        except Exception:
             korean_query = question
-        else:
-            try:
-                chain = _translation_chain()
-                trans_result_str = chain.invoke({"question": question}).strip()
-                trans_result_str = trans_result_str.replace("```json", "").replace("```", "")
-                trans_result = json.loads(trans_result_str)
-                detected_lang = trans_result.get("source_language", "Korean")
-                korean_query = trans_result.get("korean_query", question)
-                
-                if source_lang == "Korean" and detected_lang != "Korean":
-                    source_lang = detected_lang
-                    transfer_context["source_language"] = source_lang
-            except Exception:
-                korean_query = question
-        
-        transfer_result = get_transfer_answer(korean_query, username, context=transfer_context)
-        
-        if isinstance(transfer_result, dict) and "message" in transfer_result:
-            korean_msg = transfer_result["message"]
-            translated_msg = translate_answer(korean_msg, source_lang)
-            transfer_result["message"] = translated_msg
-            if "context" in transfer_result:
-                transfer_result["context"]["source_language"] = source_lang
-        
-        print_log("진행 중인 송금 컨텍스트(Transfer Context) 처리", "end", t0_ctx)
-        print("="*60)
-        print_log("Main Agent 전체 파이프라인", "end", total_t0)
-        print("="*60 + "\n")
-        return transfer_result
+    
+    transfer_result = await aget_transfer_answer(korean_query, username, context=transfer_context)
+    
+    if isinstance(transfer_result, dict) and "message" in transfer_result:
+        korean_msg = transfer_result["message"]
+        translated_msg = await atranslate_answer(korean_msg, source_lang, "TRANSFER")
+        transfer_result["message"] = translated_msg
+        if "context" in transfer_result:
+            transfer_result["context"]["source_language"] = source_lang
+    
+    print_log("진행 중인 송금 컨텍스트(Transfer Context) 처리", "end", t0_ctx)
+    print("="*60)
+    print_log("Main Agent 전체 파이프라인", "end", total_t0)
+    print("="*60 + "\n")
+    return transfer_result
 
-    history_text = ""
-    if MEMORY_FILE.exists():
-        with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-            history_text = f.read()
-    else:
-        history_text = "이전 대화 기록 없음(No previous conversation history)."
+def _build_initial_state(question, username, allowed_views, front_door_mode, preferred_language) -> MainAgentState:
+    # 사용자별 요약 + 최근 N턴 (토큰 예산 이내)
+    history_text = memory_store.get_history(username)
 
-    initial_state: MainAgentState = {
+    return {
         "question": question,
         "username": username,
         "allowed_views": allowed_views or [],
         "_history": history_text,
+        "_front_door_mode": (front_door_mode or FRONT_DOOR_MODE),
+        "preferred_language": preferred_language,
+        "_last_language": _last_detected_language.get(username),
+        "_request_id": uuid.uuid4().hex,
     }
 
-    graph = get_main_graph()
-    result = graph.invoke(initial_state)
+async def _afinalize_graph_result(result: dict, username: str, total_t0: float):
+    if result.get("source_lang"):
+        _last_detected_language[username] = result["source_lang"]
 
     if result.get("transfer_result") is not None:
         transfer_result = result["transfer_result"]
         source_lang = result.get("source_lang", "Korean")
         if isinstance(transfer_result, dict) and "message" in transfer_result:
             korean_msg = transfer_result["message"]
-            translated_msg = translate_answer(korean_msg, source_lang)
+            translated_msg = await atranslate_answer(korean_msg, source_lang, "TRANSFER")
             transfer_result["message"] = translated_msg
             
         print("="*60)
@@ -422,9 +649,138 @@ def run_fintech_agent(question, username="test_user", transfer_context=None, all
         return transfer_result
 
     final_answer = result.get("final_answer") or result.get("korean_answer") or ""
+
+    if not result.get("_cache_hit"):
+        await asyncio.to_thread(
+            answer_cache.store,
+            _cache_query(result),
+            (result.get("category") or "").strip(),
+            result.get("source_lang", "Korean"),
+            result.get("korean_answer"),
+            final_answer,
+            embedding=result.get("_cache_embedding"),
+            answer_source=result.get("_answer_source"),
+        )
     
     print("="*60)
     print_log("Main Agent 전체 파이프라인", "end", total_t0)
     print("="*60 + "\n")
     
-    return final_answer
\ No newline at end of file
+    return final_answer
+
+async def arun_fintech_agent(question, username="test_user", transfer_context=None, allowed_views=None,
+                             front_door_mode=None, preferred_language=None):
+    """
+    비동기 진입점. OpenAI / Tavily 응답을 기다리는 동안 스레드를 점유하지 않으므로
+    하나의 프로세스(이벤트 루프)에서 여러 대화를 동시에 처리할 수 있습니다.
+    """
+    print("\n" + "="*60)
+    total_t0 = print_log("Main Agent 전체 파이프라인", "start")
+    print(f"   [User Input]: {question}")
+    print("="*60)
+
+    if transfer_context:
+        return await _arun_transfer_context(question, username, transfer_context, preferred_language, total_t0)
+
+    initial_state = _build_initial_state(question, username, allowed_views, front_door_mode, preferred_language)
+    try:
+        result = await get_main_graph().ainvoke(initial_state)
+    finally:
+        prefetch.release(initial_state["_request_id"])
+    return await _afinalize_graph_result(result, username, total_t0)
+
+def run_fintech_agent(question, username="test_user", transfer_context=None, allowed_views=None, front_door_mode=None,
+                      preferred_language=None):
+    """arun_fintech_agent 의 동기 래퍼 (공유 이벤트 루프에서 실행)"""
+    return run_sync(arun_fintech_agent(question, username, transfer_context, allowed_views,
+                                       front_door_mode=front_door_mode, preferred_language=preferred_language))
+
+def _start_prefetch(state: MainAgentState, korean_query: str):
+    """(opt-in) 문맥 보정/라우팅 LLM 을 기다리는 동안 후보 서브 에이전트의 읽기 전용 준비 단계 시작"""
+    try:
+        prefetch.start(state.get("_request_id"), korean_query, state.get("username"), state.get("allowed_views") or [])
+    except Exception as e:
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        print(f"[{now}] ⚠️ [Prefetch] 시작 실패 (무시): {e}")
+
+def _is_stream_token(metadata: dict, source_lang: str | None) -> bool:
+    """
+    화면에 흘려보낼 토큰인지 판단.
+    - 한국어 사용자: 서브 에이전트의 최종 답변 생성 LLM 토큰
+    - 그 외 언어: 답변은 역번역 후 노출되므로 node_re_translate 의 번역 LLM 토큰
+    (source_lang 이 아직 정해지지 않은 단계의 토큰은 번역/라우팅 등 내부 호출이므로 제외)
+    """
+    if not source_lang:
+        return False
+    tags = metadata.get("tags") or []
+    if "Korean" in source_lang or "한국어" in source_lang:
+        return ANSWER_STREAM_TAG in tags
+    return TRANSLATION_STREAM_TAG in tags
+
+async def astream_fintech_agent(question, username="test_user", transfer_context=None, allowed_views=None,
+                                front_door_mode=None, preferred_language=None):
+    """
+    arun_fintech_agent 의 스트리밍 버전 (async generator).
+    - {"type": "token", "text": str}: 최종 답변 토큰 (도착하는 즉시)
+    - {"type": "final", "result": str | dict}: run_fintech_agent 와 동일한 최종 결과 (항상 마지막에 한 번)
+    캐시/번역 메모리 적중이나 송금 플로우처럼 LLM 이 답변을 생성하지 않으면 token 없이 final 만 전달됩니다.
+    """
+    print("\n" + "="*60)
+    total_t0 = print_log("Main Agent 전체 파이프라인 (Streaming)", "start")
+    print(f"   [User Input]: {question}")
+    print("="*60)
+
+    if transfer_context:
+        yield {"type": "final", "result": await _arun_transfer_context(question, username, transfer_context,
+                                                                        preferred_language, total_t0)}
+        return
+
+    initial_state = _build_initial_state(question, username, allowed_views, front_door_mode, preferred_language)
+    result = dict(initial_state)
+    first_token_at = None
+
+    # 서브 에이전트 답변 LLM 은 각자의 서브 그래프 안에서 호출되므로 subgraphs=True 로 함께 수신
+    try:
+        async for namespace, mode, chunk in get_main_graph().astream(
+            initial_state, stream_mode=["messages", "values"], subgraphs=True
+        ):
+            if mode == "values":
+                if not namespace:
+                    result = chunk
+                continue
+
+            message, metadata = chunk
+            text = getattr(message, "content", None)
+            if not text or not isinstance(text, str) or not _is_stream_token(metadata, result.get("source_lang")):
+                continue
+            if first_token_at is None:
+                first_token_at = time.time()
+                metrics.observe("stream.ttft", first_token_at - total_t0)
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                print(f"[{now}] ⚡ [Streaming] 첫 토큰 도착 (TTFT: {first_token_at - total_t0:.3f}초)", flush=True)
+            metrics.incr("stream.tokens")
+            yield {"type": "token", "text": text}
+    finally:
+        prefetch.release(initial_state["_request_id"])
+
+    if first_token_at is None:
+        metrics.incr("stream.no_token")
+    final = await _afinalize_graph_result(result, username, total_t0)
+    metrics.observe("stream.total", time.time() - total_t0)
+    yield {"type": "final", "result": final}
+
+def stream_fintech_agent(question, username="test_user", transfer_context=None, allowed_views=None,
+                         front_door_mode=None, preferred_language=None):
+    """astream_fintech_agent 의 동기 generator 래퍼 (Streamlit 등 동기 호출 측용)"""
+    yield from iterate_sync(astream_fintech_agent(question, username, transfer_context, allowed_views,
+                                                  front_door_mode=front_door_mode,
+                                                  preferred_language=preferred_language))
+
+def get_stream_stats() -> dict:
+    """스트리밍 응답의 첫 토큰 도착 시간(TTFT) / 전체 소요시간 분포"""
+    return {
+        "ttft": metrics.summarize("stream.ttft"),
+        "total": metrics.summarize("stream.total"),
+        "tokens": metrics.get_counter("stream.tokens"),
+        "no_token_responses": metrics.get_counter("stream.no_token"),
+    }
@@ -0,0 +1,213 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.cache import TTLCache
+from utils import metrics
+
+# ==========================================
+# 사용자별 대화 메모리 (최근 N턴 원문 + 이전 대화 요약)
+# ==========================================
+# - 최근 MEMORY_WINDOW_TURNS 턴만 원문으로 보관하고, 밀려난 턴은 main_06_summarizer.md 로
+#   누적 요약(rolling summary)에 병합합니다.
+# - 요약은 요청 처리 경로 밖(백그라운드 스레드)에서 수행되며, 요약이 끝나기 전의 다음 요청은
+#   직전까지의 요약 + 최근 턴으로 응답합니다.
+# - 요약 + 최근 턴은 MEMORY_TOKEN_BUDGET 토큰을 넘지 않습니다. (읽기 비용은 윈도우 크기에 비례)
+# - 장시간 사용하지 않은 사용자의 메모리는 MEMORY_IDLE_TTL 후 제거됩니다.
+
+MEMORY_WINDOW_TURNS = int(os.getenv("MEMORY_WINDOW_TURNS", "4"))
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1200"))
+MEMORY_SUMMARY_TOKEN_BUDGET = int(os.getenv("MEMORY_SUMMARY_TOKEN_BUDGET", "300"))
+MEMORY_MAX_USERS = int(os.getenv("MEMORY_MAX_USERS", "10000"))
+MEMORY_IDLE_TTL = float(os.getenv("MEMORY_IDLE_TTL", str(6 * 60 * 60)))
+
+NO_HISTORY_TEXT = "이전 대화 기록 없음(No previous conversation history)."
+
+# ---------------------------------------------------------
+# 토큰 수 계산 (tiktoken 이 없으면 글자 수 기반 근사)
+# ---------------------------------------------------------
+_encoder = None
+
+def _get_encoder():
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _encoder = False
+    return _encoder
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder:
+        return len(encoder.encode(text))
+    # 한글은 대략 글자당 1토큰, 영문은 4글자당 1토큰 -> 보수적으로 글자 수 사용
+    return len(text)
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    encoder = _get_encoder()
+    if encoder:
+        tokens = encoder.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoder.decode(tokens[:max_tokens]) + " …"
+    return text if len(text) <= max_tokens else text[:max_tokens] + " …"
+
+# ---------------------------------------------------------
+# 사용자별 메모리
+# ---------------------------------------------------------
+def _format_turn(user_text: str, ai_text: str) -> str:
+    return f"**User**: {user_text}\n\n**AI**: {ai_text}\n\n---\n\n"
+
+class ConversationMemory:
+    def __init__(self):
+        self.turns = deque()        # (user_text, ai_text, tokens)
+        self.turn_tokens = 0
+        self.summary = ""
+        self.summary_tokens = 0
+        self.pending = deque()      # 요약 대기 중인 (user_text, ai_text)
+        self.summarizing = False
+        self.generation = 0         # reset 시 증가 -> 진행 중이던 요약 결과 폐기
+        self.lock = threading.Lock()
+
+    def _evict(self):
+        """윈도우/토큰 예산을 넘는 가장 오래된 턴을 요약 대기열로 이동 (lock 보유 상태에서 호출)"""
+        budget = MEMORY_TOKEN_BUDGET - self.summary_tokens
+        while self.turns and (len(self.turns) > MEMORY_WINDOW_TURNS or
+                              (len(self.turns) > 1 and self.turn_tokens > budget)):
+            user_text, ai_text, tokens = self.turns.popleft()
+            self.turn_tokens -= tokens
+            self.pending.append((user_text, ai_text))
+
+        # 최근 1턴만으로도 예산을 넘으면 AI 답변을 잘라서 보관
+        if self.turns and self.turn_tokens > budget:
+            user_text, ai_text, tokens = self.turns.pop()
+            overhead = count_tokens(_format_turn(user_text, ""))
+            ai_text = truncate_tokens(ai_text, max(0, budget - overhead))
+            tokens = count_tokens(_format_turn(user_text, ai_text))
+            self.turns.append((user_text, ai_text, tokens))
+            self.turn_tokens = tokens
+
+    def append(self, user_text: str, ai_text: str):
+        tokens = count_tokens(_format_turn(user_text, ai_text))
+        with self.lock:
+            self.turns.append((user_text, ai_text, tokens))
+            self.turn_tokens += tokens
+            self._evict()
+
+    def render(self) -> str:
+        with self.lock:
+            if not self.turns and not self.summary:
+                return NO_HISTORY_TEXT
+            parts = ["# 대화 기록\n\n"]
+            if self.summary:
+                parts.append(f"## 이전 대화 요약\n{self.summary}\n\n---\n\n")
+            parts.extend(_format_turn(u, a) for u, a, _ in self.turns)
+            metrics.observe("memory.history_tokens", self.turn_tokens + self.summary_tokens)
+            return "".join(parts)
+
+_memories = TTLCache(maxsize=MEMORY_MAX_USERS, ttl=MEMORY_IDLE_TTL)
+_memories_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-summarizer")
+
+def _get_memory(user_key: str) -> ConversationMemory:
+    with _memories_lock:
+        memory = _memories.get(user_key)
+        if memory is None:
+            memory = ConversationMemory()
+        # 접근할 때마다 idle TTL 갱신
+        _memories.set(user_key, memory)
+        return memory
+
+# ---------------------------------------------------------
+# 백그라운드 요약
+# ---------------------------------------------------------
+_summarizer_llm = None
+
+def _get_summarizer_chain():
+    global _summarizer_llm
+    if _summarizer_llm is None:
+        from langchain_openai import ChatOpenAI
+        _summarizer_llm = ChatOpenAI(model="gpt-5-mini")
+    from rag_agent import prompt_registry
+    return prompt_registry.get_chain("main/main_06_summarizer.md", _summarizer_llm)
+
+def _summarize_pending(memory: ConversationMemory):
+    while True:
+        with memory.lock:
+            if not memory.pending:
+                memory.summarizing = False
+                return
+            user_text, ai_text = memory.pending[0]
+            current_summary = memory.summary
+            generation = memory.generation
+
+        t0 = time.perf_counter()
+        try:
+            updated = _get_summarizer_chain().invoke({
+                "current_summary": current_summary,
+                "user_input": user_text,
+                "ai_output": ai_text,
+            }).strip()
+        except Exception as e:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ⚠️ [Memory] 대화 요약 실패, 기존 요약 유지: {e}")
+            metrics.incr("memory.summarize_error")
+            updated = current_summary
+        metrics.observe("memory.summarize_latency", time.perf_counter() - t0)
+
+        updated = truncate_tokens(updated, MEMORY_SUMMARY_TOKEN_BUDGET)
+        with memory.lock:
+            if memory.generation != generation:
+                # 요약 도중 reset 됨
+                memory.summarizing = False
+                return
+            memory.pending.popleft()
+            memory.summary = updated
+            memory.summary_tokens = count_tokens(updated)
+            memory._evict()
+
+def _schedule_summary(memory: ConversationMemory):
+    with memory.lock:
+        if memory.summarizing or not memory.pending:
+            return
+        memory.summarizing = True
+    _executor.submit(_summarize_pending, memory)
+
+# ---------------------------------------------------------
+# 외부 호출 함수
+# ---------------------------------------------------------
+def get_history(user_key: str) -> str:
+    """요약 + 최근 턴을 프롬프트용 텍스트로 반환 (비어 있으면 NO_HISTORY_TEXT)"""
+    return _get_memory(user_key).render()
+
+def append_turn(user_key: str, user_text: str, ai_text: str):
+    memory = _get_memory(user_key)
+    memory.append(user_text, ai_text)
+    _schedule_summary(memory)
+
+def reset(user_key: str):
+    with _memories_lock:
+        memory = _memories.pop(user_key)
+    if memory is not None:
+        with memory.lock:
+            memory.generation += 1
+            memory.pending.clear()
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] 🧹 [Memory] '{user_key}' 사용자의 대화 기록이 초기화되었습니다.")
+
+def get_memory_stats() -> dict:
+    return {
+        "users": len(_memories),
+        "history_tokens": metrics.summarize("memory.history_tokens"),
+        "summarize_latency": metrics.summarize("memory.summarize_latency"),
+        "summarize_errors": metrics.get_counter("memory.summarize_error"),
+    }
@@ -0,0 +1,129 @@
+import os
+import time
+import asyncio
+from datetime import datetime
+
+from rag_agent.local_router import classify_by_rules
+from rag_agent.finrag_agent import WEB_SEARCH_KEYWORDS, retrieve_relevant_docs
+from rag_agent.sql_agent import get_schema_info
+from rag_agent.transfer_agent import preload_transfer_data
+from utils import metrics
+
+# ==========================================
+# 서브 에이전트 추측 실행 (speculative prefetch)
+# ==========================================
+# 번역 직후, 문맥 보정/라우팅 LLM 을 기다리는 동안 후보 서브 에이전트의 준비 단계를 미리 시작합니다.
+#   - KNOWLEDGE: FinRAG 벡터 DB 검색 (키: 질의문)
+#   - DATABASE:  get_schema_info (키: 허용 뷰 목록)
+#   - TRANSFER:  사용자 / 연락처 / 주 계좌 조회 (키: username)
+# 후보는 로컬 라우터 규칙 점수가 PREFETCH_MIN_SCORE 이상인 카테고리입니다.
+# 라우팅 결과와 키가 일치하면 결과를 사용하고(claim), 아니면 버리며 낭비된 작업량을 기록합니다.
+# 모든 작업은 SELECT / 벡터 검색 같은 읽기 전용 작업만 허용합니다. (잔액 변경, 원장 기록 등 쓰기 작업 금지)
+
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "false").strip().lower() in ("1", "true", "yes")
+PREFETCH_MIN_SCORE = float(os.getenv("PREFETCH_MIN_SCORE", "0.5"))
+
+# request_id -> {kind: {"key", "task", "elapsed"}}
+_inflight = {}
+
+def _log(msg: str):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] 🔮 [Prefetch] {msg}", flush=True)
+
+def _candidates(korean_query: str) -> list:
+    decision = classify_by_rules(korean_query)
+    if not decision:
+        return []
+    return [c for c, score in decision["scores"].items() if score >= PREFETCH_MIN_SCORE]
+
+async def _run(entry: dict, fn, arg):
+    t0 = time.perf_counter()
+    try:
+        return await asyncio.to_thread(fn, arg)
+    finally:
+        entry["elapsed"] = time.perf_counter() - t0
+
+def _record_waste(kind: str, entry: dict, reason: str):
+    metrics.incr(f"prefetch.wasted.{kind}")
+    metrics.incr(f"prefetch.wasted_reason.{reason}")
+
+    def _done(task):
+        # 워커 스레드 작업은 취소할 수 없으므로 끝날 때까지 기다렸다가 소요시간을 낭비량으로 기록
+        if not task.cancelled():
+            task.exception()
+        metrics.observe("prefetch.wasted_sec", entry.get("elapsed", 0.0))
+    entry["task"].add_done_callback(_done)
+
+def start(request_id: str, korean_query: str, username: str, allowed_views: list) -> list:
+    """실행 중인 이벤트 루프 안에서 호출. 시작한 작업 종류 목록을 반환"""
+    if not SPECULATIVE_PREFETCH or not request_id or request_id in _inflight:
+        return []
+
+    categories = _candidates(korean_query)
+    jobs = {}
+    # 웹 검색 키워드가 있으면 FinRAG 가 벡터 검색을 하지 않으므로 제외
+    if "KNOWLEDGE" in categories and not any(kw in korean_query for kw in WEB_SEARCH_KEYWORDS):
+        jobs["KNOWLEDGE"] = (korean_query, retrieve_relevant_docs, korean_query)
+    if "DATABASE" in categories and allowed_views:
+        jobs["DATABASE"] = (tuple(sorted(allowed_views)), get_schema_info, list(allowed_views))
+    if "TRANSFER" in categories and username:
+        jobs["TRANSFER"] = (username, preload_transfer_data, username)
+
+    entries = {}
+    for kind, (key, fn, arg) in jobs.items():
+        entry = {"key": key, "elapsed": 0.0}
+        entry["task"] = asyncio.create_task(_run(entry, fn, arg))
+        entries[kind] = entry
+        metrics.incr(f"prefetch.started.{kind}")
+    if entries:
+        _inflight[request_id] = entries
+        _log(f"후보 {categories} -> 미리 시작: {list(entries)}")
+    return list(entries)
+
+async def claim(request_id: str, kind: str, key):
+    """라우팅된 서브 에이전트가 호출. 키가 일치하는 prefetch 결과가 있으면 반환, 없으면 None"""
+    entries = _inflight.get(request_id)
+    entry = entries.pop(kind, None) if entries else None
+    if entry is None:
+        return None
+    if entry["key"] != key:
+        _record_waste(kind, entry, "key_mismatch")
+        _log(f"{kind} 키 불일치 -> 결과 폐기")
+        return None
+
+    t0 = time.perf_counter()
+    try:
+        result = await entry["task"]
+    except Exception as e:
+        metrics.incr(f"prefetch.error.{kind}")
+        _log(f"{kind} 미리 조회 실패 -> 일반 경로로 진행: {e}")
+        return None
+    wait = time.perf_counter() - t0
+    metrics.incr(f"prefetch.used.{kind}")
+    metrics.observe("prefetch.claim_wait", wait)
+    # 라우팅을 기다리는 동안 이미 끝난 작업 시간 = 절약된 시간
+    metrics.observe("prefetch.saved_sec", max(0.0, entry["elapsed"] - wait))
+    return result
+
+def release(request_id: str):
+    """요청 종료 시 호출. 사용되지 않은 prefetch 는 모두 낭비로 기록"""
+    entries = _inflight.pop(request_id, None) or {}
+    for kind, entry in entries.items():
+        _record_waste(kind, entry, "unused")
+
+def get_prefetch_stats() -> dict:
+    stats = {}
+    for kind in ("KNOWLEDGE", "DATABASE", "TRANSFER"):
+        started = metrics.get_counter(f"prefetch.started.{kind}")
+        used = metrics.get_counter(f"prefetch.used.{kind}")
+        stats[kind] = {
+            "started": started,
+            "used": used,
+            "wasted": metrics.get_counter(f"prefetch.wasted.{kind}"),
+            "errors": metrics.get_counter(f"prefetch.error.{kind}"),
+            "hit_rate": (used / started) if started else 0.0,
+        }
+    stats["wasted_sec"] = metrics.summarize("prefetch.wasted_sec")
+    stats["saved_sec"] = metrics.summarize("prefetch.saved_sec")
+    stats["claim_wait"] = metrics.summarize("prefetch.claim_wait")
+    return stats
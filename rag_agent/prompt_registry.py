@@ -0,0 +1,180 @@
+import os
+import time
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+
+# ==========================================
+# 프롬프트 레지스트리 (전 에이전트 공용)
+# ==========================================
+# - rag_agent/prompt/<agent>/<file>.md 를 한 번만 읽고 PromptTemplate 으로 컴파일해 캐시
+# - prompt | llm | StrOutputParser 체인도 (프롬프트, llm, tags) 단위로 캐시
+# - 파일 mtime 이 바뀐 경우에만 다시 읽음 (mtime 확인은 PROMPT_RELOAD_INTERVAL 초 간격)
+# - 시작 시 validate_prompts() 로 각 프롬프트의 템플릿 변수와 호출 측 입력 변수를 대조
+
+PROMPT_ROOT = Path(__file__).resolve().parent / "prompt"
+
+PROMPT_HOT_RELOAD = os.getenv("PROMPT_HOT_RELOAD", "true").strip().lower() not in ("0", "false", "no")
+PROMPT_RELOAD_INTERVAL = float(os.getenv("PROMPT_RELOAD_INTERVAL", "2.0"))
+
+# 프롬프트별 호출 측이 넘기는 입력 변수
+PROMPT_INPUTS = {
+    "main/main_01_translation.md": {"question"},
+    "main/main_02_refinement.md": {"history", "question"},
+    "main/main_03_router.md": {"question"},
+    "main/main_04_system.md": {"question"},
+    "main/main_05_re_translation.md": {"target_language", "korean_answer"},
+    "main/main_06_summarizer.md": {"current_summary", "user_input", "ai_output"},
+    "main/main_07_front_door.md": {"history", "question"},
+    "sql/sql_01_generation.md": {"question", "schema"},
+    "sql/sql_02_answer.md": {"question", "query", "result"},
+    "finrag/finrag_01_system.md": {"context", "question"},
+    "transfer/transfer_01_extract.md": {"question"},
+    "transfer/transfer_02_best_match.md": {"user_input", "candidates"},
+    "web_search/web_search_01_response.md": {"question", "context"},
+}
+
+class _Entry:
+    __slots__ = ("text", "template", "mtime", "hash", "checked_at", "loads")
+
+    def __init__(self):
+        self.text = ""
+        self.template = None
+        self.mtime = None
+        self.hash = None
+        self.checked_at = 0.0
+        self.loads = 0
+
+class PromptValidationError(ValueError):
+    """필수 입력 변수가 빠졌거나 로드할 수 없는 프롬프트가 있을 때 (그래프 생성 중단)"""
+
+_entries = {}
+_chains = {}    # (name, tags) -> (llm, mtime, chain)
+_lock = threading.RLock()
+
+def _log(icon: str, msg: str):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] {icon} [Prompt Registry] {msg}")
+
+def _load(name: str, entry: _Entry, mtime: float):
+    text = (PROMPT_ROOT / name).read_text(encoding="utf-8")
+    entry.text = text
+    entry.template = PromptTemplate.from_template(text)
+    entry.hash = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    entry.mtime = mtime
+    entry.loads += 1
+    if entry.loads > 1:
+        _log("🔄", f"'{name}' 변경 감지 -> 다시 로드")
+
+def _get_entry(name: str) -> _Entry:
+    with _lock:
+        entry = _entries.get(name)
+        now = time.monotonic()
+        if entry is not None and entry.template is not None:
+            if not PROMPT_HOT_RELOAD or now - entry.checked_at < PROMPT_RELOAD_INTERVAL:
+                return entry
+        if entry is None:
+            entry = _entries[name] = _Entry()
+        entry.checked_at = now
+        try:
+            mtime = (PROMPT_ROOT / name).stat().st_mtime
+        except FileNotFoundError:
+            if entry.template is None:
+                _log("❌", f"프롬프트 파일을 찾을 수 없습니다: {PROMPT_ROOT / name}")
+                raise
+            # 이미 로드된 프롬프트는 파일이 잠시 사라져도(배포 중 교체 등) 마지막 버전 유지
+            return entry
+        if entry.mtime != mtime:
+            _load(name, entry, mtime)
+        return entry
+
+def get_text(name: str) -> str:
+    """프롬프트 원문 (예: "main/main_01_translation.md")"""
+    return _get_entry(name).text
+
+def get_template(name: str) -> PromptTemplate:
+    return _get_entry(name).template
+
+def get_hash(name: str) -> str:
+    """프롬프트 내용 해시 (번역 메모리 등 버전 키로 사용)"""
+    try:
+        return _get_entry(name).hash
+    except FileNotFoundError:
+        return "missing"
+
+def get_chain(name: str, llm, tags: list = None):
+    """
+    prompt | llm | StrOutputParser 체인을 캐시에서 반환.
+    프롬프트 파일이 바뀌었거나 모듈의 llm 객체가 교체된 경우(벤치마크 스텁 등)에만 다시 조립합니다.
+    """
+    entry = _get_entry(name)
+    key = (name, tuple(tags or ()))
+    with _lock:
+        cached = _chains.get(key)
+        if cached is not None and cached[0] is llm and cached[1] == entry.mtime:
+            return cached[2]
+        chain = entry.template | llm | StrOutputParser()
+        if tags:
+            chain = chain.with_config(tags=list(tags))
+        _chains[key] = (llm, entry.mtime, chain)
+        return chain
+
+def validate_prompts(strict: bool = False) -> list:
+    """
+    등록된 모든 프롬프트를 로드하고 템플릿 변수를 검사해 문제 목록을 반환.
+    - error: 파일 없음 / 템플릿 파싱 실패 / 호출 측이 넘기지 않는 변수 사용 (실행 시 KeyError)
+    - warning: 호출 측이 넘기지만 템플릿에서 쓰지 않는 변수
+    strict=True 이면 error 가 하나라도 있을 때 PromptValidationError 를 발생
+    """
+    problems = []
+    for name, inputs in PROMPT_INPUTS.items():
+        try:
+            variables = set(get_template(name).input_variables)
+        except FileNotFoundError:
+            problems.append(("error", name, "파일 없음"))
+            continue
+        except Exception as e:
+            problems.append(("error", name, f"템플릿 파싱 실패: {e}"))
+            continue
+        missing = variables - inputs
+        unused = inputs - variables
+        if missing:
+            problems.append(("error", name, f"입력에 없는 변수 사용: {sorted(missing)}"))
+        if unused:
+            problems.append(("warning", name, f"템플릿에서 사용하지 않는 입력: {sorted(unused)}"))
+
+    for level, name, msg in problems:
+        _log("❌" if level == "error" else "⚠️", f"{name}: {msg}")
+    if not problems:
+        _log("✅", f"프롬프트 {len(PROMPT_INPUTS)}개 검증 완료")
+    errors = [f"{name}: {msg}" for level, name, msg in problems if level == "error"]
+    if strict and errors:
+        raise PromptValidationError(f"프롬프트 검증 실패 {len(errors)}건 - " + "; ".join(errors))
+    return problems
+
+def get_prompt_stats() -> dict:
+    """프롬프트별 크기(글자/토큰 추정)와 로드 횟수"""
+    from rag_agent.memory_store import count_tokens
+    stats = {}
+    for name in PROMPT_INPUTS:
+        try:
+            entry = _get_entry(name)
+        except FileNotFoundError:
+            continue
+        stats[name] = {
+            "chars": len(entry.text),
+            "tokens": count_tokens(entry.text),
+            "variables": sorted(entry.template.input_variables),
+            "loads": entry.loads,
+            "hash": entry.hash,
+        }
+    return stats
+
+if __name__ == "__main__":
+    validate_prompts()
+    for name, s in get_prompt_stats().items():
+        print(f"{name:<42} {s['chars']:>6} chars {s['tokens']:>6} tokens  vars={s['variables']}")
@@ -0,0 +1,139 @@
+import os
+import time
+import threading
+from datetime import datetime
+
+from utils.handle_sql import get_data
+from utils.cache import TTLCache
+from utils.singleflight import SingleFlight
+from utils import metrics
+from rag_agent.memory_store import count_tokens
+
+# ==========================================
+# SQL 에이전트 스키마 설명 캐시
+# ==========================================
+# INFORMATION_SCHEMA.COLUMNS 조회는 MySQL 에서 느린 편인데, DATABASE 질문마다 같은 current_user_* 뷰를
+# 다시 조회하고 있었습니다. (허용 뷰 목록(정렬), DB 이름) 을 키로 스키마 텍스트를 캐시합니다.
+#   - 로그인 시 warm_async() 로 미리 채우고, 없으면 첫 사용 시 생성 (동시 미스는 single-flight 로 1회만 조회)
+#   - utils/create_view.py 가 뷰를 다시 만들면 invalidate() (뷰 정의 변경 반영)
+#   - sql_01_generation.md 의 {schema} 에 들어갈 압축 텍스트: 뷰당 한 줄, "컬럼 타입 [설명] {값1|값2}"
+#   - 캐시 키에 사용자가 없으므로 스키마 텍스트에는 정적인 정보(컬럼, 타입, enum, COLUMN_NOTES)만 넣습니다.
+#     current_user_* 뷰는 로그인한 사용자 한 명의 데이터라, 여기서 값을 샘플링하면 다음 사용자 프롬프트에 노출됩니다.
+
+SCHEMA_CACHE_TTL = float(os.getenv("SCHEMA_CACHE_TTL", str(60 * 60)))
+SCHEMA_CACHE_MAXSIZE = int(os.getenv("SCHEMA_CACHE_MAXSIZE", "256"))
+
+# 컬럼명/타입만으로 알 수 없는 의미 (프롬프트에 있던 설명을 컬럼 단위로 옮김)
+COLUMN_NOTES = {
+    ("current_user_accounts", "is_primary"): "1=main account",
+    ("current_user_transactions", "transaction_type"): "{DEPOSIT|TRANSFER|WITHDRAW}",
+    ("current_user_transactions", "amount"): "+ deposit/received, - withdrawal/sent",
+    ("current_user_transactions", "description"): "counterparty name or memo",
+    ("current_user_transactions", "category"): "free text, e.g. 이체, 송금, 급여, 용돈",
+}
+
+_cache = TTLCache(maxsize=SCHEMA_CACHE_MAXSIZE, ttl=SCHEMA_CACHE_TTL)
+_flight = SingleFlight()
+# invalidate() 마다 증가: 조회 도중 뷰가 다시 만들어졌으면 이전 결과를 캐시하지 않음
+_generation = 0
+
+def _log(icon: str, msg: str):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] {icon} [Schema Cache] {msg}", flush=True)
+
+def make_key(allowed_views: list) -> tuple:
+    return tuple(sorted(set(allowed_views))), os.getenv("DB_NAME")
+
+def _format_column(view: str, row: dict) -> str:
+    column, column_type = row["COLUMN_NAME"], row["DATA_TYPE"].lower()
+    text = f"{column} {column_type}"
+    if column_type == "enum":
+        # enum('A','B') -> {A|B}
+        values = row["COLUMN_TYPE"][len("enum("):-1].replace("'", "").split(",")
+        text = f"{column} {{{'|'.join(values)}}}"
+    note = COLUMN_NOTES.get((view, column))
+    if note and note.startswith("{"):
+        # 고정 값 목록은 DB 가 enum 으로 알려주지 않을 때만 사용
+        if column_type != "enum":
+            text += f" {note}"
+    elif note:
+        text += f" [{note}]"
+    return text
+
+def _build(views: tuple) -> str:
+    t0 = time.perf_counter()
+    placeholders = ','.join(['%s'] * len(views))
+    sql = f"""
+        SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, COLUMN_TYPE
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_NAME IN ({placeholders})
+        AND TABLE_SCHEMA = DATABASE()
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+    """
+    rows = get_data(sql, list(views))
+
+    columns = {}
+    for row in rows:
+        columns.setdefault(row["TABLE_NAME"], []).append(_format_column(row["TABLE_NAME"], row))
+    schema = "\n".join(f"{view}({', '.join(cols)})" for view, cols in columns.items())
+
+    elapsed = time.perf_counter() - t0
+    metrics.observe("schema_cache.build_sec", elapsed)
+    _log("🗂️", f"{list(views)} 스키마 생성 ({len(rows)}개 컬럼, {count_tokens(schema)} 토큰, "
+              f"소요시간: {elapsed:.3f}초)")
+    return schema
+
+def peek(allowed_views: list) -> str | None:
+    """DB 조회 없이 캐시된 스키마만 반환 (없으면 None)"""
+    if not allowed_views:
+        return None
+    return _cache.get(make_key(allowed_views))
+
+def get_schema(allowed_views: list) -> str:
+    """캐시된 스키마 텍스트, 없으면 INFORMATION_SCHEMA 조회 후 캐시 (실패 결과는 캐시하지 않음)"""
+    if not allowed_views:
+        return "No accessible tables provided."
+    key = make_key(allowed_views)
+    schema = _cache.get(key)
+    if schema is not None:
+        metrics.incr("schema_cache.hit")
+        return schema
+
+    metrics.incr("schema_cache.miss")
+    generation = _generation
+    try:
+        schema, _ = _flight.do(key, lambda: _cache.get(key) or _build(key[0]))
+    except Exception as e:
+        return f"스키마 조회 실패: {e}"
+    if generation == _generation:
+        _cache.set(key, schema)
+    return schema
+
+def warm_async(allowed_views: list):
+    """로그인 직후 호출: 백그라운드 스레드에서 스키마 캐시를 채움 (로그인 응답을 막지 않음)"""
+    if not allowed_views:
+        return
+    threading.Thread(target=get_schema, args=(list(allowed_views),), name="schema-warm", daemon=True).start()
+
+def invalidate(allowed_views: list = None):
+    """뷰를 다시 만든 경우 호출. allowed_views 가 없으면 전체 삭제"""
+    global _generation
+    _generation += 1
+    if allowed_views is None:
+        _cache.clear()
+    else:
+        _cache.pop(make_key(allowed_views))
+    metrics.incr("schema_cache.invalidated")
+
+def get_schema_cache_stats() -> dict:
+    hits = metrics.get_counter("schema_cache.hit")
+    misses = metrics.get_counter("schema_cache.miss")
+    return {
+        "memory": _cache.stats(),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": (hits / (hits + misses)) if (hits + misses) else 0.0,
+        "invalidated": metrics.get_counter("schema_cache.invalidated"),
+        "build": metrics.summarize("schema_cache.build_sec"),
+        "single_flight": _flight.stats(),
+    }
@@ -1,37 +1,27 @@
 import os
 import time
+import asyncio
 from datetime import datetime
-from pathlib import Path
 from typing import TypedDict
 from dotenv import load_dotenv
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langgraph.graph import StateGraph, START, END
 
 from utils.handle_sql import get_data
+from utils.async_runner import run_sync
+from rag_agent import prompt_registry, schema_cache, sql_fastpath
 
 # 1. 환경 변수 로드
 load_dotenv()
 
 # 2. LLM 설정
-llm = ChatOpenAI(model="gpt-5-mini")
+llm = None
 
-# ---------------------------------------------------------
-# [설정] 프롬프트 경로 설정 및 로딩 함수
-# ---------------------------------------------------------
-CURRENT_DIR = Path(__file__).resolve().parent
-PROMPT_DIR = CURRENT_DIR.parent / "rag_agent" / "prompt" / "sql"
-
-def read_prompt(filename: str) -> str:
-    file_path = PROMPT_DIR / filename
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
-        print(f"❌ [Error] 프롬프트 파일을 찾을 수 없습니다: {file_path}")
-        return ""
+def get_llm():
+    global llm
+    if llm is None:
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(model="gpt-5-mini")
+    return llm
 
 # ---------------------------------------------------------
 # [NEW] 로그 출력 유틸리티 함수
@@ -58,35 +48,8 @@ def print_log(step_name: str, status: str, start_time: float = None, extra_info:
 # DB 유틸리티 함수
 # ---------------------------------------------------------
 def get_schema_info(allowed_views: list):
-    try:
-        if not allowed_views:
-            return "No accessible tables provided."
-            
-        placeholders = ','.join(['%s'] * len(allowed_views))
-        sql = f"""
-            SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE 
-            FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME IN ({placeholders})
-            AND TABLE_SCHEMA = DATABASE()
-            ORDER BY TABLE_NAME, ORDINAL_POSITION
-        """
-        
-        results = get_data(sql, allowed_views)
-        
-        schema_dict = {}
-        for row in results:
-            t_name = row['TABLE_NAME']
-            if t_name not in schema_dict:
-                schema_dict[t_name] = []
-            schema_dict[t_name].append(f"- {row['COLUMN_NAME']} ({row['DATA_TYPE']})")
-            
-        schema_text = ""
-        for t_name, cols in schema_dict.items():
-            schema_text += f"\n[Table/View: {t_name}]\n" + "\n".join(cols) + "\n"
-            
-        return schema_text.strip()
-    except Exception as e:
-        return f"스키마 조회 실패: {e}"
+    # (허용 뷰 목록, DB 이름) 단위로 캐시된 압축 스키마 (rag_agent/schema_cache.py)
+    return schema_cache.get_schema(allowed_views)
 
 def clean_sql_query(text: str) -> str:
     text = text.strip()
@@ -129,18 +92,24 @@ class SQLAgentState(TypedDict, total=False):
 # ---------------------------------------------------------
 # [LangGraph] 노드
 # ---------------------------------------------------------
-def node_schema(state: SQLAgentState) -> dict:
+async def node_schema(state: SQLAgentState) -> dict:
     t0 = print_log("1. 스키마 조회 (node_schema)", "start")
-    schema = get_schema_info(state.get("allowed_views") or [])
+    if state.get("schema"):
+        print_log("1. 스키마 조회 (node_schema)", "end", t0, extra_info="미리 조회된(prefetch) 스키마 사용")
+        return {}
+    schema = schema_cache.peek(state.get("allowed_views") or [])
+    if schema is not None:
+        print_log("1. 스키마 조회 (node_schema)", "end", t0, extra_info="캐시된 스키마 사용")
+        return {"schema": schema}
+    # PyMySQL 은 동기 드라이버이므로 이벤트 루프를 막지 않도록 워커 스레드에서 실행
+    schema = await asyncio.to_thread(get_schema_info, state.get("allowed_views") or [])
     print_log("1. 스키마 조회 (node_schema)", "end", t0)
     return {"schema": schema}
 
-def node_sql_gen(state: SQLAgentState) -> dict:
+async def node_sql_gen(state: SQLAgentState) -> dict:
     t0 = print_log("2. SQL 쿼리 생성 (node_sql_gen)", "start")
-    template = read_prompt("sql_01_generation.md")
-    prompt = PromptTemplate.from_template(template)
-    chain = prompt | llm | StrOutputParser()
-    raw = chain.invoke({
+    chain = prompt_registry.get_chain("sql/sql_01_generation.md", get_llm())
+    raw = await chain.ainvoke({
         "question": state["question"],
         "schema": state["schema"],
     })
@@ -150,21 +119,20 @@ def node_sql_gen(state: SQLAgentState) -> dict:
     print_log("2. SQL 쿼리 생성 (node_sql_gen)", "end", t0, extra_info=f"생성된 SQL:\n      {query}")
     return {"query": query}
 
-def node_execute(state: SQLAgentState) -> dict:
+async def node_execute(state: SQLAgentState) -> dict:
     t0 = print_log("3. SQL 실행 (node_execute)", "start")
-    result = run_db_query(state["query"])
+    result = await asyncio.to_thread(run_db_query, state["query"])
     
     # 결과의 일부분만 샘플로 출력하여 터미널이 너무 길어지는 것을 방지
     sample_result = str(result)[:100] + "..." if len(str(result)) > 100 else str(result)
     print_log("3. SQL 실행 (node_execute)", "end", t0, extra_info=f"실행 결과 일부: {sample_result}")
     return {"result": result}
 
-def node_answer(state: SQLAgentState) -> dict:
+async def node_answer(state: SQLAgentState) -> dict:
     t0 = print_log("4. 최종 답변 생성 (node_answer)", "start")
-    template = read_prompt("sql_02_answer.md")
-    prompt = PromptTemplate.from_template(template)
-    chain = prompt | llm | StrOutputParser()
-    response = chain.invoke({
+    # "final_answer" 태그: 메인 에이전트 스트리밍(stream_fintech_agent)에서 토큰을 화면으로 전달
+    chain = prompt_registry.get_chain("sql/sql_02_answer.md", get_llm(), tags=["final_answer"])
+    response = await chain.ainvoke({
         "question": state["question"],
         "query": state["query"],
         "result": state["result"],
@@ -180,6 +148,7 @@ _sql_graph = None
 def _get_sql_graph():
     global _sql_graph
     if _sql_graph is None:
+        from langgraph.graph import StateGraph, START, END
         builder = StateGraph(SQLAgentState)
         builder.add_node("schema", node_schema)
         builder.add_node("sql_gen", node_sql_gen)
@@ -196,7 +165,7 @@ def _get_sql_graph():
 # ---------------------------------------------------------
 # 외부 호출용 함수
 # ---------------------------------------------------------
-def get_sql_answer(question, username, allowed_views=None):
+async def aget_sql_answer(question, username, allowed_views=None, schema=None):
     try:
         if allowed_views is None:
             allowed_views = []
@@ -205,16 +174,26 @@ def get_sql_answer(question, username, allowed_views=None):
         total_t0 = print_log("SQL 에이전트 전체 파이프라인", "start")
         print(f"   [입력 질문]: '{question}' (User: {username})")
         print("="*50)
-        
+
+        # 잔액 / 최근 거래 / 지출 합계 / 연락처별 송금 -> 검증된 쿼리 + 템플릿 답변 (LLM 호출 생략)
+        answer = await sql_fastpath.atry_answer(question, allowed_views)
+        if answer is not None:
+            print("="*50)
+            print_log("SQL 에이전트 전체 파이프라인", "end", total_t0, extra_info="fast-path 처리")
+            print("="*50 + "\n")
+            return answer
+
         graph = _get_sql_graph()
-        result = graph.invoke({
+        result = await graph.ainvoke({
             "question": question,
             "username": username,
             "allowed_views": allowed_views,
+            "schema": schema,
         })
         
         print("="*50)
-        print_log("SQL 에이전트 전체 파이프라인", "end", total_t0)
+        elapsed = print_log("SQL 에이전트 전체 파이프라인", "end", total_t0)
+        sql_fastpath.record_llm_path(elapsed)
         print("="*50 + "\n")
         
         return result.get("response", "응답을 생성하지 못했습니다.")
@@ -224,6 +203,10 @@ def get_sql_answer(question, username, allowed_views=None):
         print(f"[{now}] ❌ [SQL Agent Error]: {error_msg}")
         return error_msg
 
+def get_sql_answer(question, username, allowed_views=None):
+    """aget_sql_answer 의 동기 래퍼"""
+    return run_sync(aget_sql_answer(question, username, allowed_views))
+
 # --- 테스트 코드 ---
 if __name__ == "__main__":
     test_views = ["account_summary_view", "transaction_history_view"]
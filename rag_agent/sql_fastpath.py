@@ -0,0 +1,385 @@
+import os
+import re
+import time
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+from utils.handle_sql import get_data
+from utils import metrics
+
+# ==========================================
+# SQL 에이전트 fast-path: 자주 묻는 계좌 질문의 검증된 쿼리 라이브러리
+# ==========================================
+# "내 잔액 얼마야", "최근 거래내역 5개", "이번 달 식비 얼마 썼어" 같은 질문은 매번 SQL 생성 LLM(node_sql_gen)과
+# 답변 LLM(node_answer)을 호출하고 임의의 SQL 을 실행했습니다. 정해진 의도(intent)와 일치하면
+#   matcher(정규식) -> 미리 작성한 파라미터 SQL(current_user_* 뷰만 사용) -> 한국어 템플릿 답변
+# 으로 처리해 LLM 호출 2회를 생략합니다.
+#   - 기간은 아래 _PERIODS 의 고정 SQL 조각만 사용하고, 사용자 입력 값은 항상 %s 파라미터로 전달
+#   - 분석/비교형 질문, 알 수 없는 계좌/수식어가 남는 질문은 매칭하지 않음 -> 기존 LLM 경로
+#   - renderer 가 None 을 반환하면 (조회 결과로 답을 확정할 수 없음) 기존 LLM 경로로 폴백
+#   - 여러 요청이 섞인 질문(접속사, 둘 이상의 의도 일치)은 일부만 답하지 않도록 LLM 경로로
+#   - DATABASE 질문 중 fast-path 처리 비율과 LLM 경로 대비 절감 시간을 기록
+
+SQL_FASTPATH_ENABLED = os.getenv("SQL_FASTPATH", "true").strip().lower() not in ("0", "false", "no")
+RECENT_DEFAULT_LIMIT = 5
+RECENT_MAX_LIMIT = 20
+CONTACT_MAX_ROWS = 500
+
+EMPTY_ANSWER = "해당 조건에 맞는 내역을 찾을 수 없습니다."
+
+# 집계/비교/추론이 필요한 질문은 LLM 경로로
+_COMPLEX = re.compile(r"(?:평균|비교|가장|제일|많이|적게|순위|왜|추천|분석|비율|패턴|예측|만약|보다|대비|증가|감소|몇\s*번째)")
+# 복합 질문 ("내 잔액 알려줘 그리고 최근 거래내역도")
+_COMPOUND = re.compile(r"(?:그리고|및|또한|이랑\s|랑\s|하고\s|\band\b|(?<!\d),(?!\d)|[&+/]|(?:내역|잔액|잔고|금액)도)", re.IGNORECASE)
+
+# (패턴, 표시 이름, WHERE 조각, 파라미터 함수)
+_PERIODS = [
+    (re.compile(r"오늘"), "오늘", "created_at >= CURDATE()", None),
+    (re.compile(r"어제"), "어제", "created_at >= CURDATE() - INTERVAL 1 DAY AND created_at < CURDATE()", None),
+    (re.compile(r"(?:이번\s*주|금주)"), "이번 주",
+     "created_at >= CURDATE() - INTERVAL WEEKDAY(CURDATE()) DAY", None),
+    (re.compile(r"(?:지난\s*주|저번\s*주)"), "지난주",
+     "created_at >= CURDATE() - INTERVAL WEEKDAY(CURDATE()) + 7 DAY "
+     "AND created_at < CURDATE() - INTERVAL WEEKDAY(CURDATE()) DAY", None),
+    (re.compile(r"(?:이번\s*달|이달|당월)"), "이번 달",
+     "created_at >= CURDATE() - INTERVAL DAYOFMONTH(CURDATE()) - 1 DAY", None),
+    (re.compile(r"(?:지난\s*달|저번\s*달|전월)"), "지난달",
+     "created_at >= (CURDATE() - INTERVAL DAYOFMONTH(CURDATE()) - 1 DAY) - INTERVAL 1 MONTH "
+     "AND created_at < CURDATE() - INTERVAL DAYOFMONTH(CURDATE()) - 1 DAY", None),
+    (re.compile(r"(?:올해|금년)"), "올해", "created_at >= MAKEDATE(YEAR(CURDATE()), 1)", None),
+    (re.compile(r"최근\s*(\d{1,3})\s*일"), "최근 {0}일", "created_at >= CURDATE() - INTERVAL %s DAY", int),
+]
+# _PERIODS 에 없는 기간 표현 (N월, 작년, 주말 ...) 이 있으면 매칭하지 않음
+_UNSUPPORTED_PERIOD = re.compile(r"(?:\d{1,2}\s*월|작년|재작년|상반기|하반기|분기|주말|평일|\d{4}\s*년|개월|\d+\s*주)")
+
+_TYPE_FILTERS = [
+    (re.compile(r"입금"), "입금", "transaction_type = 'DEPOSIT'"),
+    (re.compile(r"출금"), "출금", "transaction_type = 'WITHDRAW'"),
+    (re.compile(r"(?:송금|이체)"), "송금", "transaction_type = 'TRANSFER'"),
+    (re.compile(r"(?:지출|소비)"), "지출", "amount < 0"),
+]
+
+_BALANCE = re.compile(r"(?:잔액|잔고|남은\s*돈|얼마\s*(?:있|남))")
+_BALANCE_EXCLUDE = re.compile(r"(?:거래|내역|썼|쓴|지출|보낸|송금|이체|입금|출금|이전|이후|직전|직후|때)")
+# 가정형 ("10만원 보내면 잔액 얼마 남아?", "월세 내고 나서") -> 현재 잔액이 답이 아님
+_BALANCE_HYPOTHETICAL = re.compile(r"(?:\w면(?!\w)|후에|뒤에|다음에|나서|하고\s*나)")
+_BALANCE_ALL = re.compile(r"(?:전체|모든|모두|총|각|계좌별|통장별|합계|합쳐)")
+# "적금통장", "국민은행" 처럼 특정 계좌를 가리키는 말 (내/주/메인 등 일반 수식어 제외)
+_ACCOUNT_REF = re.compile(r"([가-힣A-Za-z0-9]+)(?:통장|은행|계좌)")
+_ACCOUNT_GENERIC = {"내", "나의", "제", "주", "메인", "대표", "기본", "모든", "전체", "각"}
+
+_RECENT = re.compile(r"(?:거래\s*(?:내역|기록)|입출금\s*내역|이용\s*내역|(?:입금|출금|송금|이체|지출|소비)\s*(?:내역|기록|목록)"
+                     r"|최근\s*(?:거래|내역))")
+_COUNT = re.compile(r"(\d{1,3})\s*(?:개|건|번|줄)")
+
+_SPEND = re.compile(r"(?:썼|쓴|쓰었|지출|소비|나간\s*돈|사용한\s*(?:돈|금액))")
+_SPEND_EXCLUDE = re.compile(r"(?:내역|목록|리스트|보여|어디에|어디서|뭐에|무엇에)")
+_SPEND_STOPWORDS = {"내가", "나", "제가", "내", "총", "전체", "돈", "금액", "합계", "모두", "다", "좀",
+                    "알려줘", "알려", "줘", "주세요", "확인", "해줘", "동안", "기간", "중", "에", "는", "야", "요"}
+# "얼마야", "얼마예요", "얼마나 돼?" 같은 의문 표현 (카테고리로 오인하지 않도록 제거)
+_SPEND_QUESTION = re.compile(r"^(?:얼마|몇|어느\s*정도)\w*$")
+# 카테고리 필터로 인정하는 ledger category 값 (그 외 단어가 남으면 LLM 경로)
+SPEND_CATEGORIES = {"식비", "외식", "카페", "편의점", "마트", "쇼핑", "교통", "교통비", "택시", "주유", "통신비", "공과금",
+                    "관리비", "월세", "보험", "병원", "의료", "약국", "교육", "학원", "구독", "여행", "문화", "경조사",
+                    "용돈", "이체", "송금", "출금", "기타"}
+_PARTICLES = ("으로", "에서", "로", "에", "는", "은", "를", "을", "가", "이", "도")
+
+# 수신인과 송금 동사 사이에 기간 표현 등 최대 2단어 허용 ("엄마한테 이번 달 보낸 돈")
+_CONTACT = re.compile(r"([가-힣A-Za-z]+?)\s*(?:님)?\s*(?:한테|에게|께)\s*(?:\S+\s+){0,2}?(?:보낸|송금|이체|준|부친|보냈)")
+_CONTACT_EXCLUDE = {"누구", "누가", "어디", "그", "걔", "이사람", "저사람", "사람"}
+_CONTACT_LIST = re.compile(r"(?:내역|목록|기록|언제)")
+
+def _log(icon: str, msg: str):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] {icon} [SQL Fast-path] {msg}", flush=True)
+
+# ---------------------------------------------------------
+# 포맷 / 파싱 유틸리티
+# ---------------------------------------------------------
+def _won(value) -> str:
+    value = Decimal(str(value or 0))
+    if value == value.to_integral_value():
+        return f"{int(value):,}원"
+    return f"{value:,.2f}원"
+
+def _date(value) -> str:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return f"{value.month}월 {value.day}일"
+
+def _parse_period(question: str):
+    """반환: (표시 이름, WHERE 조각, 파라미터 목록, 질문에서 제거한 나머지) / 지원하지 않는 기간이면 None"""
+    for pattern, label, clause, cast in _PERIODS:
+        m = pattern.search(question)
+        if m:
+            args = [cast(m.group(1))] if cast else []
+            return label.format(*m.groups()), clause, args, question[:m.start()] + " " + question[m.end():]
+    if _UNSUPPORTED_PERIOD.search(question):
+        return None
+    return "", None, [], question
+
+def _where(clauses: list) -> str:
+    clauses = [c for c in clauses if c]
+    return (" WHERE " + " AND ".join(f"({c})" for c in clauses)) if clauses else ""
+
+def _strip_particle(token: str) -> str:
+    for particle in _PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= 2:
+            return token[:-len(particle)]
+    return token
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _like_prefix(text: str) -> str:
+    return _like_escape(text) + "%"
+
+def _transaction_line(row: dict) -> str:
+    memo = row.get("description") or row.get("category") or row.get("transaction_type")
+    amount = Decimal(str(row["amount"]))
+    sign = "+" if amount > 0 else ""
+    return f"- {_date(row['created_at'])} | {memo} | {sign}{_won(amount)}"
+
+# ---------------------------------------------------------
+# 의도(intent) 정의: matcher -> (sql, args, params) / renderer -> 답변 (None 이면 LLM 경로로 폴백)
+# ---------------------------------------------------------
+class FastPathIntent:
+    __slots__ = ("name", "view", "matcher", "renderer")
+
+    def __init__(self, name: str, view: str, matcher, renderer):
+        self.name = name
+        self.view = view
+        self.matcher = matcher
+        self.renderer = renderer
+
+# 1. 특정 연락처에게 보낸 돈 ("엄마한테 이번 달 보낸 돈 얼마야")
+def _match_contact(question: str):
+    m = _CONTACT.search(question)
+    if not m or m.group(1) in _CONTACT_EXCLUDE:
+        return None
+    period = _parse_period(question)
+    if period is None:
+        return None
+    label, clause, args, _ = period
+    name = m.group(1)
+    # 적요는 "엄마 용돈" / "엄마 박영자 송금"(transfer_agent.insert_ledger) 처럼 받는 사람으로 시작
+    # -> 접두 또는 단어 단위 일치 ("엄마" 가 "큰엄마" 에 걸리지 않음)
+    sql = ("SELECT amount, description, created_at FROM current_user_transactions"
+           + _where(["transaction_type = 'TRANSFER' AND amount < 0", "description LIKE %s OR description LIKE %s", clause])
+           + f" ORDER BY created_at DESC LIMIT {CONTACT_MAX_ROWS}")
+    escaped = _like_prefix(name)[:-1]
+    return (sql, [f"{escaped}%", f"% {escaped} %"] + args,
+            {"name": name, "period": label, "list": bool(_CONTACT_LIST.search(question))})
+
+def _render_contact(question: str, params: dict, rows: list):
+    if not rows:
+        # 받는 사람이 적요에 없는 송금(이전 버전에서 '송금' 으로만 기록)일 수 있음 -> LLM 경로에서 판단
+        return None
+    prefix = f"{params['period']} " if params["period"] else ""
+    total = sum(-Decimal(str(r["amount"])) for r in rows)
+    answer = (f"{prefix}{params['name']}에게 보낸 금액은 총 **{_won(total)}**이에요. "
+              f"({len(rows)}건, 마지막 송금: {_date(rows[0]['created_at'])})")
+    if params["list"]:
+        answer += "\n" + "\n".join(_transaction_line(r) for r in rows[:RECENT_DEFAULT_LIMIT])
+    return answer
+
+# 2. 기간/카테고리별 지출 합계 ("이번 달 식비 얼마 썼어")
+def _match_spend(question: str):
+    if not _SPEND.search(question) or _SPEND_EXCLUDE.search(question):
+        return None
+    period = _parse_period(question)
+    if period is None:
+        return None
+    label, clause, args, rest = period
+    # 기간/지출 표현/일반어를 빼고 남는 단어가 카테고리 (2개 이상 남으면 의도를 확정할 수 없음)
+    tokens = [_strip_particle(t) for t in re.sub(r"[^\w\s]", " ", rest).split()
+              if not _SPEND.search(t) and t not in _SPEND_STOPWORDS and not _SPEND_QUESTION.match(t)]
+    tokens = [t for t in tokens if t not in _SPEND_STOPWORDS]
+    if len(tokens) > 1 or (tokens and tokens[0] not in SPEND_CATEGORIES):
+        return None
+    category = tokens[0] if tokens else None
+    clauses = ["amount < 0", clause]
+    if category:
+        clauses.append("category = %s OR description LIKE %s")
+        args = args + [category, f"%{_like_escape(category)}%"]
+    sql = "SELECT COUNT(*) AS cnt, COALESCE(SUM(-amount), 0) AS total FROM current_user_transactions" + _where(clauses)
+    return sql, args, {"period": label, "category": category}
+
+def _render_spend(question: str, params: dict, rows: list):
+    row = rows[0] if rows else {"cnt": 0, "total": 0}
+    subject = " ".join(p for p in (params["period"], params["category"]) if p)
+    subject = f"{subject} 지출" if subject else "지출"
+    if not row["cnt"]:
+        if params["category"]:
+            # 사용자가 다른 이름으로 기록했을 수 있음 ("식비" vs "외식") -> LLM 경로에서 판단
+            return None
+        return f"{subject} 내역을 찾을 수 없습니다."
+    return f"{subject}은 총 **{_won(row['total'])}**이에요. ({row['cnt']}건)"
+
+# 3. 최근 거래 내역 ("최근 거래내역 5개", "이번 주 입금 내역")
+def _match_recent(question: str):
+    if not _RECENT.search(question) or _CONTACT.search(question):
+        return None
+    period = _parse_period(question)
+    if period is None:
+        return None
+    label, clause, args, _ = period
+    m = _COUNT.search(question)
+    if m:
+        limit = min(int(m.group(1)), RECENT_MAX_LIMIT)
+    else:
+        # 기간만 지정된 목록 요청은 최대 RECENT_MAX_LIMIT 건까지 보여주고 잘렸으면 안내
+        limit = RECENT_MAX_LIMIT if clause else RECENT_DEFAULT_LIMIT
+    if limit <= 0:
+        return None
+    type_label, type_clause = "", None
+    for pattern, name, type_sql in _TYPE_FILTERS:
+        if pattern.search(question):
+            type_label, type_clause = name, type_sql
+            break
+    sql = ("SELECT transaction_type, amount, description, category, created_at FROM current_user_transactions"
+           + _where([type_clause, clause]) + " ORDER BY created_at DESC LIMIT %s")
+    # 잘림 여부 확인용으로 1건 더 조회
+    return sql, args + [limit + 1], {"period": label, "type": type_label, "limit": limit, "explicit": bool(m)}
+
+def _render_recent(question: str, params: dict, rows: list):
+    subject = " ".join(p for p in (params["period"], params["type"]) if p)
+    subject = f"{subject} 거래" if subject else "최근 거래"
+    if not rows:
+        return EMPTY_ANSWER
+    shown = rows[:params["limit"]]
+    answer = f"{subject} {len(shown)}건입니다.\n" + "\n".join(_transaction_line(r) for r in shown)
+    if len(rows) > params["limit"] and not params["explicit"]:
+        answer += f"\n(최근 {len(shown)}건만 표시했어요. 더 이전 내역이 있습니다.)"
+    return answer
+
+# 4. 계좌 잔액 ("내 잔액 얼마야", "월급통장 잔고", "전체 계좌 잔액")
+def _match_balance(question: str):
+    if not _BALANCE.search(question) or _BALANCE_EXCLUDE.search(question) or _BALANCE_HYPOTHETICAL.search(question):
+        return None
+    period = _parse_period(question)
+    if period is None or period[1] is not None:
+        # 과거 시점 잔액은 balance_after 로 계산해야 하므로 LLM 경로
+        return None
+    sql = ("SELECT bank_name, account_alias, account_number, balance, is_primary FROM current_user_accounts "
+           "ORDER BY is_primary DESC, account_id")
+    return sql, [], {}
+
+def _account_name(row: dict) -> str:
+    return " ".join(p for p in (row.get("bank_name"), row.get("account_alias")) if p) or row.get("account_number") or "계좌"
+
+def _render_balance(question: str, params: dict, rows: list):
+    if not rows:
+        return "등록된 계좌를 찾을 수 없습니다."
+    compact = re.sub(r"\s+", "", question)
+    mentioned = [r for r in rows
+                 if any(v and re.sub(r"\s+", "", str(v)) in compact for v in (r.get("account_alias"), r.get("bank_name")))]
+    refs = [m.group(1) for m in _ACCOUNT_REF.finditer(compact) if m.group(1) not in _ACCOUNT_GENERIC]
+    if refs and not mentioned:
+        # 보유 계좌와 일치하지 않는 계좌 지칭 (예: 없는 적금통장) -> LLM 경로에서 안내
+        return None
+
+    if mentioned:
+        targets = mentioned
+    elif _BALANCE_ALL.search(question) or len(rows) == 1:
+        targets = rows
+    else:
+        primary = rows[0]
+        return f"주 계좌({_account_name(primary)})의 현재 잔액은 **{_won(primary['balance'])}**입니다."
+
+    if len(targets) == 1:
+        return f"{_account_name(targets[0])}의 현재 잔액은 **{_won(targets[0]['balance'])}**입니다."
+    lines = [f"- {_account_name(r)}: {_won(r['balance'])}" for r in targets]
+    total = sum(Decimal(str(r["balance"] or 0)) for r in targets)
+    return f"보유하신 계좌 {len(targets)}개의 잔액은 총 **{_won(total)}**입니다.\n" + "\n".join(lines)
+
+# 질문마다 모든 의도를 검사하고 정확히 하나만 일치할 때 사용
+INTENTS = [
+    FastPathIntent("transfers_to_contact", "current_user_transactions", _match_contact, _render_contact),
+    FastPathIntent("spend", "current_user_transactions", _match_spend, _render_spend),
+    FastPathIntent("recent_transactions", "current_user_transactions", _match_recent, _render_recent),
+    FastPathIntent("balance", "current_user_accounts", _match_balance, _render_balance),
+]
+
+# ---------------------------------------------------------
+# 매칭 / 실행
+# ---------------------------------------------------------
+def match(question: str, allowed_views: list):
+    """반환: (intent, sql, args, params) 또는 None (일치하는 의도가 없거나 둘 이상이면 None)"""
+    question = (question or "").strip()
+    if not question or _COMPLEX.search(question) or _COMPOUND.search(question):
+        return None
+    matched = []
+    for intent in INTENTS:
+        if intent.view not in (allowed_views or []):
+            continue
+        found = intent.matcher(question)
+        if found is not None:
+            matched.append((intent, *found))
+    if len(matched) != 1:
+        if matched:
+            metrics.incr("sql_fastpath.ambiguous")
+        return None
+    return matched[0]
+
+def record_llm_path(elapsed: float):
+    """LLM 경로(스키마 -> SQL 생성 -> 실행 -> 답변) 소요시간: 절감 시간 추정의 기준"""
+    metrics.incr("sql_fastpath.miss")
+    metrics.observe("sql_fastpath.llm_path_sec", elapsed)
+
+def coverage() -> float:
+    hits = metrics.get_counter("sql_fastpath.hit")
+    total = hits + metrics.get_counter("sql_fastpath.miss")
+    return (hits / total) if total else 0.0
+
+async def atry_answer(question: str, allowed_views: list) -> str | None:
+    """fast-path 로 답할 수 있으면 답변, 아니면 None (호출 측은 기존 LLM 경로 실행 후 record_llm_path 호출)"""
+    if not SQL_FASTPATH_ENABLED:
+        return None
+    t0 = time.perf_counter()
+    found = match(question, allowed_views)
+    if found is None:
+        return None
+    intent, sql, args, params = found
+    try:
+        # PyMySQL 은 동기 드라이버이므로 워커 스레드에서 실행
+        rows = await asyncio.to_thread(get_data, sql, args or None)
+        answer = intent.renderer(question, params, rows)
+    except Exception as e:
+        metrics.incr(f"sql_fastpath.fallback.{intent.name}")
+        _log("⚠️", f"[{intent.name}] 실행 실패 -> LLM 경로로 폴백: {e}")
+        return None
+    if answer is None:
+        metrics.incr(f"sql_fastpath.fallback.{intent.name}")
+        _log("↩️", f"[{intent.name}] 조회 결과로 답을 확정할 수 없음 -> LLM 경로로 폴백")
+        return None
+
+    elapsed = time.perf_counter() - t0
+    metrics.incr("sql_fastpath.hit")
+    metrics.incr(f"sql_fastpath.hit.{intent.name}")
+    metrics.observe("sql_fastpath.latency", elapsed)
+    baseline = metrics.summarize("sql_fastpath.llm_path_sec")
+    if baseline["count"]:
+        saved = max(0.0, baseline["mean"] - elapsed)
+        metrics.observe("sql_fastpath.saved_sec", saved)
+        saved_text = f"LLM 경로 평균 대비 {saved:.3f}초 절감"
+    else:
+        saved_text = "LLM 경로 측정값 없음"
+    _log("⚡", f"[{intent.name}] LLM 호출 2회 생략 (소요시간: {elapsed:.3f}초, {saved_text}, "
+              f"DATABASE 질문 처리 비율 {coverage():.1%})")
+    return answer
+
+def get_fastpath_stats() -> dict:
+    saved = metrics.summarize("sql_fastpath.saved_sec")
+    return {
+        "enabled": SQL_FASTPATH_ENABLED,
+        "hits": metrics.get_counter("sql_fastpath.hit"),
+        "misses": metrics.get_counter("sql_fastpath.miss"),
+        "coverage": coverage(),
+        "by_intent": {i.name: metrics.get_counter(f"sql_fastpath.hit.{i.name}") for i in INTENTS},
+        "fallbacks": {i.name: metrics.get_counter(f"sql_fastpath.fallback.{i.name}") for i in INTENTS},
+        "latency": metrics.summarize("sql_fastpath.latency"),
+        "llm_path": metrics.summarize("sql_fastpath.llm_path_sec"),
+        "saved_total_sec": saved["mean"] * saved["count"],
+    }
@@ -0,0 +1,124 @@
+import os
+import re
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from utils.cache import TTLCache, SQLiteKVStore
+from utils.term_normalize import normalize_term
+from rag_agent.lang_detect import CODE_TO_LANGUAGE, KOREAN
+from utils import metrics
+
+# ==========================================
+# 금융 용어 설명 사전 생성본 (precomputed explanations)
+# ==========================================
+# utils/precompute_explanations.py 가 terms 의 모든 용어에 대해 finrag_01_system.md 설명을 미리 만들어 두고,
+# 질문이 "용어 하나의 뜻"을 묻는 경우 node_db_answer 가 LLM 호출 없이 그대로 사용합니다.
+#   - 키: sha256(용어 + 정의 해시)  -> 정의가 바뀌면 자동으로 새 키 (증분 재생성 대상)
+#   - tag: 프롬프트 해시 (ko: finrag_01_system.md / 그 외: + main_05_re_translation.md)
+#          -> 프롬프트가 바뀌면 기존 설명은 조회되지 않고, 배치 작업이 다시 생성
+#   - 언어별 테이블 (explanations_ko / _en / _vi / _id)
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+DB_PATH = Path(os.getenv("TERM_EXPLANATION_PATH", str(PROJECT_ROOT / "data" / "cache" / "term_explanations.sqlite3")))
+
+TERM_EXPLANATIONS_ENABLED = os.getenv("TERM_EXPLANATIONS", "true").strip().lower() not in ("0", "false", "no")
+# 벡터 검색으로 찾은 용어도 이 거리 이하일 때만 '확실한 단일 용어'로 취급
+TERM_EXPLANATION_MAX_DISTANCE = float(os.getenv("TERM_EXPLANATION_MAX_DISTANCE", "0.35"))
+
+ANSWER_PROMPT = "finrag/finrag_01_system.md"
+TRANSLATION_PROMPT = "main/main_05_re_translation.md"
+LANGUAGE_TO_CODE = {name: code for code, name in CODE_TO_LANGUAGE.items()}
+
+# 질문이 용어로 시작하고, 바로 뒤에 (조사) + ("뜻/의미" + 조사) + "뭐야 / 설명해줘" 류의 짧은 표현이 올 때만 정의 질문
+# ("금리인하요구권이 뭐야" 처럼 용어 뒤에 다른 말이 붙은 복합어는 제외)
+_DEFINITION_TAIL = re.compile(
+    r"(?:이란|란)$|"
+    r"(?:이란|란|이라는|라는|이|가|은|는|의|에대해서?|에관해서?)?"
+    r"(?:(?:뜻|의미|개념|정의)(?:이|가|은|는|을|를)?)?"
+    r"(?:뭐|무엇|무슨|뜻|의미|개념|정의|설명|알려)"
+)
+MAX_REMAINDER_LENGTH = 12
+
+_memory = TTLCache(maxsize=int(os.getenv("TERM_EXPLANATION_MAXSIZE", "2000")))
+_stores = {}
+_stores_lock = threading.Lock()
+
+def _get_store(code: str) -> SQLiteKVStore:
+    with _stores_lock:
+        store = _stores.get(code)
+        if store is None:
+            store = _stores[code] = SQLiteKVStore(DB_PATH, table=f"explanations_{code}")
+        return store
+
+def language_code(language: str) -> str | None:
+    """"English" / "en" -> "en" (지원하지 않는 언어는 None)"""
+    if not language:
+        return None
+    if language.lower() in CODE_TO_LANGUAGE:
+        return language.lower()
+    return LANGUAGE_TO_CODE.get(language)
+
+def prompt_version(code: str) -> str:
+    from rag_agent import prompt_registry
+    version = prompt_registry.get_hash(ANSWER_PROMPT)
+    if code != "ko":
+        version += "." + prompt_registry.get_hash(TRANSLATION_PROMPT)
+    return version
+
+def make_key(word: str, definition: str) -> str:
+    definition_hash = hashlib.sha256((definition or "").encode("utf-8")).hexdigest()[:16]
+    return hashlib.sha256(f"{normalize_term(word)}\n{definition_hash}".encode("utf-8")).hexdigest()
+
+def canonical_question(word: str) -> str:
+    """배치 생성 시 사용하는 대표 질문"""
+    return f"'{word}'이란 무엇인가요?"
+
+def is_definition_question(query: str, alias: str) -> bool:
+    text = normalize_term(query)
+    alias = normalize_term(alias)
+    text = re.sub(r"[?？!~\"'`]", "", text)
+    if not alias or not text.startswith(alias):
+        return False
+    remainder = text[len(alias):]
+    return len(remainder) <= MAX_REMAINDER_LENGTH and (not remainder or _DEFINITION_TAIL.match(remainder) is not None)
+
+def lookup(word: str, definition: str, language: str = KOREAN) -> str | None:
+    code = language_code(language)
+    if not TERM_EXPLANATIONS_ENABLED or code is None:
+        return None
+    version = prompt_version(code)
+    key = make_key(word, definition)
+
+    text = _memory.get((code, version, key))
+    if text is None:
+        try:
+            text = _get_store(code).get(key, tag=version)
+        except Exception as e:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            print(f"[{now}] ⚠️ [Term Explanations] 조회 실패: {e}")
+            text = None
+        if text is not None:
+            _memory.set((code, version, key), text)
+    metrics.incr(f"term_explanations.{'hit' if text is not None else 'miss'}.{code}")
+    return text
+
+def has_current(word: str, definition: str, code: str) -> bool:
+    return _get_store(code).get(make_key(word, definition), tag=prompt_version(code)) is not None
+
+def save(word: str, definition: str, code: str, text: str):
+    _get_store(code).set(make_key(word, definition), text, tag=prompt_version(code))
+
+def purge_stale(code: str) -> int:
+    """현재 프롬프트 버전이 아닌 설명 삭제"""
+    return _get_store(code).purge(keep_tag=prompt_version(code))
+
+def get_term_explanation_stats() -> dict:
+    stats = {}
+    for code in CODE_TO_LANGUAGE:
+        hits = metrics.get_counter(f"term_explanations.hit.{code}")
+        misses = metrics.get_counter(f"term_explanations.miss.{code}")
+        stats[code] = {"hits": hits, "misses": misses, "hit_rate": (hits / (hits + misses)) if (hits + misses) else 0.0}
+    return stats
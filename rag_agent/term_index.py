@@ -0,0 +1,227 @@
+import os
+import re
+import time
+import threading
+from collections import deque
+from datetime import datetime
+
+from utils.term_normalize import normalize_term, normalize_term_with_breaks
+from utils import metrics
+
+# ==========================================
+# 금융 용어 정확 일치 색인 (Aho-Corasick)
+# ==========================================
+# terms 의 word 를 정규화한 표면형(surface form)으로 오토마타를 만들어,
+# 질의에 용어가 그대로 등장하면 임베딩 호출 / 벡터 검색 없이 정의를 바로 돌려줍니다.
+#   - 정규화: utils/term_normalize.py (pdf_to_mysql 과 동일 규칙 + 영문 소문자화)
+#     -> 띄어쓰기 변형("연말 정산" / "연말정산")은 정규화만으로 같은 형태가 됨
+#   - 별칭: "총부채원리금상환비율(DSR)" -> "총부채원리금상환비율", "dsr"
+#   - 겹치는 일치는 긴 것 우선 ("기준금리" 가 있으면 그 안의 "금리" 는 버림)
+#   - 한글 용어는 어절 끝이거나 조사/의문 어미가 바로 붙을 때만 일치로 인정
+#     ("금리인하요구권" 처럼 색인에 없는 복합어 안의 "금리" 는 버리고 벡터/하이브리드 검색으로 넘김)
+# 색인 원천은 Chroma 메타데이터(word) 또는 MySQL terms 테이블입니다.
+
+TERM_INDEX_ENABLED = os.getenv("TERM_INDEX_ENABLED", "true").strip().lower() not in ("0", "false", "no")
+TERM_INDEX_MAX_TERMS = int(os.getenv("TERM_INDEX_MAX_TERMS", "3"))
+MIN_ALIAS_LENGTH = 2
+
+_ASCII_ALIAS = re.compile(r"[a-z0-9&]+")
+_PAREN_ALIAS = re.compile(r"^(?P<outer>.*?)\s*[\(\[](?P<inner>[^\)\]]+)[\)\]]\s*(?P<rest>.*)$")
+_ASCII_LETTER = re.compile(r"[a-z]")
+# 한글 용어 뒤에 붙어도 같은 어절로 보는 꼬리 (조사 + 의문/서술 어미)
+_KOREAN_TAIL = re.compile(
+    r"(?:이란|란|이라는|라는|이라고|라고|이|가|은|는|을|를|의|에|에서|으로|로|와|과|도|만|이랑|랑|에대해서?|에관해서?)?"
+    r"(?:뭐야|뭐예요|뭐에요|뭐지|뭔가요|뭔데|무엇인가요|무엇|뜻|의미|이야|야|이에요|예요|에요|요|인가요|가요)?"
+)
+_WORD_CHARS = re.compile(r"\w*")
+
+def _log(icon: str, msg: str):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] {icon} [Term Index] {msg}", flush=True)
+
+# ---------------------------------------------------------
+# Aho-Corasick 오토마타
+# ---------------------------------------------------------
+class AhoCorasick:
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]    # 상태별 [(패턴 길이, 패턴)]
+
+    def add(self, pattern: str):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), pattern))
+
+    def build(self):
+        # 루트의 자식은 실패 링크가 루트, 그 아래는 BFS 순서로 부모의 실패 링크를 따라가며 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0) if state else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """(시작 위치, 끝 위치(exclusive), 패턴) 을 차례로 반환"""
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, pattern in self._out[state]:
+                yield i + 1 - length, i + 1, pattern
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+# ---------------------------------------------------------
+# 색인 구성
+# ---------------------------------------------------------
+def surface_forms(word: str) -> set:
+    """용어 하나의 검색 표면형 (정규화된 전체 / 괄호 밖 / 괄호 안 영문 약어)"""
+    forms = {normalize_term(word)}
+    m = _PAREN_ALIAS.match(word or "")
+    if m:
+        outer = normalize_term(m.group("outer") + m.group("rest"))
+        inner = normalize_term(m.group("inner"))
+        forms.add(outer)
+        # 괄호 안은 영문 약어이거나 충분히 긴 한글 표현만 별칭으로 사용 ("(경제)" 같은 분류어 제외)
+        if _ASCII_ALIAS.fullmatch(inner) or len(inner) >= 3:
+            forms.add(inner)
+    return {f for f in forms if len(f) >= MIN_ALIAS_LENGTH}
+
+class TermIndex:
+    def __init__(self, terms: list):
+        """terms: [{"word", "definition"}]"""
+        self.terms = terms
+        self.aliases = {}       # 표면형 -> [terms 인덱스]
+        self.automaton = AhoCorasick()
+        for idx, term in enumerate(terms):
+            for form in surface_forms(term["word"]):
+                ids = self.aliases.setdefault(form, [])
+                if idx not in ids:
+                    ids.append(idx)
+        for form in self.aliases:
+            self.automaton.add(form)
+        self.automaton.build()
+
+    @staticmethod
+    def _on_boundary(text: str, start: int, end: int, pattern: str, breaks: set) -> bool:
+        if not _ASCII_ALIAS.fullmatch(pattern):
+            # 한글: 어절 끝, 또는 어절의 나머지가 조사/어미뿐일 때만 ("금리가", "금리란" O / "금리인하요구권" X)
+            if end in breaks:
+                return True
+            next_break = min((b for b in breaks if b > end), default=len(text))
+            rest = _WORD_CHARS.match(text, end, next_break).group()
+            return _KOREAN_TAIL.fullmatch(rest) is not None
+        # 영문 약어는 영단어 중간 일치 금지 ("dr" in "address")
+        before = text[start - 1] if start > 0 else ""
+        after = text[end] if end < len(text) else ""
+        return not (_ASCII_LETTER.match(before) or _ASCII_LETTER.match(after))
+
+    def match(self, query: str, limit: int = None) -> list:
+        """질의에 등장하는 용어 목록 [{"word", "definition", "alias"}] (질의 내 등장 순서)"""
+        text, breaks = normalize_term_with_breaks(query)
+        found = [(s, e, p) for s, e, p in self.automaton.iter_matches(text)
+                 if self._on_boundary(text, s, e, p, breaks)]
+        if not found:
+            return []
+
+        # 긴 일치 우선으로 겹치지 않게 선택
+        found.sort(key=lambda m: (-(m[1] - m[0]), m[0]))
+        taken = []
+        for s, e, p in found:
+            if all(e <= ts or s >= te for ts, te, _ in taken):
+                taken.append((s, e, p))
+        taken.sort()
+
+        results, seen = [], set()
+        for _, _, alias in taken:
+            for idx in self.aliases[alias]:
+                if idx not in seen:
+                    seen.add(idx)
+                    results.append({**self.terms[idx], "alias": alias})
+        return results[:limit] if limit else results
+
+# ---------------------------------------------------------
+# 전역 색인 (시작 시 1회 구성)
+# ---------------------------------------------------------
+_index = None
+_lock = threading.Lock()
+
+def _terms_from_vectorstore(vectorstore) -> list:
+    data = vectorstore.get(include=["documents", "metadatas"])
+    terms = []
+    for doc, meta in zip(data.get("documents") or [], data.get("metadatas") or []):
+        word = (meta or {}).get("word")
+        if not word or not doc:
+            continue
+        # 문서 포맷: "word: definition" (utils/set_chromaDB.py)
+        definition = doc.split(":", 1)[1].strip() if ":" in doc else doc
+        terms.append({"word": word, "definition": definition})
+    return terms
+
+def _terms_from_mysql() -> list:
+    from utils.handle_sql import get_data
+    rows = get_data("SELECT word, definition FROM terms WHERE definition IS NOT NULL")
+    return [{"word": r["word"], "definition": r["definition"]} for r in rows if r.get("word")]
+
+def load_term_index(vectorstore=None) -> TermIndex:
+    """색인을 한 번만 구성. vectorstore 가 있으면 Chroma 메타데이터, 없거나 실패하면 MySQL terms 사용"""
+    global _index
+    # 빈 색인(앞선 MySQL 로딩 실패)은 vectorstore 가 주어지면 다시 구성
+    if _index is not None and (_index.terms or vectorstore is None):
+        return _index
+    with _lock:
+        if _index is not None and (_index.terms or vectorstore is None):
+            return _index
+        t0 = time.perf_counter()
+        terms, source = [], None
+        if vectorstore is not None:
+            try:
+                terms, source = _terms_from_vectorstore(vectorstore), "chroma"
+            except Exception as e:
+                _log("⚠️", f"Chroma 메타데이터 로딩 실패 -> MySQL 사용: {e}")
+        if not terms:
+            try:
+                terms, source = _terms_from_mysql(), "mysql"
+            except Exception as e:
+                _log("⚠️", f"금융 용어 로딩 실패 (빈 색인 사용): {e}")
+        _index = TermIndex(terms)
+        _log("✅", f"용어 {len(terms)}개 / 표면형 {len(_index.aliases)}개 색인 "
+                   f"(원천: {source}, 소요시간: {time.perf_counter() - t0:.3f}초)")
+    return _index
+
+def match_terms(query: str, limit: int = None) -> list:
+    if not TERM_INDEX_ENABLED:
+        return []
+    t0 = time.perf_counter()
+    results = load_term_index().match(query, limit=limit)
+    metrics.observe("term_index.match_latency", time.perf_counter() - t0)
+    metrics.incr("term_index.hit" if results else "term_index.miss")
+    return results
+
+def get_term_index_stats() -> dict:
+    hits = metrics.get_counter("term_index.hit")
+    misses = metrics.get_counter("term_index.miss")
+    return {
+        "terms": len(_index.terms) if _index else 0,
+        "aliases": len(_index.aliases) if _index else 0,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": (hits / (hits + misses)) if (hits + misses) else 0.0,
+        "match_latency": metrics.summarize("term_index.match_latency"),
+    }
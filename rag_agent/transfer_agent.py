@@ -1,35 +1,29 @@
 import os
 import json
 import time
+import asyncio
 from datetime import datetime
 from pathlib import Path
 from typing import TypedDict, List
 from dotenv import load_dotenv
 import bcrypt
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langgraph.graph import StateGraph, START, END
 
 # 사용자 원본 코드의 유틸리티 (DB 핸들러가 있다고 가정)
 from utils.handle_sql import get_data, execute_query
+from utils.async_runner import run_sync
+from rag_agent import prompt_registry
 
 # 1. 환경 설정
 load_dotenv()
-llm = ChatOpenAI(model="gpt-5-mini")
-CURRENT_DIR = Path(__file__).resolve().parent
-PROMPT_DIR = CURRENT_DIR / "prompt" / "transfer"
+llm = None
 
-def read_prompt(filename: str) -> str:
-    file_path = PROMPT_DIR / filename
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        print(f"[{now}] ❌ [Error] 프롬프트 파일을 찾을 수 없습니다: {file_path}")
-        return ""
+def get_llm():
+    global llm
+    if llm is None:
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(model="gpt-5-mini")
+    return llm
 
 # ---------------------------------------------------------
 # [NEW] 로그 출력 유틸리티 함수
@@ -76,19 +70,16 @@ def _parse_transfer_json(text: str) -> dict:
         print(f"[{now}] ❌ JSON Parsing Error: {e}, Raw: {text}")
         return {"target": None, "amount": None, "currency": None}
 
-def _node_extract(state: TransferExtractState) -> dict:
+async def _node_extract(state: TransferExtractState) -> dict:
     """
     사용자 발화에서 송금 대상, 금액, 통화를 추출합니다.
     """
     t0 = print_log("1. LLM 송금 정보 추출 (node_extract)", "start")
     
     # 한국어 금액 단위 처리 및 JSON 강제 프롬프트
-    template = read_prompt("transfer_01_extract.md")
+    chain = prompt_registry.get_chain("transfer/transfer_01_extract.md", get_llm())
     
-    prompt = PromptTemplate.from_template(template)
-    chain = prompt | llm | StrOutputParser()
-    
-    raw = chain.invoke({"question": state["question"]})
+    raw = await chain.ainvoke({"question": state["question"]})
     extracted = _parse_transfer_json(raw)
     
     print_log("1. LLM 송금 정보 추출 (node_extract)", "end", t0, extra_info=f"추출 결과: {extracted}")
@@ -99,6 +90,7 @@ _transfer_extract_graph = None
 def _get_transfer_extract_graph():
     global _transfer_extract_graph
     if _transfer_extract_graph is None:
+        from langgraph.graph import StateGraph, START, END
         builder = StateGraph(TransferExtractState)
         builder.add_node("extract", _node_extract)
         builder.add_edge(START, "extract")
@@ -106,15 +98,15 @@ def _get_transfer_extract_graph():
         _transfer_extract_graph = builder.compile()
     return _transfer_extract_graph
 
-def _invoke_transfer_extract(question: str) -> dict:
+async def _ainvoke_transfer_extract(question: str) -> dict:
     graph = _get_transfer_extract_graph()
-    result = graph.invoke({"question": question})
+    result = await graph.ainvoke({"question": question})
     return result.get("extracted", {"target": None, "amount": None, "currency": None})
 
 # ---------------------------------------------------------
 # [New] LLM 기반 연락처 의미 매칭 함수
 # ---------------------------------------------------------
-def _find_best_match_contact_llm(user_input: str, contacts: List[dict]) -> str | None:
+async def _afind_best_match_contact_llm(user_input: str, contacts: List[dict]) -> str | None:
     """
     단순 문자열 비교 실패 시, LLM을 통해 의미적 매칭을 수행합니다.
     예: user_input="엄마", contacts=[{'contact_name': 'Mother'}] -> returns 'Mother'
@@ -131,13 +123,10 @@ def _find_best_match_contact_llm(user_input: str, contacts: List[dict]) -> str |
         for c in contacts
     ])
 
-    template = read_prompt("transfer_02_contact_match.md")
-    
-    prompt = PromptTemplate.from_template(template)
-    chain = prompt | llm | StrOutputParser()
+    chain = prompt_registry.get_chain("transfer/transfer_02_best_match.md", get_llm())
     
     try:
-        matched_name = chain.invoke({"user_input": user_input, "candidates": candidates_str}).strip()
+        matched_name = (await chain.ainvoke({"user_input": user_input, "candidates": candidates_str})).strip()
         
         # "NONE"이거나 이상한 문자열이 반환될 경우 처리
         if matched_name == "NONE":
@@ -182,14 +171,16 @@ def get_all_contacts(user_id):
     query = f"SELECT contact_name, relationship FROM contacts WHERE user_id = {user_id}"
     return get_data(query)
 
-def resolve_contact_name(user_id, user_input):
+async def aresolve_contact_name(user_id, user_input, contacts=None):
     """
     사용자 입력을 바탕으로 정확한 DB 내 연락처 이름(contact_name)을 찾습니다.
     1. 정확한 이름 매칭
     2. 관계(relationship) 매칭
     3. LLM 의미 기반 매칭 (New)
+    contacts 가 주어지면(미리 조회된 목록) DB 조회를 생략합니다.
     """
-    contacts = get_all_contacts(user_id)
+    if contacts is None:
+        contacts = await asyncio.to_thread(get_all_contacts, user_id)
     if not contacts:
         return None
         
@@ -206,7 +197,7 @@ def resolve_contact_name(user_id, user_input):
     # 2. 2차 시도: LLM을 이용한 의미론적 매칭
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
     print(f"[{now}] 🔀 '{user_input}' 정확한 DB 매칭 실패. LLM 매칭 시도...")
-    matched_name = _find_best_match_contact_llm(user_input_clean, contacts)
+    matched_name = await _afind_best_match_contact_llm(user_input_clean, contacts)
     
     if matched_name:
         return matched_name
@@ -223,6 +214,20 @@ def get_primary_account(user_id):
     result = get_data(query)
     return result[0] if result else None
 
+def preload_transfer_data(username) -> dict:
+    """
+    최초 송금 요청에 필요한 조회 결과(user_id / 연락처 / 주 계좌)를 미리 읽어 둡니다.
+    SELECT 만 수행하므로 메인 에이전트의 추측 실행(prefetch)에 사용해도 안전합니다.
+    """
+    user_id = get_member_id(username)
+    if not user_id:
+        return {}
+    return {
+        "user_id": user_id,
+        "contacts": get_all_contacts(user_id),
+        "account": get_primary_account(user_id),
+    }
+
 def get_user_password(username):
     query = f"SELECT pin_code FROM members WHERE username = '{username}'"
     result = get_data(query)
@@ -250,7 +255,7 @@ def update_balance(account_id, new_balance):
 
 def insert_ledger(
     account_id, contact_id, amount_krw, balance_after,
-    exchange_rate, target_amount, target_currency
+    exchange_rate, target_amount, target_currency, description='송금'
 ):
     query = f"""
     INSERT INTO ledger (
@@ -259,20 +264,24 @@ def insert_ledger(
     )
     VALUES (
         {account_id}, {contact_id}, 'TRANSFER', {-amount_krw}, {balance_after},
-        {exchange_rate}, {target_amount}, '{target_currency}', '송금', '이체'
+        {exchange_rate}, {target_amount}, '{target_currency}', %s, '이체'
     )
     """
-    execute_query(query)
+    execute_query(query, (description,))
 
 # ---------------------------------------------------------
 # 메인 송금 로직
 # ---------------------------------------------------------
 
-def process_transfer(question: str, username: str, context: dict | None = None):
+# DB(PyMySQL) / bcrypt 호출은 동기 API 이므로 asyncio.to_thread 로 워커 스레드에서 실행
+async def aprocess_transfer(question: str, username: str, context: dict | None = None, preload: dict | None = None):
 
     context = context or {}
+    # preload: preload_transfer_data() 결과. 최초 요청의 조회에만 사용하고,
+    # 잔액 차감/원장 기록(PIN 단계)은 항상 DB 를 다시 읽은 값으로 수행
+    preload = preload or {}
 
-    user_id = get_member_id(username)
+    user_id = preload.get("user_id") or await asyncio.to_thread(get_member_id, username)
     if not user_id:
         return {"status": "ERROR", "message": "사용자를 찾을 수 없습니다."}
 
@@ -281,7 +290,7 @@ def process_transfer(question: str, username: str, context: dict | None = None):
     # --------------------------------------------------
     if context.get("awaiting_password"):
         t0_pin = print_log("송금 승인: PIN 검증 및 트랜잭션 실행", "start")
-        stored_pin = get_user_password(username)
+        stored_pin = await asyncio.to_thread(get_user_password, username)
         if not stored_pin:
             return {"status": "ERROR", "message": "사용자 정보를 찾을 수 없습니다."}
 
@@ -289,7 +298,7 @@ def process_transfer(question: str, username: str, context: dict | None = None):
             stored_pin = stored_pin.encode('utf-8')
 
         # 패스워드 검증
-        if bcrypt.checkpw(question.encode('utf-8'), stored_pin) == False:
+        if await asyncio.to_thread(bcrypt.checkpw, question.encode('utf-8'), stored_pin) == False:
             context["password_attempts"] = context.get("password_attempts", 0) + 1
             if context["password_attempts"] >= 5:
                 print_log("송금 승인: PIN 검증", "end", t0_pin, extra_info="PIN 5회 오류로 취소")
@@ -303,20 +312,24 @@ def process_transfer(question: str, username: str, context: dict | None = None):
             }
 
         # 송금 실행 (DB 업데이트)
-        account = get_primary_account(user_id)
-        contact = get_contact(user_id, context["target"]) 
+        account = await asyncio.to_thread(get_primary_account, user_id)
+        contact = await asyncio.to_thread(get_contact, user_id, context["target"]) 
 
         new_balance = float(account["balance"]) - context["amount_krw"]
-        update_balance(account["account_id"], new_balance)
+        await asyncio.to_thread(update_balance, account["account_id"], new_balance)
 
-        insert_ledger(
+        await asyncio.to_thread(
+            insert_ledger,
             account["account_id"],
             contact["contact_id"],
             context["amount_krw"],
             new_balance,
             context["exchange_rate"],
             context["amount"],
-            context["currency"]
+            context["currency"],
+            # current_user_transactions 뷰에는 contact_id 가 없으므로 받는 사람을 적요에 기록
+            # ("엄마 박영자 송금" -> SQL 에이전트 / fast-path 가 관계·이름으로 조회)
+            " ".join(p for p in (contact.get("relationship"), contact["contact_name"], "송금") if p)
         )
 
         print_log("송금 승인: PIN 검증 및 트랜잭션 실행", "end", t0_pin, extra_info=f"송금 완료 / 남은 잔액: {int(new_balance):,}")
@@ -364,7 +377,7 @@ def process_transfer(question: str, username: str, context: dict | None = None):
         t0_hitl = print_log(f"누락된 정보({field}) 보완 처리", "start")
 
         if field == "target":
-            resolved = resolve_contact_name(user_id, question)
+            resolved = await aresolve_contact_name(user_id, question)
             if not resolved:
                 print_log(f"누락된 정보({field}) 보완 처리", "end", t0_hitl, extra_info="연락처 조회 실패")
                 return {
@@ -398,7 +411,7 @@ def process_transfer(question: str, username: str, context: dict | None = None):
     # 4. 최초 요청 (LangGraph 추출)
     # --------------------------------------------------
     if not context.get("target") and not context.get("amount"):
-        info = _invoke_transfer_extract(question)
+        info = await _ainvoke_transfer_extract(question)
         context["target"]   = info.get("target")
         context["amount"]   = info.get("amount")
         context["currency"] = info.get("currency")
@@ -417,7 +430,7 @@ def process_transfer(question: str, username: str, context: dict | None = None):
             "context": context
         }
 
-    resolved = resolve_contact_name(user_id, target)
+    resolved = await aresolve_contact_name(user_id, target, contacts=preload.get("contacts"))
     if not resolved:
         context["missing_field"] = "target"
         return {
@@ -443,11 +456,11 @@ def process_transfer(question: str, username: str, context: dict | None = None):
         currency = "KRW"
 
     # 환율 및 잔액 체크
-    rate = get_exchange_rate(currency)
+    rate = await asyncio.to_thread(get_exchange_rate, currency)
     if rate is None:
         return {"status": "ERROR", "message": f"{currency} 환율 정보를 찾을 수 없습니다."}
 
-    account = get_primary_account(user_id)
+    account = preload.get("account") or await asyncio.to_thread(get_primary_account, user_id)
     if not account:
         return {"status": "ERROR", "message": "주 계좌를 찾을 수 없습니다."}
 
@@ -478,12 +491,12 @@ def process_transfer(question: str, username: str, context: dict | None = None):
 # ---------------------------------------------------------
 # 외부 호출 함수
 # ---------------------------------------------------------
-def get_transfer_answer(question, username, context=None):
+async def aget_transfer_answer(question, username, context=None, preload=None):
     print("\n" + "-"*50)
     total_t0 = print_log("Transfer Agent 상태 머신 파이프라인", "start")
     
     try:
-        result = process_transfer(question, username, context)
+        result = await aprocess_transfer(question, username, context, preload=preload)
         
         print("-" * 50)
         print_log("Transfer Agent 상태 머신 파이프라인", "end", total_t0, extra_info=f"최종 상태: {result.get('status')}")
@@ -497,5 +510,9 @@ def get_transfer_answer(question, username, context=None):
         traceback.print_exc()
         return {"status": "ERROR", "message": f"시스템 오류가 발생했습니다: {e}"}
 
+def get_transfer_answer(question, username, context=None):
+    """aget_transfer_answer 의 동기 래퍼"""
+    return run_sync(aget_transfer_answer(question, username, context))
+
 if __name__ == "__main__":
     print("Transfer Agent with Advanced Matching Ready")
\ No newline at end of file
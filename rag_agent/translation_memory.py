@@ -0,0 +1,147 @@
+import os
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from utils.cache import TTLCache, SQLiteKVStore
+from utils import metrics
+
+# ==========================================
+# 역번역(translate_answer) 번역 메모리
+# ==========================================
+# 키: sha256(목표 언어 + 한국어 원문)
+# 1차: 프로세스 내 LRU / 2차: SQLite (여러 워커 프로세스 공유)
+# main_05_re_translation.md 내용의 해시를 버전 tag 로 저장해, 프롬프트가 바뀌면 기존 번역은 자동으로 무시되고
+# invalidate() 로 일괄 삭제할 수 있습니다.
+# 개인 데이터가 담긴 답변(DATABASE 잔액/거래, TRANSFER 송금 메시지)은 사용자 간 공유되는 디스크에 남기지 않고,
+# 나머지 항목도 TRANSLATION_MEMORY_TTL 후 만료 / TRANSLATION_MEMORY_MAX_ROWS 초과 시 오래된 것부터 삭제합니다.
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+PROMPT_NAME = "main/main_05_re_translation.md"
+DB_PATH = Path(os.getenv("TRANSLATION_MEMORY_PATH", str(PROJECT_ROOT / "data" / "cache" / "translation_memory.sqlite3")))
+
+TRANSLATION_MEMORY_ENABLED = os.getenv("TRANSLATION_MEMORY", "true").strip().lower() not in ("0", "false", "no")
+MEMORY_MAXSIZE = int(os.getenv("TRANSLATION_MEMORY_MAXSIZE", "5000"))
+TRANSLATION_MEMORY_TTL = float(os.getenv("TRANSLATION_MEMORY_TTL", str(7 * 24 * 60 * 60)))
+TRANSLATION_MEMORY_MAX_ROWS = int(os.getenv("TRANSLATION_MEMORY_MAX_ROWS", "20000"))
+# 이 횟수만큼 저장할 때마다 디스크 정리 (만료 항목 + 행 수 상한)
+TRIM_EVERY = 500
+
+# 사용자 개인 데이터가 답변에 포함되는 카테고리 -> 저장하지 않음
+PERSONAL_CATEGORIES = ("DATABASE", "TRANSFER")
+
+_memory = TTLCache(maxsize=MEMORY_MAXSIZE, ttl=TRANSLATION_MEMORY_TTL)
+_store = None
+_store_lock = threading.Lock()
+_stores_since_trim = 0
+
+def _log(icon: str, msg: str):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] {icon} [Translation Memory] {msg}")
+
+def _get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store_ = SQLiteKVStore(DB_PATH, table="translations")
+                store_.trim(TRANSLATION_MEMORY_MAX_ROWS)
+                _store = store_
+    return _store
+
+def prompt_version() -> str:
+    """재번역 프롬프트 내용 해시 (프롬프트 레지스트리가 파일 mtime 이 바뀔 때만 다시 계산)"""
+    from rag_agent import prompt_registry
+    return prompt_registry.get_hash(PROMPT_NAME)
+
+def _make_key(korean_text: str, target_language: str) -> str:
+    raw = f"{target_language.strip().lower()}\n{korean_text}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def lookup(korean_text: str, target_language: str) -> str | None:
+    if not TRANSLATION_MEMORY_ENABLED:
+        return None
+    version = prompt_version()
+    key = _make_key(korean_text, target_language)
+
+    translated = _memory.get((version, key))
+    if translated is not None:
+        metrics.incr("translation_memory.hit.memory")
+        return translated
+
+    try:
+        translated = _get_store().get(key, tag=version)
+    except Exception as e:
+        _log("⚠️", f"디스크 조회 실패: {e}")
+        translated = None
+
+    if translated is not None:
+        _memory.set((version, key), translated)
+        metrics.incr("translation_memory.hit.disk")
+        return translated
+
+    metrics.incr("translation_memory.miss")
+    return None
+
+def is_storable(category: str = None) -> bool:
+    return (category or "").strip().upper() not in PERSONAL_CATEGORIES
+
+def store(korean_text: str, target_language: str, translated: str, category: str = None):
+    global _stores_since_trim
+    if not TRANSLATION_MEMORY_ENABLED or not translated:
+        return
+    if not is_storable(category):
+        metrics.incr("translation_memory.skipped_personal")
+        return
+    version = prompt_version()
+    key = _make_key(korean_text, target_language)
+    _memory.set((version, key), translated)
+    try:
+        store_ = _get_store()
+        store_.set(key, translated, tag=version, ttl=TRANSLATION_MEMORY_TTL)
+        with _store_lock:
+            _stores_since_trim += 1
+            trim = _stores_since_trim >= TRIM_EVERY
+            if trim:
+                _stores_since_trim = 0
+        if trim:
+            store_.trim(TRANSLATION_MEMORY_MAX_ROWS)
+    except Exception as e:
+        _log("⚠️", f"디스크 저장 실패: {e}")
+
+def invalidate(all_entries: bool = False) -> int:
+    """현재 프롬프트 버전과 다른 번역(또는 전체)을 삭제하고 삭제 건수를 반환"""
+    _memory.clear()
+    store_ = _get_store()
+    if all_entries:
+        return store_.clear()
+    return store_.purge(keep_tag=prompt_version())
+
+def get_translation_memory_stats() -> dict:
+    memory_hits = metrics.get_counter("translation_memory.hit.memory")
+    disk_hits = metrics.get_counter("translation_memory.hit.disk")
+    misses = metrics.get_counter("translation_memory.miss")
+    lookups = memory_hits + disk_hits + misses
+    try:
+        disk_size = _get_store().count()
+    except Exception:
+        disk_size = None
+    return {
+        "prompt_version": prompt_version(),
+        "memory_hits": memory_hits,
+        "disk_hits": disk_hits,
+        "misses": misses,
+        "hit_rate": ((memory_hits + disk_hits) / lookups) if lookups else 0.0,
+        "memory_size": len(_memory),
+        "disk_size": disk_size,
+        "skipped_personal": metrics.get_counter("translation_memory.skipped_personal"),
+    }
+
+if __name__ == "__main__":
+    import sys
+    if "--invalidate" in sys.argv:
+        deleted = invalidate(all_entries="--all" in sys.argv)
+        print(f"🧹 번역 메모리 무효화 완료: {deleted}건 삭제 (현재 프롬프트 버전: {prompt_version()})")
+    print(get_translation_memory_stats())
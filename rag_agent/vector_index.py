@@ -0,0 +1,89 @@
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+
+# ==========================================
+# 메모리 매핑(mmap) 벡터 색인 (Chroma 대체 백엔드)
+# ==========================================
+# utils/export_vector_index.py 로 Chroma 컬렉션을 내보낸 파일을 읽어 brute-force 정확 top-k 검색을 합니다.
+#   <dir>/vectors.npy   float16 또는 int8 (행 = 문서)
+#   <dir>/scales.npy    int8 일 때 행별 역양자화 배율 (float32)
+#   <dir>/sqnorms.npy   행별 ||v||^2 (역양자화 기준, float32)
+#   <dir>/meta.json     모델명 / dtype / ids / documents / metadatas / 원천 Chroma manifest 해시
+# 행렬은 np.load(mmap_mode="r") 로 열기 때문에 여러 Streamlit 워커가 OS 페이지 캐시를 공유합니다.
+# 거리는 Chroma "l2" 공간과 같은 squared L2 이므로 SIMILARITY_THRESHOLD 를 그대로 사용할 수 있습니다.
+
+# 행렬 곱을 나눠서 계산 (float16 -> float32 임시 복사본 크기 제한)
+SEARCH_CHUNK_ROWS = 2048
+
+def squared_l2(matrix, scales, sqnorms, queries) -> np.ndarray:
+    """
+    모든 행과 질의의 squared L2 거리: ||v||^2 + ||q||^2 - 2 * s * (m . q)
+    queries 가 1차원이면 (행 수,), 2차원(질의 여러 개)이면 (질의 수, 행 수) 반환
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    single = queries.ndim == 1
+    queries = np.atleast_2d(queries)
+    dots = np.empty((queries.shape[0], matrix.shape[0]), dtype=np.float32)
+    for start in range(0, matrix.shape[0], SEARCH_CHUNK_ROWS):
+        block = matrix[start:start + SEARCH_CHUNK_ROWS]
+        dots[:, start:start + len(block)] = queries @ block.astype(np.float32).T
+    if scales is not None:
+        dots *= scales
+    dist = sqnorms + np.einsum("ij,ij->i", queries, queries)[:, None] - 2.0 * dots
+    dist = np.maximum(dist, 0.0)
+    return dist[0] if single else dist
+
+class MmapVectorIndex:
+    """Chroma 와 같은 호출 형태(similarity_search_with_score, get)를 제공하는 읽기 전용 색인"""
+
+    def __init__(self, index_dir, embedding_function):
+        index_dir = Path(index_dir)
+        t0 = time.perf_counter()
+        with open(index_dir / "meta.json", "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.matrix = np.load(index_dir / "vectors.npy", mmap_mode="r")
+        self.sqnorms = np.load(index_dir / "sqnorms.npy")
+        self.scales = np.load(index_dir / "scales.npy") if self.meta["dtype"] == "int8" else None
+        self.embedding_function = embedding_function
+        self.ids = self.meta["ids"]
+        self.documents = self.meta["documents"]
+        self.metadatas = self.meta["metadatas"]
+        if self.matrix.shape[0] != len(self.ids):
+            raise ValueError(f"vectors.npy 행 수({self.matrix.shape[0]})와 meta.json 문서 수({len(self.ids)}) 불일치")
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        print(f"[{now}] ✅ [Vector Index] {index_dir} 로드 ({len(self.ids)}개 x {self.matrix.shape[1]}차원, "
+              f"{self.meta['dtype']}, 소요시간: {time.perf_counter() - t0:.3f}초)", flush=True)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _top_k(self, dist: np.ndarray, k: int) -> list:
+        k = min(k, len(dist))
+        if k <= 0:
+            return []
+        top = np.argpartition(dist, k - 1)[:k]
+        top = top[np.argsort(dist[top])]
+        return [(Document(page_content=self.documents[i], metadata=dict(self.metadatas[i] or {})),
+                 float(dist[i])) for i in top]
+
+    def similarity_search_by_vector_with_score(self, embedding, k: int = 4) -> list:
+        return self._top_k(squared_l2(self.matrix, self.scales, self.sqnorms, embedding), k)
+
+    def similarity_search_by_vectors_with_score(self, embeddings: list, k: int = 4) -> list:
+        """질의 여러 개를 행렬 곱 한 번으로 검색. 질의 순서대로 [(doc, score), ...] 목록 반환"""
+        if not len(embeddings):
+            return []
+        dist = squared_l2(self.matrix, self.scales, self.sqnorms, embeddings)
+        return [self._top_k(row, k) for row in dist]
+
+    def similarity_search_with_score(self, query: str, k: int = 4) -> list:
+        return self.similarity_search_by_vector_with_score(self.embedding_function.embed_query(query), k=k)
+
+    def get(self, include: list = None) -> dict:
+        """Chroma.get 과 같은 형태 (term_index 구성용)"""
+        return {"ids": list(self.ids), "documents": list(self.documents), "metadatas": list(self.metadatas)}
@@ -0,0 +1,181 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+from utils.cache import TTLCache, SQLiteKVStore
+from utils import metrics
+
+# ==========================================
+# 웹 검색(Tavily + 답변 생성) 결과 캐시
+# ==========================================
+# 키: 정규화된 검색 질의 (main_agent / finrag_agent 의 WebSearchRAG 가 공유)
+# - 신선도 등급별 TTL: quote(시세/가격) 짧게, news(뉴스/전망) 중간, general(방법/개념) 길게
+# - 인메모리 TTLCache + SQLite (프로세스 재시작/워커 간 공유)
+# - Tavily 오류/타임아웃 시 만료된(stale) 항목이라도 WEB_CACHE_STALE_MAX 이내면 시각을 밝혀서 제공
+# - tag: 답변 프롬프트 해시 -> 프롬프트가 바뀌면 정상 조회에서는 제외 (stale 폴백에는 사용)
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+DB_PATH = Path(os.getenv("WEB_CACHE_PATH", str(PROJECT_ROOT / "data" / "cache" / "web_search.sqlite3")))
+
+WEB_CACHE_ENABLED = os.getenv("WEB_CACHE", "true").strip().lower() not in ("0", "false", "no")
+WEB_CACHE_MAXSIZE = int(os.getenv("WEB_CACHE_MAXSIZE", "1000"))
+# 오류 시 stale 항목을 제공할 수 있는 최대 경과 시간(초), 이보다 오래된 항목은 주기적으로 삭제
+WEB_CACHE_STALE_MAX = float(os.getenv("WEB_CACHE_STALE_MAX", str(3 * 24 * 60 * 60)))
+
+ANSWER_PROMPT = "web_search/web_search_01_response.md"
+
+# 신선도 등급별 TTL (초)
+FRESHNESS_TTL = {
+    "quote": float(os.getenv("WEB_CACHE_TTL_QUOTE", "60")),
+    "news": float(os.getenv("WEB_CACHE_TTL_NEWS", str(15 * 60))),
+    "general": float(os.getenv("WEB_CACHE_TTL_GENERAL", str(24 * 60 * 60))),
+}
+# 앞 등급부터 검사 (시세 키워드가 있으면 뉴스 키워드가 같이 있어도 quote)
+FRESHNESS_KEYWORDS = {
+    "quote": ["주가", "시세", "환율", "가격", "얼마", "현재가", "지수", "비트코인", "금값", "유가", "금리",
+              "종가", "시가", "등락"],
+    # 지수/시장 이름만 있는 질문(예: "코스피 전망")은 뉴스성으로 취급
+    "news": ["뉴스", "속보", "전망", "오늘", "최신", "현재", "지금", "이번", "발표", "이슈", "동향", "어제",
+             "코스피", "코스닥", "나스닥", "다우", "증시"],
+}
+
+# 캐시하지 않는 답변 (검색 결과 없음 / 오류)
+_NO_CACHE_ANSWERS = ("검색 결과가 없습니다.", "죄송합니다. 웹 검색 중 오류가 발생했습니다.")
+
+_memory = TTLCache(maxsize=WEB_CACHE_MAXSIZE)
+_store = None
+_store_lock = threading.Lock()
+
+def _log(icon: str, msg: str):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"[{now}] {icon} [Web Cache] {msg}", flush=True)
+
+def _get_store() -> SQLiteKVStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = SQLiteKVStore(DB_PATH, table="web_search")
+                # 시작 시 한 번 오래된 항목 정리
+                store.purge(older_than=WEB_CACHE_STALE_MAX)
+                _store = store
+    return _store
+
+def normalize_query(query: str) -> str:
+    """유니코드/공백/문장부호/대소문자 차이를 무시한 캐시 키용 정규화"""
+    text = unicodedata.normalize("NFC", query or "")
+    return re.sub(r"[\s\?\!\.,~\"'`]+", "", text).lower()
+
+def freshness_class(query: str) -> str:
+    text = normalize_query(query)
+    for klass, keywords in FRESHNESS_KEYWORDS.items():
+        if any(kw in text for kw in keywords):
+            return klass
+    return "general"
+
+def make_key(query: str) -> str:
+    return hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+
+def _prompt_version() -> str:
+    from rag_agent import prompt_registry
+    return prompt_registry.get_hash(ANSWER_PROMPT)
+
+def lookup(query: str) -> dict | None:
+    """TTL 이내의 캐시 결과 ({"answer", "sources", "source_type", "cached_at"}) 또는 None"""
+    if not WEB_CACHE_ENABLED:
+        return None
+    klass = freshness_class(query)
+    version = _prompt_version()
+    key = make_key(query)
+
+    result = _memory.get((version, key))
+    if result is None:
+        try:
+            raw = _get_store().get(key, tag=version)
+        except Exception as e:
+            _log("⚠️", f"조회 실패: {e}")
+            raw = None
+        if raw is not None:
+            result = json.loads(raw)
+            # 디스크 항목의 남은 TTL 만큼만 메모리에 보관
+            remaining = result["expires_at"] - datetime.now().timestamp()
+            if remaining > 0:
+                _memory.set((version, key), result, ttl=remaining)
+            else:
+                result = None
+    metrics.incr(f"web_cache.{'hit' if result is not None else 'miss'}.{klass}")
+    return result
+
+def lookup_stale(query: str) -> dict | None:
+    """
+    검색 실패 시 폴백: 만료됐거나 이전 프롬프트 버전의 항목이라도 WEB_CACHE_STALE_MAX 이내면 반환
+    반환 항목에는 stale=True 와 캐시 시각(cached_at)이 포함됩니다.
+    """
+    if not WEB_CACHE_ENABLED:
+        return None
+    try:
+        entry = _get_store().get_entry(make_key(query))
+    except Exception as e:
+        _log("⚠️", f"stale 조회 실패: {e}")
+        return None
+    if entry is None or datetime.now().timestamp() - entry["created_at"] > WEB_CACHE_STALE_MAX:
+        return None
+    result = json.loads(entry["value"])
+    result["stale"] = True
+    metrics.incr(f"web_cache.stale_served.{freshness_class(query)}")
+    return result
+
+def store(query: str, result: dict) -> bool:
+    if not WEB_CACHE_ENABLED:
+        return False
+    answer = result.get("answer")
+    if not isinstance(answer, str) or not answer.strip() or answer in _NO_CACHE_ANSWERS:
+        return False
+    if result.get("source_type") != "Web Search":
+        return False
+
+    klass = freshness_class(query)
+    ttl = FRESHNESS_TTL[klass]
+    now = datetime.now()
+    entry = {
+        "answer": answer,
+        "sources": result.get("sources", []),
+        "source_type": result.get("source_type"),
+        "freshness": klass,
+        "cached_at": now.isoformat(timespec="seconds"),
+        "expires_at": now.timestamp() + ttl,
+    }
+    version = _prompt_version()
+    key = make_key(query)
+    _memory.set((version, key), entry, ttl=ttl)
+    try:
+        _get_store().set(key, json.dumps(entry, ensure_ascii=False), tag=version, ttl=ttl)
+    except Exception as e:
+        _log("⚠️", f"저장 실패: {e}")
+    metrics.incr(f"web_cache.store.{klass}")
+    return True
+
+def clear():
+    _memory.clear()
+
+def get_web_cache_stats() -> dict:
+    """신선도 등급별 적중률 / stale 제공 횟수"""
+    stats = {"memory": _memory.stats()}
+    for klass in FRESHNESS_TTL:
+        hits = metrics.get_counter(f"web_cache.hit.{klass}")
+        misses = metrics.get_counter(f"web_cache.miss.{klass}")
+        stats[klass] = {
+            "ttl": FRESHNESS_TTL[klass],
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / (hits + misses)) if (hits + misses) else 0.0,
+            "stale_served": metrics.get_counter(f"web_cache.stale_served.{klass}"),
+            "stores": metrics.get_counter(f"web_cache.store.{klass}"),
+        }
+    return stats
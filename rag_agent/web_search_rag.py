@@ -1,20 +1,45 @@
 import os
 import time
+import asyncio
+import threading
 from datetime import datetime
-from pathlib import Path
 from typing import TypedDict
 from dotenv import load_dotenv
-from tavily import TavilyClient
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langgraph.graph import StateGraph, START, END
+from utils.async_runner import run_sync
+from utils.singleflight import AsyncSingleFlight
+from utils import metrics, resilience
+from rag_agent import prompt_registry, web_search_cache, context_compressor
 
 load_dotenv()
 
+# Tavily 검색 전체 마감 시간(초, 헤지 요청 포함). 초과 시 캐시(stale 포함)로 폴백
+WEB_SEARCH_TIMEOUT = float(os.getenv("WEB_SEARCH_TIMEOUT", "8"))
+# 헤지: 첫 요청이 최근 p95 지연시간 안에 끝나지 않으면 같은 검색을 한 번 더 보내 먼저 온 결과 사용
+WEB_SEARCH_HEDGE = os.getenv("WEB_SEARCH_HEDGE", "true").strip().lower() not in ("0", "false", "no")
+WEB_SEARCH_HEDGE_DEFAULT_DELAY = float(os.getenv("WEB_SEARCH_HEDGE_DEFAULT_DELAY", "2.0"))   # 샘플 부족 시
+WEB_SEARCH_HEDGE_MIN_DELAY = float(os.getenv("WEB_SEARCH_HEDGE_MIN_DELAY", "0.3"))
+# 서킷 브레이커: 연속 실패 N회 -> 일정 시간 동안 Tavily 호출 없이 캐시 / "검색 불가" 답변
+WEB_SEARCH_BREAKER_FAILURES = int(os.getenv("WEB_SEARCH_BREAKER_FAILURES", "5"))
+WEB_SEARCH_BREAKER_RESET = float(os.getenv("WEB_SEARCH_BREAKER_RESET", "30"))
+
+LATENCY_METRIC = "web_search.tavily.latency"            # 개별 요청 (성공) 지연시간 -> 헤지 지연 계산
+CALL_LATENCY_METRIC = "web_search.tavily.call_latency"  # 헤지 포함 호출 전체 지연시간
+
+# 답변 프롬프트에 넣을 검색 결과(content) 토큰 예산 (context_compressor)
+WEB_CONTEXT_TOKEN_BUDGET = int(os.getenv("WEB_CONTEXT_TOKEN_BUDGET", "1200"))
+
+SEARCH_UNAVAILABLE_ANSWER = "죄송합니다. 지금은 웹 검색을 사용할 수 없습니다. 잠시 후 다시 시도해주세요."
+
 # LLM 설정 (일관성을 위해 ChatOpenAI 사용)
-llm = ChatOpenAI(model="gpt-5-mini")
+llm = None
+
+def get_llm():
+    global llm
+    if llm is None:
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(model="gpt-5-mini")
+    return llm
 
 def print_log(step_name: str, status: str, start_time: float = None, extra_info: str = None):
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
@@ -34,22 +59,6 @@ def print_log(step_name: str, status: str, start_time: float = None, extra_info:
         print(log_msg, flush=True) 
         return elapsed
 
-# ---------------------------------------------------------
-# 프롬프트
-# ---------------------------------------------------------
-CURRENT_DIR = Path(__file__).resolve().parent
-PROMPT_DIR = CURRENT_DIR / "prompt" / "web_search"
-
-def read_prompt(filename: str) -> str:
-    file_path = PROMPT_DIR / filename
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        print(f"[{now}] ❌ [Error] 프롬프트 파일을 찾을 수 없습니다: {file_path}")
-        return ""
-
 # ---------------------------------------------------------
 # [LangGraph] 웹 검색 상태
 # ---------------------------------------------------------
@@ -62,18 +71,18 @@ class WebSearchState(TypedDict, total=False):
 # ---------------------------------------------------------
 # [LangGraph] 노드
 # ---------------------------------------------------------
-def node_answer(state: WebSearchState) -> dict:
+async def node_answer(state: WebSearchState) -> dict:
     t0 = print_log("Web Search: LLM 기반 최종 답변 생성 (node_answer)", "start")
-    template = read_prompt("web_search_01_response.md")
-    prompt = PromptTemplate.from_template(template)
-    chain = prompt | llm | StrOutputParser()
-    answer = chain.invoke({"question": state["question"], "context": state.get("context", "")})
+    # "final_answer" 태그: 메인 에이전트 스트리밍(stream_fintech_agent)에서 토큰을 화면으로 전달
+    chain = prompt_registry.get_chain("web_search/web_search_01_response.md", get_llm(), tags=["final_answer"])
+    answer = await chain.ainvoke({"question": state["question"], "context": state.get("context", "")})
     print_log("Web Search: LLM 기반 최종 답변 생성 (node_answer)", "end", t0)
     return {"answer": answer}
 
 # 그래프: search 결과가 이미 state에 있으므로, answer 노드만 있으면 됨.
 # 검색은 클래스 내부에서 하고, context/sources를 state에 넣은 뒤 그래프 호출
 def _build_web_search_graph():
+    from langgraph.graph import StateGraph, START, END
     builder = StateGraph(WebSearchState)
     builder.add_node("answer", node_answer)
     builder.add_edge(START, "answer")
@@ -82,6 +91,33 @@ def _build_web_search_graph():
 
 _web_search_graph = None
 
+def build_web_context(query, results, compress=True):
+    """
+    Tavily 결과 -> (답변 프롬프트 컨텍스트, 출처 목록)
+    content 는 질의 관련 문장만 WEB_CONTEXT_TOKEN_BUDGET 이내로 압축하고 [Source N] 번호는 원래 순서를 유지
+    """
+    sources = []
+    items = []
+    for result in results:
+        title = result.get("title", "No Title")
+        url = result.get("url", "#")
+        sources.append({"title": title, "url": url})
+        items.append({"title": title, "url": url, "content": result.get("content", "")})
+    if compress:
+        items = context_compressor.compress(query, items, WEB_CONTEXT_TOKEN_BUDGET, name="web_search")["sources"]
+
+    context_parts = []
+    for i, item in enumerate(items, 1):
+        if not item["content"]:
+            continue
+        context_parts.append(f"=== [Source {i}] {item['title']} ===\nURL: {item['url']}\nContent: {item['content']}\n")
+    return "\n".join(context_parts), sources
+
+# 모든 WebSearchRAG 인스턴스(main_agent / finrag_agent)가 공유하는 동시 요청 병합기 / 서킷 브레이커
+_web_flight = AsyncSingleFlight()
+_tavily_breaker = resilience.CircuitBreaker("tavily", failure_threshold=WEB_SEARCH_BREAKER_FAILURES,
+                                            reset_timeout=WEB_SEARCH_BREAKER_RESET)
+
 def _get_web_search_graph():
     global _web_search_graph
     if _web_search_graph is None:
@@ -97,58 +133,168 @@ class WebSearchRAG:
         if not tavily_api_key:
             now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
             print(f"[{now}] ⚠️ [Warning] TAVILY_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+        from tavily import TavilyClient
+        try:
+            from tavily import AsyncTavilyClient
+        except ImportError:  # 구버전 tavily: 동기 클라이언트를 워커 스레드에서 실행
+            AsyncTavilyClient = None
         self.tavily = TavilyClient(api_key=tavily_api_key)
+        # 프로세스 공유 이벤트 루프에서 재사용되는 비동기 HTTP 클라이언트
+        self.atavily = AsyncTavilyClient(api_key=tavily_api_key) if AsyncTavilyClient else None
 
-    def web_search(self, query):
-        """실시간 웹 검색 및 답변 생성 (LangGraph)"""
+    async def _asearch_once(self, query):
+        t0 = time.perf_counter()
+        if self.atavily is not None:
+            result = await self.atavily.search(query, max_results=3)
+        else:
+            result = await asyncio.to_thread(self.tavily.search, query, max_results=3)
+        metrics.observe(LATENCY_METRIC, time.perf_counter() - t0)
+        return result
+
+    async def _asearch(self, query):
+        """마감 시간 + 헤지 요청 + 서킷 브레이커 (open 이면 즉시 CircuitOpenError)"""
+        if not _tavily_breaker.allow():
+            raise resilience.CircuitOpenError("Tavily 서킷 open")
+        t0 = time.perf_counter()
+        try:
+            if WEB_SEARCH_HEDGE:
+                delay = resilience.hedge_delay_from(LATENCY_METRIC, WEB_SEARCH_HEDGE_DEFAULT_DELAY,
+                                                    WEB_SEARCH_HEDGE_MIN_DELAY)
+                search = resilience.hedged(lambda: self._asearch_once(query), delay, name="web_search.tavily")
+            else:
+                search = self._asearch_once(query)
+            result = await asyncio.wait_for(search, timeout=WEB_SEARCH_TIMEOUT)
+        except Exception:
+            _tavily_breaker.record_failure()
+            metrics.incr("web_search.tavily.failure")
+            raise
+        except BaseException:
+            # 요청 취소(CancelledError) 등은 실패로 세지 않되, half_open 시험 슬롯이 묶이지 않도록 반환
+            _tavily_breaker.release()
+            raise
+        _tavily_breaker.record_success()
+        metrics.observe(CALL_LATENCY_METRIC, time.perf_counter() - t0)
+        return result
+
+    async def aweb_search(self, query):
+        """실시간 웹 검색 및 답변 생성 (LangGraph, 비동기)"""
         print("\n" + "-"*50)
         total_t0 = print_log("Web Search RAG 파이프라인", "start", extra_info=f"검색 쿼리: '{query}'")
-        
+
+        # 0. 캐시 조회 (신선도 등급별 TTL, SQLite 디스크 계층은 스레드에서 조회)
+        cached = await asyncio.to_thread(web_search_cache.lookup, query)
+        if cached is not None:
+            print_log("Web Search RAG 파이프라인", "end", total_t0,
+                      extra_info=f"캐시 적중 ({cached['freshness']}, {cached['cached_at']} 검색 결과)")
+            print("-" * 50 + "\n")
+            return {"answer": cached["answer"], "sources": cached["sources"], "source_type": cached["source_type"]}
+
+        # 같은(정규화) 질의가 이미 진행 중이면 그 검색 + 답변 생성 결과를 함께 기다림 (프로세스 전체 공유)
+        result, shared = await _web_flight.do(web_search_cache.normalize_query(query),
+                                              lambda: self._asearch_and_answer(query))
+        metrics.incr("web_search.coalesced" if shared else "web_search.executed")
+        if shared:
+            result = dict(result)
+            extra = "진행 중이던 동일 질의의 결과 공유 (single-flight)"
+        elif result["source_type"] != "Web Search":
+            extra = f"검색 실패 -> {result['source_type']}"
+        else:
+            extra = "검색 결과 없음" if not result["sources"] else "검색 및 답변 생성 완료"
+        print_log("Web Search RAG 파이프라인", "end", total_t0, extra_info=extra)
+        print("-" * 50 + "\n")
+        return result
+
+    async def _asearch_and_answer(self, query):
         try:
             # 1. Tavily API 웹 검색
             t0_search = print_log("Tavily API 웹 검색", "start")
-            search_results = self.tavily.search(query, max_results=3)
+            search_results = await self._asearch(query)
             
-            context_parts = []
-            sources = []
-            for i, result in enumerate(search_results.get("results", []), 1):
-                title = result.get("title", "No Title")
-                url = result.get("url", "#")
-                content = result.get("content", "")
-                context_parts.append(f"=== [Source {i}] {title} ===\nURL: {url}\nContent: {content}\n")
-                sources.append({"title": title, "url": url})
-            context_str = "\n".join(context_parts)
+            context_str, sources = build_web_context(query, search_results.get("results", []))
 
             print_log("Tavily API 웹 검색", "end", t0_search, extra_info=f"가져온 소스 개수: {len(sources)}개")
 
             if not context_str:
-                print_log("Web Search RAG 파이프라인", "end", total_t0, extra_info="검색 결과 없음")
-                print("-" * 50 + "\n")
                 return {"answer": "검색 결과가 없습니다.", "sources": [], "source_type": "Web Search"}
 
             # 2. LangGraph를 통한 답변 생성
             graph = _get_web_search_graph()
-            result_state = graph.invoke({"question": query, "context": context_str, "sources": sources})
+            result_state = await graph.ainvoke({"question": query, "context": context_str, "sources": sources})
             answer = result_state.get("answer", "답변 생성 실패")
 
-            print_log("Web Search RAG 파이프라인", "end", total_t0, extra_info="검색 및 답변 생성 완료")
-            print("-" * 50 + "\n")
-            
-            return {
+            result = {
                 "answer": answer,
                 "sources": sources,
                 "source_type": "Web Search",
             }
+            await asyncio.to_thread(web_search_cache.store, query, result)
+            return result
         except Exception as e:
             now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            print(f"[{now}] ❌ [Web Search Error]: {e}")
-            print("-" * 50 + "\n")
+            if isinstance(e, asyncio.TimeoutError):
+                reason = f"{WEB_SEARCH_TIMEOUT}초 타임아웃"
+            elif isinstance(e, resilience.CircuitOpenError):
+                reason = f"서킷 open - 호출 생략 ({_tavily_breaker.stats()['retry_in_sec']:.0f}초 후 재시도)"
+            else:
+                reason = e
+            print(f"[{now}] ❌ [Web Search Error]: {reason}")
+
+            # 검색 실패 시 만료된 캐시라도 검색 시각을 밝혀서 제공
+            stale = await asyncio.to_thread(web_search_cache.lookup_stale, query)
+            if stale is not None:
+                print(f"[{now}] ♻️ [Web Search] 이전 검색 결과로 대체 ({stale['cached_at']})")
+                cached_at = stale["cached_at"].replace("T", " ")[:16]
+                return {
+                    "answer": f"{stale['answer']}\n\n※ 실시간 검색이 원활하지 않아 {cached_at} 기준 검색 결과로 답변했어요.",
+                    "sources": stale["sources"],
+                    "source_type": "Web Search (Cached)",
+                }
+            if isinstance(e, resilience.CircuitOpenError):
+                return {"answer": SEARCH_UNAVAILABLE_ANSWER, "sources": [], "source_type": "Unavailable"}
             return {
                 "answer": "죄송합니다. 웹 검색 중 오류가 발생했습니다.",
                 "sources": [],
                 "source_type": "Error",
             }
 
+    def web_search(self, query):
+        """aweb_search 의 동기 래퍼"""
+        return run_sync(self.aweb_search(query))
+
+_web_rag = None
+_web_rag_lock = threading.Lock()
+
+def get_web_rag() -> WebSearchRAG:
+    """프로세스 공유 WebSearchRAG (첫 웹 검색 시 Tavily 클라이언트 생성)"""
+    global _web_rag
+    if _web_rag is None:
+        with _web_rag_lock:
+            if _web_rag is None:
+                _web_rag = WebSearchRAG()
+    return _web_rag
+
+def get_web_search_stats() -> dict:
+    """동시 요청 병합(single-flight) / 서킷 브레이커 / Tavily 지연시간 분포 / 결과 캐시 통계"""
+    executed = metrics.get_counter("web_search.executed")
+    coalesced = metrics.get_counter("web_search.coalesced")
+    return {
+        "executed": executed,
+        "coalesced": coalesced,
+        "coalesce_rate": (coalesced / (executed + coalesced)) if (executed + coalesced) else 0.0,
+        "in_flight": _web_flight.stats()["in_flight"],
+        "breaker": _tavily_breaker.stats(),
+        "tavily": {
+            "failures": metrics.get_counter("web_search.tavily.failure"),
+            "hedged": metrics.get_counter("web_search.tavily.hedged"),
+            "hedge_won": metrics.get_counter("web_search.tavily.hedge_won"),
+            "request_latency": metrics.summarize(LATENCY_METRIC),
+            "request_histogram": metrics.histogram(LATENCY_METRIC),
+            "call_latency": metrics.summarize(CALL_LATENCY_METRIC),
+            "call_histogram": metrics.histogram(CALL_LATENCY_METRIC),
+        },
+        "cache": web_search_cache.get_web_cache_stats(),
+    }
+
 # --- 테스트 코드 ---
 if __name__ == "__main__":
     rag = WebSearchRAG()
@@ -0,0 +1,39 @@
+import time
+
+import pytest
+
+from rag_agent import answer_cache
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    answer_cache.clear()
+    yield
+    answer_cache.clear()
+
+def _expires_in(query, category, language="Korean"):
+    key = (answer_cache.normalize_query(query), category, language)
+    _, expires_at = answer_cache._cache._data[key]
+    return expires_at - time.time()
+
+def test_personal_categories_are_never_cached():
+    for category in ("DATABASE", "TRANSFER"):
+        assert not answer_cache.store("내 잔액", category, "Korean", "100원", "100원")
+        assert answer_cache.lookup("내 잔액", category, "Korean")["entry"] is None
+
+def test_web_derived_knowledge_uses_web_ttl():
+    assert answer_cache.store("ETF 뜻", "KNOWLEDGE", "Korean", "답", "답", answer_source="web")
+    assert _expires_in("ETF 뜻", "KNOWLEDGE") <= answer_cache.CATEGORY_TTL["WEB SEARCH"]
+    # 키는 라우팅 카테고리 기준 -> 조회 시점에 출처를 몰라도 적중
+    assert answer_cache.lookup("ETF 뜻?", "KNOWLEDGE", "Korean")["entry"]["korean_answer"] == "답"
+
+def test_term_dictionary_answer_uses_knowledge_ttl():
+    answer_cache.store("PER 뜻", "KNOWLEDGE", "Korean", "답", "답", answer_source="db")
+    assert _expires_in("PER 뜻", "KNOWLEDGE") > answer_cache.CATEGORY_TTL["WEB SEARCH"]
+
+def test_error_answers_are_not_cached():
+    assert not answer_cache.store("안녕", "GENERAL", "Korean", "죄송합니다. 답변 생성 중 오류가 발생했습니다.", "x")
+
+def test_language_is_part_of_the_key():
+    answer_cache.store("안녕", "GENERAL", "English", "안녕하세요", "Hello")
+    assert answer_cache.lookup("안녕", "GENERAL", "Korean")["entry"] is None
+    assert answer_cache.lookup("안녕", "GENERAL", "English")["entry"]["final_answer"] == "Hello"
@@ -0,0 +1,42 @@
+import time
+
+from utils.cache import TTLCache, SQLiteKVStore
+
+def test_ttl_cache_lru_and_expiry():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)           # b 가 가장 오래 사용되지 않음
+    assert "b" not in cache and cache.get("a") == 1
+    cache.set("d", 4, ttl=-1)
+    assert cache.get("d") is None
+    assert cache.stats()["evictions"] >= 1
+
+def test_sqlite_store_tag_and_ttl(tmp_path):
+    store = SQLiteKVStore(tmp_path / "kv.sqlite3", table="t")
+    store.set("k", "v", tag="v1")
+    assert store.get("k", tag="v1") == "v"
+    assert store.get("k", tag="v2") is None
+    store.set("old", "x", ttl=-1)
+    assert store.get("old") is None
+    assert store.get_entry("old")["expired"]
+
+def test_sqlite_store_clear(tmp_path):
+    store = SQLiteKVStore(tmp_path / "kv.sqlite3", table="t")
+    store.set("a", "1", tag="")
+    store.set("b", "2", tag=None)
+    store.set("c", "3", tag="v1")
+    assert store.clear() == 3
+    assert store.count() == 0
+
+def test_sqlite_store_trim(tmp_path):
+    store = SQLiteKVStore(tmp_path / "kv.sqlite3", table="t")
+    store.set("expired", "x", ttl=-1)
+    for i in range(5):
+        store.set(f"k{i}", str(i))
+        time.sleep(0.001)
+    deleted = store.trim(max_rows=3)
+    assert deleted == 3
+    assert store.count() == 3
+    assert store.get("k0") is None and store.get("k4") == "4"
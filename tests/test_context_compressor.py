@@ -0,0 +1,27 @@
+from rag_agent.context_compressor import compress
+from rag_agent.memory_store import count_tokens
+
+def _sources():
+    long_definition = "금리는 " + "돈을 빌려 쓴 대가로 지급하는 이자의 비율이며 " * 80 + "입니다."
+    return [
+        {"word": "금리", "content": long_definition},
+        {"word": "기준금리", "content": "기준금리는 한국은행이 정하는 정책 금리입니다."},
+    ]
+
+def test_oversized_best_sentence_is_truncated_not_dropped():
+    result = compress("금리가 뭐야", _sources(), budget=800, use_embeddings=False)
+    contents = {s["word"]: s["content"] for s in result["sources"]}
+    assert contents["금리"].startswith("금리는")
+    assert contents["기준금리"] == "기준금리는 한국은행이 정하는 정책 금리입니다."
+    assert result["compressed_tokens"] <= 800
+
+def test_within_budget_is_unchanged():
+    sources = _sources()[1:]
+    result = compress("금리가 뭐야", sources, budget=800, use_embeddings=False)
+    assert not result["compressed"] and result["sources"] is sources
+
+def test_irrelevant_sentences_are_dropped():
+    sources = [{"content": "예금자보호는 원금을 보호합니다. 오늘 날씨는 맑고 바람이 붑니다. " * 3}]
+    result = compress("예금자보호 한도", sources, budget=20, use_embeddings=False)
+    assert "날씨" not in result["sources"][0]["content"]
+    assert count_tokens(result["sources"][0]["content"]) <= 20
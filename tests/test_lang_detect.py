@@ -0,0 +1,29 @@
+import pytest
+
+from rag_agent.lang_detect import detect_language, is_confident_korean, needs_context_heuristic
+
+@pytest.mark.parametrize("query", ["내 통장 잔액 얼마야?", "ETF 수수료 알려줘"])
+def test_korean_is_confident(query):
+    assert is_confident_korean(detect_language(query))
+
+@pytest.mark.parametrize("query, language", [
+    ("how much money is in my account", "English"),
+    ("số dư tài khoản của tôi là bao nhiêu", "Vietnamese"),
+])
+def test_latin_languages(query, language):
+    assert detect_language(query)["language"] == language
+
+@pytest.mark.parametrize("query", ["이게 뭐야?", "1번은 뭐야?", "그거 다시 설명해줘", "얼마야?", "왜?"])
+def test_follow_up_questions_need_context(query):
+    assert needs_context_heuristic(query, has_history=True)
+
+@pytest.mark.parametrize("query", ["11번가 결제내역 보여줘", "11번 거래 보여줘", "금리 차이게 뭐야", "ETF", "ETF?"])
+def test_markers_inside_words_and_short_entities_do_not(query):
+    assert not needs_context_heuristic(query, has_history=True)
+
+def test_short_known_term_does_not_need_context():
+    assert needs_context_heuristic("코스피", has_history=True)
+    assert not needs_context_heuristic("코스피", has_history=True, is_known_term=lambda q: True)
+
+def test_no_history_never_needs_context():
+    assert not needs_context_heuristic("이게 뭐야?", has_history=False)
@@ -0,0 +1,52 @@
+import pytest
+
+from rag_agent import local_router
+
+@pytest.fixture(autouse=True)
+def no_term_index(monkeypatch):
+    # terms 테이블(MySQL) 없이 규칙 tier 만 검사
+    monkeypatch.setattr(local_router, "_match_terms", lambda q: [])
+
+def _route(query):
+    decision = local_router.classify_by_rules(query)
+    return decision and (decision["category"], decision["confidence"])
+
+@pytest.mark.parametrize("query, category", [
+    ("엄마한테 5만원 보내줘", "TRANSFER"),
+    ("아빠에게 3만원 이체", "TRANSFER"),
+    ("100달러 보내고 싶어", "TRANSFER"),
+    ("내 통장 잔액 얼마야?", "DATABASE"),
+    ("지난달 엄마한테 보낸 돈 얼마야", "DATABASE"),
+    ("송금 내역 보여줘", "DATABASE"),
+    ("너 이름이 뭐야?", "GENERAL"),
+])
+def test_confident_routes(query, category):
+    assert _route(query)[0] == category
+    assert _route(query)[1] >= 0.8
+
+@pytest.mark.parametrize("query, category", [
+    # 송금 동사 + 금액이 있어도 송금 요청이 아니라 송금에 대한 질문
+    ("5만원 이체하면 수수료 얼마야", "KNOWLEDGE"),
+    ("10만원 송금하는데 얼마나 걸려?", "KNOWLEDGE"),
+    ("송금 수수료 있어?", "KNOWLEDGE"),
+    ("이체 한도 얼마야?", "KNOWLEDGE"),
+    ("10만원 보내면 잔액 얼마 남아?", "DATABASE"),
+])
+def test_questions_about_transfers_are_not_transfers(query, category):
+    assert _route(query)[0] == category
+
+@pytest.mark.parametrize("query", ["오늘 날씨 뭐야?", "점심 메뉴 추천해줘", "한국어 공부하는 방법 알려줘"])
+def test_generic_questions_are_left_to_llm(query):
+    # 일반 표현만으로는 KNOWLEDGE 로 확정하지 않음 (ROUTER_CONFIDENCE_THRESHOLD 0.8 미만)
+    assert _route(query)[1] < 0.8
+
+def test_term_dictionary_hit_makes_definition_question_confident(monkeypatch):
+    monkeypatch.setattr(local_router, "_match_terms", lambda q: ["etf"])
+    assert _route("ETF가 뭐야?") == ("KNOWLEDGE", 0.85)
+
+def test_request_with_question_is_left_to_llm():
+    category, confidence = _route("엄마한테 5만원 송금해줘. 수수료 얼마야?")
+    assert confidence < 0.8
+
+def test_no_rule_returns_none():
+    assert local_router.classify_by_rules("음") is None
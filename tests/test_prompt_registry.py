@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from rag_agent import prompt_registry
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "ok.md").write_text("Q: {question}", encoding="utf-8")
+    (tmp_path / "a" / "broken.md").write_text("Q: {question} H: {history}", encoding="utf-8")
+    monkeypatch.setattr(prompt_registry, "PROMPT_ROOT", tmp_path)
+    monkeypatch.setattr(prompt_registry, "_entries", {})
+    monkeypatch.setattr(prompt_registry, "_chains", {})
+    return prompt_registry
+
+def test_valid_prompts_pass_strict(registry, monkeypatch):
+    monkeypatch.setattr(registry, "PROMPT_INPUTS", {"a/ok.md": {"question"}})
+    assert registry.validate_prompts(strict=True) == []
+
+def test_missing_variable_is_reported(registry, monkeypatch):
+    monkeypatch.setattr(registry, "PROMPT_INPUTS", {"a/broken.md": {"question"}})
+    problems = registry.validate_prompts()
+    assert [(level, name) for level, name, _ in problems] == [("error", "a/broken.md")]
+    with pytest.raises(registry.PromptValidationError, match="history"):
+        registry.validate_prompts(strict=True)
+
+def test_missing_file_fails_strict(registry, monkeypatch):
+    monkeypatch.setattr(registry, "PROMPT_INPUTS", {"a/ok.md": {"question"}, "a/none.md": {"question"}})
+    with pytest.raises(registry.PromptValidationError, match="a/none.md"):
+        registry.validate_prompts(strict=True)
+
+def test_unused_input_is_only_a_warning(registry, monkeypatch):
+    monkeypatch.setattr(registry, "PROMPT_INPUTS", {"a/ok.md": {"question", "history"}})
+    problems = registry.validate_prompts(strict=True)
+    assert [level for level, _, _ in problems] == ["warning"]
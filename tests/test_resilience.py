@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from utils import resilience
+from utils.resilience import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+def _open_breaker(reset_timeout=0.0):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=reset_timeout)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+def test_opens_after_consecutive_failures():
+    breaker = _open_breaker(reset_timeout=60.0)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+def test_half_open_allows_a_single_trial():
+    breaker = _open_breaker()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+def test_failed_trial_reopens():
+    breaker = _open_breaker()
+    assert breaker.allow()
+    breaker.reset_timeout = 60.0
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+def test_released_trial_lets_the_next_call_try():
+    breaker = _open_breaker()
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+def test_hedged_returns_the_faster_attempt():
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        await asyncio.sleep(0.2 if len(attempts) == 1 else 0.01)
+        return len(attempts)
+
+    assert asyncio.run(resilience.hedged(call, hedge_delay=0.02)) == 2
+
+def test_hedged_raises_when_all_attempts_fail():
+    async def call():
+        raise ValueError("x")
+
+    with pytest.raises(ValueError):
+        asyncio.run(resilience.hedged(call, hedge_delay=0.01))
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("dotenv")  # utils.handle_sql
+
+from rag_agent import schema_cache
+
+COLUMNS = [
+    {"TABLE_NAME": "current_user_accounts", "COLUMN_NAME": "balance", "DATA_TYPE": "decimal", "COLUMN_TYPE": "decimal(15,2)"},
+    {"TABLE_NAME": "current_user_accounts", "COLUMN_NAME": "is_primary", "DATA_TYPE": "tinyint", "COLUMN_TYPE": "tinyint(1)"},
+    {"TABLE_NAME": "current_user_transactions", "COLUMN_NAME": "transaction_type", "DATA_TYPE": "enum",
+     "COLUMN_TYPE": "enum('DEPOSIT','TRANSFER')"},
+    {"TABLE_NAME": "current_user_transactions", "COLUMN_NAME": "category", "DATA_TYPE": "varchar", "COLUMN_TYPE": "varchar(20)"},
+]
+VIEWS = ["current_user_transactions", "current_user_accounts"]
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    def fake_get_data(sql, args=None):
+        calls.append(sql)
+        return COLUMNS
+    monkeypatch.setattr(schema_cache, "get_data", fake_get_data)
+    schema_cache.invalidate()
+    yield calls
+    schema_cache.invalidate()
+
+def test_compact_schema_uses_static_information_only(calls):
+    schema = schema_cache.get_schema(VIEWS)
+    assert "current_user_accounts(balance decimal, is_primary tinyint [1=main account])" in schema
+    assert "transaction_type {DEPOSIT|TRANSFER}" in schema
+    # INFORMATION_SCHEMA 1회만 조회 (사용자 데이터 샘플링 없음)
+    assert len(calls) == 1 and "INFORMATION_SCHEMA" in calls[0]
+
+def test_cache_key_ignores_view_order_and_invalidates(calls):
+    schema_cache.get_schema(VIEWS)
+    schema_cache.get_schema(list(reversed(VIEWS)))
+    assert len(calls) == 1
+    schema_cache.invalidate(VIEWS)
+    schema_cache.get_schema(VIEWS)
+    assert len(calls) == 2
+
+def test_failures_are_not_cached(monkeypatch):
+    def fail(sql, args=None):
+        raise RuntimeError("db down")
+    monkeypatch.setattr(schema_cache, "get_data", fail)
+    schema_cache.invalidate()
+    assert schema_cache.get_schema(VIEWS).startswith("스키마 조회 실패")
+    assert schema_cache.peek(VIEWS) is None
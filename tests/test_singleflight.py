@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.singleflight import SingleFlight, AsyncSingleFlight
+
+def _run_threads(n, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+def test_concurrent_calls_share_one_execution():
+    flight, calls, results = SingleFlight(), [], []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "v"
+
+    _run_threads(8, lambda: results.append(flight.do("k", slow)))
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert flight.stats()["in_flight"] == 0
+
+def test_error_is_propagated_to_followers():
+    flight, errors = SingleFlight(), []
+
+    def boom():
+        time.sleep(0.05)
+        raise RuntimeError("x")
+
+    def call():
+        try:
+            flight.do("k", boom)
+        except RuntimeError as e:
+            errors.append(e)
+
+    _run_threads(4, call)
+    assert len(errors) == 4
+    # 실패한 키는 남지 않아 다음 호출은 다시 실행됨
+    assert flight.do("k", lambda: 1) == (1, False)
+
+def test_do_many_batches_only_keys_not_in_flight():
+    flight, batches = SingleFlight(), []
+    started = threading.Event()
+
+    def slow_single():
+        started.set()
+        time.sleep(0.1)
+        return "a!"
+
+    leader = threading.Thread(target=lambda: flight.do("a", slow_single))
+    leader.start()
+    started.wait()
+
+    def embed(keys):
+        batches.append(keys)
+        return [k + "!" for k in keys]
+
+    out = flight.do_many(["a", "b", "c", "b"], embed)
+    leader.join()
+    assert batches == [["b", "c"]]
+    assert out == {"a": ("a!", True), "b": ("b!", False), "c": ("c!", False)}
+
+def test_do_many_rejects_short_result():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do_many(["a", "b"], lambda keys: ["only one"])
+    assert flight.stats()["in_flight"] == 0
+
+def test_async_follower_survives_leader_cancellation():
+    async def scenario():
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return 42
+
+        first = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == (42, True)
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("dotenv")  # utils.handle_sql
+
+from rag_agent import sql_fastpath as fp
+
+VIEWS = ["current_user_profile", "current_user_accounts", "current_user_transactions"]
+
+ACCOUNTS = [
+    {"bank_name": "우리은행", "account_alias": "월급통장", "account_number": "1002", "balance": Decimal("2980873.00"), "is_primary": 1},
+    {"bank_name": "국민은행", "account_alias": None, "account_number": "9", "balance": Decimal("1500.50"), "is_primary": 0},
+]
+
+def _tx(amount, description, day):
+    return {"transaction_type": "TRANSFER", "amount": Decimal(amount), "description": description,
+            "category": "송금", "created_at": datetime(2026, 2, day)}
+
+def _intent(question, views=VIEWS):
+    found = fp.match(question, views)
+    return found[0].name if found else None
+
+@pytest.mark.parametrize("question, intent", [
+    ("내 잔액 얼마야", "balance"),
+    ("통장에 얼마 남았어", "balance"),
+    ("최근 거래내역 5개", "recent_transactions"),
+    ("지난주 송금 내역 3건", "recent_transactions"),
+    ("이번 달 식비 얼마 썼어", "spend"),
+    ("엄마한테 보낸 돈 얼마야", "transfers_to_contact"),
+    ("큰엄마한테 이번 달 송금한 내역", "transfers_to_contact"),
+])
+def test_match_intents(question, intent):
+    assert _intent(question) == intent
+
+@pytest.mark.parametrize("question", [
+    "누구한테 제일 많이 보냈어?",          # 분석형
+    "3월에 얼마 썼어",                     # 지원하지 않는 기간
+    "지난달 잔액",                         # 과거 시점 잔액
+    "내 잔액 알려줘 그리고 최근 거래내역도",  # 복합 질문
+    "잔액이랑 최근 거래 알려줘",
+])
+def test_defers_to_llm(question):
+    assert fp.match(question, VIEWS) is None
+
+def test_requires_view():
+    assert _intent("내 잔액 얼마야", ["current_user_transactions"]) is None
+
+def test_user_values_are_parameters():
+    _, sql, args, _ = fp.match("큰엄마한테 보낸 돈", VIEWS)
+    assert "큰엄마" not in sql
+    assert args[:2] == ["큰엄마%", "% 큰엄마 %"]
+
+def test_balance_rendering():
+    assert "2,980,873원" in fp._render_balance("내 잔액 얼마야", {}, ACCOUNTS)
+    assert "2,982,373.50원" in fp._render_balance("전체 계좌 잔액", {}, ACCOUNTS)
+    assert fp._render_balance("국민은행 잔고", {}, ACCOUNTS).startswith("국민은행")
+    # 보유하지 않은 계좌 지칭 -> LLM 경로
+    assert fp._render_balance("적금통장 잔액", {}, ACCOUNTS) is None
+
+def test_contact_without_rows_falls_back():
+    _, _, _, params = fp.match("엄마한테 보낸 돈 얼마야", VIEWS)
+    assert fp._render_contact("엄마한테 보낸 돈 얼마야", params, []) is None
+    answer = fp._render_contact("엄마한테 보낸 돈 얼마야", params, [_tx("-200000", "엄마 용돈", 9)])
+    assert "200,000원" in answer
+
+def test_period_listing_reports_truncation():
+    _, _, args, params = fp.match("최근 30일 지출 내역", VIEWS)
+    assert args[-1] == fp.RECENT_MAX_LIMIT + 1
+    rows = [_tx("-1000", f"거래 {i}", 1) for i in range(fp.RECENT_MAX_LIMIT + 1)]
+    answer = fp._render_recent("최근 30일 지출 내역", params, rows)
+    assert f"{fp.RECENT_MAX_LIMIT}건입니다" in answer
+    assert "더 이전 내역" in answer
+
+def test_explicit_count_is_not_flagged():
+    _, _, args, params = fp.match("최근 거래내역 3개", VIEWS)
+    assert args[-1] == 4
+    rows = [_tx("-1000", f"거래 {i}", 1) for i in range(4)]
+    answer = fp._render_recent("최근 거래내역 3개", params, rows)
+    assert "3건입니다" in answer and "더 이전 내역" not in answer
+
+def test_atry_answer_skips_llm(monkeypatch):
+    monkeypatch.setattr(fp, "get_data", lambda sql, args=None: ACCOUNTS)
+    answer = asyncio.run(fp.atry_answer("내 잔액 얼마야", VIEWS))
+    assert "주 계좌" in answer
+
+def test_atry_answer_falls_back_on_query_error(monkeypatch):
+    def fail(sql, args=None):
+        raise RuntimeError("db down")
+    monkeypatch.setattr(fp, "get_data", fail)
+    assert asyncio.run(fp.atry_answer("내 잔액 얼마야", VIEWS)) is None
+
+@pytest.mark.parametrize("question, period", [
+    ("이번 달 지출 얼마야?", "이번 달"),
+    ("이번 달 쓴 돈 얼마야", "이번 달"),
+    ("최근 30일 지출 얼마야", "최근 30일"),
+])
+def test_question_endings_are_not_categories(question, period):
+    intent, sql, _, params = fp.match(question, VIEWS)
+    assert intent.name == "spend"
+    assert params == {"period": period, "category": None}
+    assert "category" not in sql
+
+def test_unknown_spend_category_defers_to_llm():
+    assert fp.match("이번 달 여행경비 얼마 썼어", VIEWS) is None
+    assert fp.match("이번 달 10%_할인 얼마 썼어", VIEWS) is None
+
+def test_spend_category_without_rows_falls_back():
+    _, _, args, params = fp.match("이번 달 식비 얼마 썼어", VIEWS)
+    assert args == ["식비", "%식비%"]
+    assert fp._render_spend("이번 달 식비 얼마 썼어", params, [{"cnt": 0, "total": 0}]) is None
+    # 카테고리 없는 기간 지출 0건은 그대로 안내
+    _, _, _, params = fp.match("이번 달 지출 얼마야?", VIEWS)
+    assert "찾을 수 없습니다" in fp._render_spend("이번 달 지출 얼마야?", params, [{"cnt": 0, "total": 0}])
+
+def test_like_escape():
+    assert fp._like_escape("10%_할인") == "10\\%\\_할인"
+
+@pytest.mark.parametrize("question", ["10만원 보내면 잔액 얼마 남아?", "월세 내면 잔액 얼마 남아", "카드값 나간 후에 잔고"])
+def test_hypothetical_balance_defers_to_llm(question):
+    assert fp.match(question, VIEWS) is None
@@ -0,0 +1,29 @@
+import pytest
+
+from rag_agent.term_explanations import canonical_question, is_definition_question
+
+@pytest.mark.parametrize("query", [
+    "금리",
+    "금리?",
+    "금리가 뭐야?",
+    "금리란?",
+    "금리 뜻 알려줘",
+    "금리의 의미가 뭐예요",
+    "금리에 대해 설명해줘",
+    "'금리'가 무엇인가요",
+])
+def test_definition_questions(query):
+    assert is_definition_question(query, "금리")
+
+@pytest.mark.parametrize("query", [
+    "금리인하요구권이 뭐야",
+    "기준금리가 뭐야",
+    "금리 얼마야?",
+    "금리 오르면 대출 이자는 어떻게 돼?",
+    "요즘 금리가 뭐야",
+])
+def test_other_questions_mentioning_the_term(query):
+    assert not is_definition_question(query, "금리")
+
+def test_canonical_question_is_a_definition_question():
+    assert is_definition_question(canonical_question("총부채원리금상환비율"), "총부채원리금상환비율")
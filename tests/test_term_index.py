@@ -0,0 +1,44 @@
+import pytest
+
+from rag_agent.term_index import TermIndex
+from utils.term_normalize import normalize_term, normalize_term_with_breaks
+
+WORDS = ["금리", "주식", "예금", "보험", "기준금리", "연말정산", "총부채원리금상환비율(DSR)", "ETF"]
+
+@pytest.fixture(scope="module")
+def index():
+    return TermIndex([{"word": w, "definition": f"{w} 정의"} for w in WORDS])
+
+def _aliases(index, query):
+    return [t["alias"] for t in index.match(query)]
+
+@pytest.mark.parametrize("query", [
+    "금리인하요구권이 뭐야",
+    "주식매수선택권이 뭐야",
+    "예금자보호제도 알려줘",
+    "보험계약대출 이자는?",
+])
+def test_compound_terms_fall_through_to_vector_search(index, query):
+    # 색인에 없는 복합어 안의 짧은 용어는 일치로 보지 않음
+    assert _aliases(index, query) == []
+
+@pytest.mark.parametrize("query, expected", [
+    ("금리가 뭐야?", ["금리"]),
+    ("금리란?", ["금리"]),
+    ("금리뭐야", ["금리"]),
+    ("금리 인하 요구권", ["금리"]),
+    ("기준금리는 얼마야", ["기준금리"]),
+    ("연말 정산 방법", ["연말정산"]),
+    ("DSR이 뭐야", ["dsr"]),
+    ("ETF랑 주식 차이", ["etf", "주식"]),
+])
+def test_terms_ending_the_word_or_followed_by_particles(index, query, expected):
+    assert _aliases(index, query) == expected
+
+def test_ascii_alias_inside_english_word(index):
+    assert _aliases(index, "my address") == []
+
+def test_normalize_with_breaks_matches_normalize_term():
+    text, breaks = normalize_term_with_breaks("연말 정산(DSR) 방법")
+    assert text == normalize_term("연말 정산(DSR) 방법")
+    assert {2, 4} <= breaks
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from utils.cache import SQLiteKVStore
+from rag_agent import web_search_cache
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    # 프롬프트 레지스트리(LangChain) 없이 임시 SQLite 로 검사
+    monkeypatch.setattr(web_search_cache, "_prompt_version", lambda: "v1")
+    monkeypatch.setattr(web_search_cache, "_store", SQLiteKVStore(tmp_path / "web.sqlite3", table="web_search"))
+    web_search_cache.clear()
+    yield
+    web_search_cache.clear()
+
+def _result(answer="답변"):
+    return {"answer": answer, "sources": [{"url": "https://example.com"}], "source_type": "Web Search"}
+
+@pytest.mark.parametrize("query, klass", [
+    ("삼성전자 주가 얼마야", "quote"),
+    ("코스피 전망 알려줘", "news"),
+    ("오늘 환율 뉴스", "quote"),
+    ("청약 통장 만드는 방법", "general"),
+])
+def test_freshness_class(query, klass):
+    assert web_search_cache.freshness_class(query) == klass
+
+def test_ttl_follows_freshness_class():
+    web_search_cache.store("삼성전자 주가", _result())
+    entry = web_search_cache.lookup("삼성전자 주가?")
+    assert entry["freshness"] == "quote"
+    assert entry["expires_at"] - time.time() <= web_search_cache.FRESHNESS_TTL["quote"]
+
+def test_expired_entry_is_served_only_as_stale(monkeypatch):
+    monkeypatch.setitem(web_search_cache.FRESHNESS_TTL, "quote", -1)
+    web_search_cache.store("삼성전자 주가", _result())
+    web_search_cache.clear()
+    assert web_search_cache.lookup("삼성전자 주가") is None
+    stale = web_search_cache.lookup_stale("삼성전자 주가")
+    assert stale["stale"] and stale["answer"] == "답변"
+
+def test_prompt_change_invalidates_normal_lookup(monkeypatch):
+    web_search_cache.store("청약 방법", _result())
+    web_search_cache.clear()
+    monkeypatch.setattr(web_search_cache, "_prompt_version", lambda: "v2")
+    assert web_search_cache.lookup("청약 방법") is None
+    assert web_search_cache.lookup_stale("청약 방법") is not None
+
+@pytest.mark.parametrize("result", [
+    _result("검색 결과가 없습니다."),
+    {"answer": "답변", "sources": [], "source_type": "Web Search (Cached)"},
+])
+def test_failures_and_fallbacks_are_not_cached(result):
+    assert not web_search_cache.store("청약 방법", result)
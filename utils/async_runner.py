@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+# ==========================================
+# 동기 API -> 비동기 파이프라인 브리지
+# ==========================================
+# - 프로세스당 하나의 이벤트 루프를 백그라운드 데몬 스레드에서 계속 실행
+# - ChatOpenAI / AsyncTavilyClient 의 비동기 HTTP 클라이언트는 처음 사용한 이벤트 루프에 묶이므로,
+#   호출마다 asyncio.run() 으로 새 루프를 만들지 않고 이 루프를 공유합니다.
+# - Streamlit 처럼 동기 코드에서는 run_sync / iterate_sync 로 호출하고,
+#   비동기 서버에서는 arun_* 함수를 직접 await 하면 됩니다.
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _thread
+    if _loop is not None:
+        return _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="agent-event-loop", daemon=True)
+            thread.start()
+            _thread = thread
+            _loop = loop
+    return _loop
+
+def _check_not_loop_thread():
+    if _thread is not None and threading.current_thread() is _thread:
+        # 루프 스레드에서 자기 자신을 기다리면 교착 상태가 되므로 await 를 사용해야 함
+        raise RuntimeError("run_sync() 는 에이전트 이벤트 루프 안에서 호출할 수 없습니다. 비동기 API(a*)를 await 하세요.")
+
+def run_sync(coro):
+    """코루틴을 공유 이벤트 루프에서 실행하고 결과를 기다려 반환"""
+    _check_not_loop_thread()
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+def iterate_sync(agen):
+    """async generator 를 동기 generator 로 변환 (항목이 도착하는 즉시 전달)"""
+    _check_not_loop_thread()
+    loop = get_loop()
+    try:
+        while True:
+            try:
+                item = asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        # 소비 측이 중간에 멈춰도 스트림(LLM 요청 포함)을 정리
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
@@ -0,0 +1,203 @@
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+# ==========================================
+# 크기 제한 + LRU + TTL 인메모리 캐시
+# ==========================================
+# - maxsize 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+# - 항목별 TTL(초) 지정 가능, ttl=None 이면 만료 없음
+# - 적중/미적중/제거 횟수를 stats() 로 노출
+class TTLCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()   # key -> (value, expires_at)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, expires_at) -> bool:
+        return expires_at is not None and expires_at <= time.time()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if self._expired(expires_at):
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def items(self) -> list:
+        """만료되지 않은 (key, value) 목록 (LRU 순서/통계에는 영향 없음)"""
+        with self._lock:
+            return [(k, v) for k, (v, exp) in self._data.items() if not self._expired(exp)]
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and not self._expired(item[1])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+# ==========================================
+# SQLite 기반 영속 Key-Value 저장소
+# ==========================================
+# - 여러 워커 프로세스가 같은 파일을 공유 (WAL 모드)
+# - tag: 프롬프트 버전 등 일괄 무효화 기준 / expires_at: TTL (None 이면 만료 없음)
+# - 연결은 스레드별로 생성 (sqlite3 연결은 스레드 간 공유 불가)
+class SQLiteKVStore:
+    def __init__(self, path, table: str = "kv", timeout: float = 5.0):
+        self.path = str(path)
+        self.table = table
+        self.timeout = timeout
+        self._local = threading.local()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB,"
+            " tag TEXT,"
+            " created_at REAL NOT NULL,"
+            " expires_at REAL"
+            ")"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_tag ON {self.table}(tag)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_entry(self, key: str) -> dict | None:
+        """만료 여부와 관계없이 항목 반환 (stale 데이터 활용은 호출 측 판단)"""
+        row = self._conn().execute(
+            f"SELECT value, tag, created_at, expires_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, tag, created_at, expires_at = row
+        return {
+            "value": value,
+            "tag": tag,
+            "created_at": created_at,
+            "expires_at": expires_at,
+            "expired": expires_at is not None and expires_at <= time.time(),
+        }
+
+    def get(self, key: str, tag: str = None):
+        """만료되지 않았고 (tag 지정 시) tag 가 일치하는 값만 반환"""
+        entry = self.get_entry(key)
+        if entry is None or entry["expired"]:
+            return None
+        if tag is not None and entry["tag"] != tag:
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value, tag: str = None, ttl: float = None):
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        conn = self._conn()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, tag, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (key, value, tag, now, expires_at),
+        )
+        conn.commit()
+
+    def delete(self, key: str):
+        conn = self._conn()
+        conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        conn.commit()
+
+    def purge(self, keep_tag: str = None, older_than: float = None) -> int:
+        """keep_tag 와 다른 tag 의 항목, 또는 older_than(초)보다 오래 만료된 항목 삭제"""
+        conn = self._conn()
+        deleted = 0
+        if keep_tag is not None:
+            deleted += conn.execute(
+                f"DELETE FROM {self.table} WHERE tag IS NULL OR tag != ?", (keep_tag,)
+            ).rowcount
+        if older_than is not None:
+            deleted += conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time() - older_than,),
+            ).rowcount
+        conn.commit()
+        return deleted
+
+    def clear(self) -> int:
+        """전체 항목 삭제, 삭제 건수 반환"""
+        conn = self._conn()
+        deleted = conn.execute(f"DELETE FROM {self.table}").rowcount
+        conn.commit()
+        return deleted
+
+    def trim(self, max_rows: int) -> int:
+        """만료된 항목을 지우고, max_rows 를 넘으면 오래된(created_at) 항목부터 삭제"""
+        conn = self._conn()
+        deleted = conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        ).rowcount
+        excess = self.count() - max_rows
+        if excess > 0:
+            deleted += conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY created_at LIMIT ?)", (excess,)
+            ).rowcount
+        conn.commit()
+        return deleted
+
+    def count(self) -> int:
+        return self._conn().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
@@ -1,4 +1,5 @@
 from utils.handle_sql import get_data, execute_query
+from rag_agent import schema_cache
 
 
 def get_user_id(username: str) -> int:
@@ -57,8 +58,11 @@ def create_user_views(username: str):
     execute_query(accounts_view_sql)
     execute_query(transactions_view_sql)
 
-    return [
+    view_names = [
         "current_user_profile",
         "current_user_accounts",
         "current_user_transactions"
     ]
+    # 뷰를 다시 만들었으므로 (컬럼 구성이 바뀌었을 수 있음) SQL 에이전트 스키마 캐시 무효화
+    schema_cache.invalidate(view_names)
+    return view_names
@@ -2,6 +2,9 @@ import pdfplumber
 import re
 import os
 
+# 정규화 함수: 띄어쓰기, 특수문자 무시하고 '글자'만 비교 (pdf_to_mysql 과 공용)
+from term_normalize import normalize
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PDF_FILE_PATH = os.path.join(BASE_DIR, "data", "economic_terms.pdf")
 OUTPUT_FILE = os.path.join(BASE_DIR, "data", "final_verification_strict.txt")
@@ -11,11 +14,6 @@ INDEX_START_PAGE = 5
 INDEX_END_PAGE = 16    
 BODY_START_PAGE = 17   
 
-# 정규화 함수: 띄어쓰기, 특수문자 무시하고 '글자'만 비교
-def normalize(text):
-    if not text: return ""
-    return re.sub(r'[\s\(\)\[\]\-\.,･・/]', '', text)
-
 # 1. 목차(Index) 추출 - "공백 없이 합치기" 로직
 def extract_master_terms():
     print("📖 [1단계] 목차 정밀 추출 (기준점 확보)...")
@@ -0,0 +1,96 @@
+"""
+Chroma 컬렉션 -> mmap 벡터 색인(rag_agent/vector_index.py) 내보내기
+
+사용법:
+    python utils/export_vector_index.py                    # float16 (기본)
+    python utils/export_vector_index.py --dtype int8       # 행별 대칭 int8 양자화
+    python utils/export_vector_index.py --out data/vector_index/financial_terms_int8 --dtype int8
+    python utils/export_vector_index.py --collection financial_terms_d512 --out data/vector_index/financial_terms_d512
+
+set_chromaDB.py 로 컬렉션을 다시 만든 뒤에는 이 스크립트도 다시 실행해야 합니다.
+(meta.json 에 내보낼 당시의 Chroma manifest 해시를 기록하고, finrag_agent 는 로드 시 현재 manifest 와 다르면
+ 오래된 색인으로 보고 ChromaDB 를 사용합니다.)
+"""
+import os
+import json
+import argparse
+import hashlib
+
+import numpy as np
+import chromadb
+
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+PERSIST_DIRECTORY = os.path.normpath(os.path.join(current_script_dir, "..", "data", "financial_terms"))
+DEFAULT_OUT_DIR = os.path.normpath(os.path.join(current_script_dir, "..", "data", "vector_index", "financial_terms"))
+MANIFEST_PATH = os.path.join(PERSIST_DIRECTORY, "manifest.json")
+COLLECTION_NAME = "financial_terms"
+EMBEDDING_MODEL = "text-embedding-3-large"
+
+def quantize(vectors: np.ndarray, dtype: str):
+    """반환: (저장 행렬, 행별 배율 | None, 역양자화 기준 ||v||^2)"""
+    if dtype == "float16":
+        matrix = vectors.astype(np.float16)
+        restored = matrix.astype(np.float32)
+        return matrix, None, np.einsum("ij,ij->i", restored, restored)
+    # int8: 행별 max|v| 를 127 로 맞추는 대칭 양자화
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    matrix = np.clip(np.round(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    restored = matrix.astype(np.float32) * scales[:, None]
+    return matrix, scales.astype(np.float32), np.einsum("ij,ij->i", restored, restored)
+
+def export(out_dir: str, dtype: str, collection_name: str = COLLECTION_NAME):
+    print(f"📂 Chroma 경로: {PERSIST_DIRECTORY} (컬렉션: {collection_name})")
+    client = chromadb.PersistentClient(path=PERSIST_DIRECTORY)
+    collection = client.get_collection(collection_name)
+    data = collection.get(include=["embeddings", "documents", "metadatas"])
+
+    ids = list(data["ids"])
+    if not ids:
+        print("⚠️ 내보낼 데이터가 없습니다.")
+        return
+    vectors = np.asarray(data["embeddings"], dtype=np.float32)
+    print(f"📊 {len(ids)}개 x {vectors.shape[1]}차원 -> {dtype}")
+
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+        print("⚠️ Chroma manifest 가 없습니다. set_chromaDB.py 로 구축한 뒤 내보내야 로드 시 최신 여부를 확인할 수 있습니다.")
+
+    matrix, scales, sqnorms = quantize(vectors, dtype)
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "vectors.npy"), matrix)
+    np.save(os.path.join(out_dir, "sqnorms.npy"), sqnorms.astype(np.float32))
+    if scales is not None:
+        np.save(os.path.join(out_dir, "scales.npy"), scales)
+
+    meta = {
+        "collection": collection_name,
+        "model": EMBEDDING_MODEL,
+        "dtype": dtype,
+        "dim": int(vectors.shape[1]),
+        "count": len(ids),
+        "content_hash": hashlib.sha256("\n".join(data["documents"]).encode("utf-8")).hexdigest()[:16],
+        # 원천 Chroma manifest (MySQL terms 행 수 + 내용 해시) -> 로드 시 현재 manifest 와 비교
+        "source_model": manifest.get("model"),
+        "source_hash": manifest.get("content_hash"),
+        "ids": ids,
+        "documents": list(data["documents"]),
+        "metadatas": list(data["metadatas"]),
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    err = np.abs(sqnorms - np.einsum("ij,ij->i", vectors, vectors)).max()
+    size_mb = matrix.nbytes / 1024 / 1024
+    print(f"✅ 저장 완료: {out_dir} (행렬 {size_mb:.1f}MB, float32 대비 {matrix.itemsize / 4:.0%}, 최대 ||v||^2 오차 {err:.5f})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chroma 컬렉션을 mmap 벡터 색인으로 내보내기")
+    parser.add_argument("--dtype", choices=["float16", "int8"], default="float16")
+    parser.add_argument("--out", default=None, help=f"출력 디렉터리 (기본: {DEFAULT_OUT_DIR})")
+    parser.add_argument("--collection", default=COLLECTION_NAME, help="축소 차원 컬렉션(financial_terms_d512 등)도 가능")
+    args = parser.parse_args()
+    export(args.out or DEFAULT_OUT_DIR, args.dtype, args.collection)
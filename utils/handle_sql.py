@@ -1,34 +1,47 @@
-import pymysql
 import os
+import threading
 from dotenv import load_dotenv
-from dbutils.pooled_db import PooledDB
 
 load_dotenv()
 
-# [수정] 전역 풀 생성 (싱글톤 패턴 효과)
-POOL = PooledDB(
-    creator=pymysql,
-    mincached=2,
-    maxcached=5,
-    maxconnections=10,
-    blocking=True,
-    host=os.getenv('DB_HOST'),
-    user=os.getenv('DB_USER'),
-    password=os.getenv('DB_PASSWORD'),
-    db=os.getenv('DB_NAME'),
-    port=int(os.getenv('DB_PORT', 3306)),
-    charset='utf8mb4'
-)
+# [수정] 전역 풀 (싱글톤 패턴 효과)
+# import 시점에는 MySQL 에 연결하지 않고, 첫 쿼리에서 get_pool() 이 풀을 생성합니다.
+# (DB 없이도 모듈 import / 워커 기동이 가능하고, mincached 연결 비용을 첫 사용 시점으로 미룸)
+POOL = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global POOL
+    if POOL is None:
+        with _pool_lock:
+            if POOL is None:
+                import pymysql
+                from dbutils.pooled_db import PooledDB
+                POOL = PooledDB(
+                    creator=pymysql,
+                    mincached=2,
+                    maxcached=5,
+                    maxconnections=10,
+                    blocking=True,
+                    host=os.getenv('DB_HOST'),
+                    user=os.getenv('DB_USER'),
+                    password=os.getenv('DB_PASSWORD'),
+                    db=os.getenv('DB_NAME'),
+                    port=int(os.getenv('DB_PORT', 3306)),
+                    charset='utf8mb4'
+                )
+    return POOL
 
 def _get_connection():
     # [수정] 풀에서 연결을 빌려옴 (매우 빠름)
-    return POOL.connection()
+    return get_pool().connection()
 
 def get_data(query, args=None):
     """SELECT 전용: 결과를 반환함"""
+    from pymysql.cursors import DictCursor
     conn = _get_connection()
     try:
-        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+        with conn.cursor(DictCursor) as cursor:
             cursor.execute(query, args)
             return cursor.fetchall()
     finally:
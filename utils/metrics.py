@@ -0,0 +1,76 @@
+import threading
+from collections import defaultdict, deque
+
+# ==========================================
+# 프로세스 단위 경량 메트릭 (카운터 + 지연시간 샘플)
+# ==========================================
+# 외부 모니터링 시스템 없이 캐시 적중률, fast path 비율 등을 집계하기 위한 용도입니다.
+# 샘플은 이름별로 최근 MAX_SAMPLES 개만 유지합니다.
+MAX_SAMPLES = 1000
+# histogram() 기본 구간 경계 (초)
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+
+def incr(name: str, value: int = 1):
+    """카운터 증가"""
+    with _lock:
+        _counters[name] += value
+
+def observe(name: str, value: float):
+    """지연시간(초) 등 수치 샘플 기록"""
+    with _lock:
+        _samples[name].append(value)
+
+def get_counter(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+def summarize(name: str) -> dict:
+    """샘플 요약: count / mean / p50 / p95 / max"""
+    with _lock:
+        values = sorted(_samples.get(name, ()))
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": values[len(values) // 2],
+        "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+        "max": values[-1],
+    }
+
+def histogram(name: str, buckets: tuple = DEFAULT_BUCKETS) -> dict:
+    """최근 샘플의 구간별 개수 {"<=0.1": n, ..., ">8.0": n} (구간은 누적이 아닌 개별 개수)"""
+    with _lock:
+        values = list(_samples.get(name, ()))
+    counts = {f"<={b}": 0 for b in buckets}
+    counts[f">{buckets[-1]}"] = 0
+    for v in values:
+        for b in buckets:
+            if v <= b:
+                counts[f"<={b}"] += 1
+                break
+        else:
+            counts[f">{buckets[-1]}"] += 1
+    return counts
+
+def snapshot(prefix: str = "") -> dict:
+    """prefix로 시작하는 모든 카운터/샘플 요약"""
+    with _lock:
+        counter_names = [n for n in _counters if n.startswith(prefix)]
+        sample_names = [n for n in _samples if n.startswith(prefix)]
+        counters = {n: _counters[n] for n in counter_names}
+    return {
+        "counters": counters,
+        "timings": {n: summarize(n) for n in sample_names},
+    }
+
+def reset(prefix: str = ""):
+    with _lock:
+        for n in [n for n in _counters if n.startswith(prefix)]:
+            del _counters[n]
+        for n in [n for n in _samples if n.startswith(prefix)]:
+            del _samples[n]
@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 
 
 from handle_sql import execute_query, execute_many
+from term_normalize import normalize  # 4. 정규화 함수 (로컬 라우터 / FinRAG 용어 색인과 공용)
 
 print("🚀 [최종] 금융 용어 PDF -> MySQL DB 적재 시작 (Strict Match Mode)...")
 
@@ -42,11 +43,6 @@ def init_db_table():
         print(f"❌ DB 초기화 오류: {e}")
         exit()
 
-# 4. 정규화 함수 (비교용: 공백/특수문자 제거)
-def normalize(text):
-    if not text: return ""
-    return re.sub(r'[\s\(\)\[\]\-\.,･・/]', '', text)
-
 # 5. [1단계] 목차 정밀 추출 (노이즈 제거 + 합치기)
 def extract_master_terms():
     print("📖 [1단계] 목차 정밀 추출 중...")
@@ -0,0 +1,106 @@
+"""
+금융 용어 설명 사전 생성 배치 (rag_agent/term_explanations.py)
+
+terms 테이블의 모든 용어에 대해 finrag_01_system.md 설명을 생성하고,
+요청한 언어(en/vi/id)는 main_05_re_translation.md 로 번역해 저장합니다.
+이미 현재 프롬프트 버전 + 현재 정의로 생성된 항목은 건너뛰므로 (증분 생성),
+정의가 바뀐 용어나 프롬프트 변경 후에만 LLM 을 호출합니다.
+
+사용법:
+    python utils/precompute_explanations.py                       # 한국어만
+    python utils/precompute_explanations.py --languages ko en vi id --workers 8
+    python utils/precompute_explanations.py --dry-run             # 생성 대상 개수만 출력
+    python utils/precompute_explanations.py --purge               # 이전 프롬프트 버전 항목 삭제
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+
+from utils.handle_sql import get_data
+from rag_agent import prompt_registry, term_explanations
+from rag_agent.lang_detect import CODE_TO_LANGUAGE
+
+load_dotenv()
+
+llm = ChatOpenAI(model="gpt-5-mini")
+
+def load_terms() -> list:
+    rows = get_data("SELECT word, definition FROM terms WHERE definition IS NOT NULL")
+    return [r for r in rows if r.get("word") and r.get("definition")]
+
+def generate(term: dict, languages: list) -> list:
+    """용어 하나에 대해 필요한 언어만 생성. 반환: 생성한 언어 코드 목록"""
+    word, definition = term["word"], term["definition"]
+    todo = [c for c in languages if not term_explanations.has_current(word, definition, c)]
+    if not todo:
+        return []
+
+    korean = term_explanations.lookup(word, definition, "ko")
+    if korean is None:
+        chain = prompt_registry.get_chain(term_explanations.ANSWER_PROMPT, llm)
+        korean = chain.invoke({
+            # node_db_answer 와 같은 컨텍스트 형식
+            "context": f"- **{word}**: {definition}\n",
+            "question": term_explanations.canonical_question(word),
+        }).strip()
+        term_explanations.save(word, definition, "ko", korean)
+
+    for code in todo:
+        if code == "ko":
+            continue
+        chain = prompt_registry.get_chain(term_explanations.TRANSLATION_PROMPT, llm)
+        translated = chain.invoke({"target_language": CODE_TO_LANGUAGE[code], "korean_answer": korean}).strip()
+        term_explanations.save(word, definition, code, translated)
+    return todo
+
+def main():
+    parser = argparse.ArgumentParser(description="금융 용어 설명 사전 생성 (증분)")
+    parser.add_argument("--languages", nargs="+", default=["ko"], choices=list(CODE_TO_LANGUAGE))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=None, help="앞에서부터 N개 용어만 처리")
+    parser.add_argument("--dry-run", action="store_true", help="생성 대상 개수만 출력")
+    parser.add_argument("--purge", action="store_true", help="현재 프롬프트 버전이 아닌 항목 삭제")
+    args = parser.parse_args()
+
+    if args.purge:
+        for code in CODE_TO_LANGUAGE:
+            print(f"🧹 [{code}] 이전 버전 {term_explanations.purge_stale(code)}건 삭제")
+        return
+
+    terms = load_terms()[:args.limit] if args.limit else load_terms()
+    pending = [t for t in terms
+               if any(not term_explanations.has_current(t["word"], t["definition"], c) for c in args.languages)]
+    versions = ", ".join(f"{c}={term_explanations.prompt_version(c)}" for c in args.languages)
+    print(f"📦 용어 {len(terms)}개 중 생성 대상 {len(pending)}개 (프롬프트 버전: {versions})")
+    if args.dry_run or not pending:
+        return
+
+    t0 = time.time()
+    generated, failed = 0, 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(generate, term, args.languages): term for term in pending}
+        for i, future in enumerate(as_completed(futures), start=1):
+            term = futures[future]
+            try:
+                codes = future.result()
+                generated += len(codes)
+                print(f"   - [{i}/{len(pending)}] {term['word']} -> {', '.join(codes) or '최신 상태'}")
+            except Exception as e:
+                failed += 1
+                print(f"   ❌ [{i}/{len(pending)}] {term['word']} 생성 실패: {e}")
+
+    print(f"✅ 완료: 설명 {generated}건 생성, 실패 {failed}건 (소요시간: {time.time() - t0:.1f}초)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+축소 차원(Matryoshka) 임베딩 컬렉션 생성 + recall / 지연시간 / 임계값 재보정 sweep
+
+text-embedding-3 계열은 앞쪽 d 차원만 잘라 다시 L2 정규화해도 의미가 유지되도록 학습되어 있고,
+API 의 dimensions=d 옵션도 같은 연산을 합니다. 따라서 이미 저장된 3072 차원 벡터를 잘라서
+financial_terms_d{d} 컬렉션을 만들면 재임베딩(API 호출) 없이 축소 차원 색인을 만들 수 있습니다.
+
+각 차원에 대해 질문 목록으로 다음을 측정하고 data/financial_terms_dims.json 에 저장합니다.
+  - recall@k: 전체 차원 컬렉션 top-k 대비 일치율
+  - 임계값: 전체 차원에서 SIMILARITY_THRESHOLD(0.6) 로 채택되던 문서 집합과 가장 잘 일치(F1)하는
+            축소 차원 squared L2 임계값 (정규화가 달라지므로 차원마다 다시 보정)
+  - 검색 지연시간 p50
+FinRAG 는 FINRAG_EMBEDDING_DIM=256 처럼 설정하면 이 파일에서 컬렉션 이름과 임계값을 읽습니다.
+
+사용법:
+    python utils/reindex_dimensions.py                         # 256 / 512 / 1024 차원
+    python utils/reindex_dimensions.py --dims 256 768 --k 5
+    python utils/reindex_dimensions.py --sweep-only            # 컬렉션은 그대로 두고 평가만
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+
+current_file_path = os.path.abspath(__file__)
+project_root = os.path.dirname(os.path.dirname(current_file_path))
+
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import numpy as np
+import chromadb
+
+PERSIST_DIRECTORY = os.path.join(project_root, "data", "financial_terms")
+BASE_COLLECTION = "financial_terms"
+CONFIG_PATH = os.path.join(project_root, "data", "financial_terms_dims.json")
+DEFAULT_QUERIES = os.path.join(project_root, "benchmark", "queries", "knowledge_queries.csv")
+EMBEDDING_MODEL = "text-embedding-3-large"
+BASE_THRESHOLD = 0.6
+BATCH_SIZE = 500
+
+def truncate(vectors: np.ndarray, dim: int) -> np.ndarray:
+    """앞쪽 dim 차원만 남기고 다시 L2 정규화 (API dimensions 옵션과 동일)"""
+    cut = np.asarray(vectors, dtype=np.float32)[..., :dim]
+    norms = np.linalg.norm(cut, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return cut / norms
+
+def collection_name(dim: int) -> str:
+    return f"{BASE_COLLECTION}_d{dim}"
+
+def build_collection(client, base: dict, dim: int):
+    name = collection_name(dim)
+    try:
+        client.delete_collection(name)
+    except Exception:
+        pass
+    collection = client.create_collection(name=name, metadata={"hnsw:space": "l2", "dimensions": dim})
+    vectors = truncate(base["embeddings"], dim)
+    for start in range(0, len(base["ids"]), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        collection.upsert(
+            ids=base["ids"][start:end],
+            embeddings=vectors[start:end].tolist(),
+            documents=base["documents"][start:end],
+            metadatas=base["metadatas"][start:end],
+        )
+    print(f"   💾 {name}: {len(base['ids'])}개 x {dim}차원 저장")
+    return collection
+
+def search(collection, query_vectors: np.ndarray, k: int) -> tuple:
+    """반환: (질의별 [(id, 거리)], 질의당 검색 지연시간 목록)"""
+    results, latencies = [], []
+    for vec in query_vectors:
+        t0 = time.perf_counter()
+        res = collection.query(query_embeddings=[vec.tolist()], n_results=k, include=["distances"])
+        latencies.append(time.perf_counter() - t0)
+        results.append(list(zip(res["ids"][0], res["distances"][0])))
+    return results, latencies
+
+def calibrate_threshold(full: list, reduced: list, base_threshold: float) -> tuple:
+    """전체 차원 채택 집합과 F1 이 최대가 되는 축소 차원 임계값. 반환: (임계값, F1)"""
+    truth = {(qi, doc_id) for qi, hits in enumerate(full) for doc_id, dist in hits if dist <= base_threshold}
+    candidates = sorted({dist for hits in reduced for _, dist in hits})
+    if not truth or not candidates:
+        return base_threshold, 0.0
+    best = (base_threshold, -1.0)
+    for t in candidates:
+        accepted = {(qi, doc_id) for qi, hits in enumerate(reduced) for doc_id, dist in hits if dist <= t}
+        tp = len(accepted & truth)
+        if not tp:
+            continue
+        precision, recall = tp / len(accepted), tp / len(truth)
+        f1 = 2 * precision * recall / (precision + recall)
+        if f1 > best[1]:
+            best = (t, f1)
+    # 경계 바로 위 거리까지 포함되도록 다음 후보와의 중간값 사용
+    idx = candidates.index(best[0])
+    threshold = (best[0] + candidates[idx + 1]) / 2 if idx + 1 < len(candidates) else best[0]
+    return round(float(threshold), 4), round(best[1], 4)
+
+def main():
+    parser = argparse.ArgumentParser(description="축소 차원 컬렉션 생성 및 recall / 임계값 sweep")
+    parser.add_argument("--dims", nargs="+", type=int, default=[256, 512, 1024])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", default=DEFAULT_QUERIES, help="query 컬럼이 있는 CSV")
+    parser.add_argument("--sweep-only", action="store_true", help="컬렉션을 다시 만들지 않고 평가만")
+    args = parser.parse_args()
+
+    from langchain_openai import OpenAIEmbeddings
+    from rag_agent.cached_embeddings import CachedEmbeddings
+
+    client = chromadb.PersistentClient(path=PERSIST_DIRECTORY)
+    base_collection = client.get_collection(BASE_COLLECTION)
+    base = base_collection.get(include=["embeddings", "documents", "metadatas"])
+    base["embeddings"] = np.asarray(base["embeddings"], dtype=np.float32)
+    full_dim = base["embeddings"].shape[1]
+    print(f"📂 {BASE_COLLECTION}: {len(base['ids'])}개 x {full_dim}차원")
+
+    with open(args.queries, "r", encoding="utf-8") as f:
+        queries = [r["query"] for r in csv.DictReader(f)]
+    # 전체 차원 질의 벡터를 한 번만 임베딩하고, 축소 차원은 잘라서 사용 (API dimensions 옵션과 동일)
+    embeddings = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL), model_name=EMBEDDING_MODEL)
+    query_full = np.asarray(embeddings.embed_documents(queries), dtype=np.float32)
+
+    full_results, full_lat = search(base_collection, query_full, args.k)
+    config = {
+        "model": EMBEDDING_MODEL,
+        "k": args.k,
+        "queries": len(queries),
+        "dimensions": {
+            str(full_dim): {"collection": BASE_COLLECTION, "threshold": BASE_THRESHOLD, "recall": 1.0,
+                            "threshold_f1": 1.0, "p50_ms": float(np.median(full_lat) * 1000)},
+        },
+    }
+
+    for dim in sorted(args.dims):
+        if dim >= full_dim:
+            continue
+        collection = (client.get_collection(collection_name(dim)) if args.sweep_only
+                      else build_collection(client, base, dim))
+        reduced_results, latencies = search(collection, truncate(query_full, dim), args.k)
+        overlap = sum(len({d for d, _ in r} & {d for d, _ in f}) for r, f in zip(reduced_results, full_results))
+        recall = overlap / (len(queries) * args.k) if queries else 0.0
+        threshold, f1 = calibrate_threshold(full_results, reduced_results, BASE_THRESHOLD)
+        config["dimensions"][str(dim)] = {
+            "collection": collection_name(dim),
+            "threshold": threshold,
+            "recall": round(recall, 4),
+            "threshold_f1": f1,
+            "p50_ms": float(np.median(latencies) * 1000),
+        }
+
+    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+    print("\n" + "=" * 72)
+    print(f"질문 {len(queries)}개, k={args.k} (기준: {full_dim}차원, 임계값 {BASE_THRESHOLD})")
+    print(f"{'dim':>6} {'collection':<26} {f'recall@{args.k}':>10} {'threshold':>10} {'F1':>6} {'p50':>9}")
+    for dim, c in sorted(config["dimensions"].items(), key=lambda kv: int(kv[0])):
+        print(f"{dim:>6} {c['collection']:<26} {c['recall']:>10.1%} {c['threshold']:>10.4f} "
+              f"{c['threshold_f1']:>6.2f} {c['p50_ms']:>7.2f}ms")
+    print(f"\n✅ 설정 저장: {CONFIG_PATH}  (사용: FINRAG_EMBEDDING_DIM=<dim>)")
+
+if __name__ == "__main__":
+    main()
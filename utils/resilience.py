@@ -0,0 +1,129 @@
+import time
+import asyncio
+import threading
+
+from utils import metrics
+
+# ==========================================
+# 외부 API 호출 보호: 서킷 브레이커 + 헤지(hedged) 요청
+# ==========================================
+# - CircuitBreaker: 연속 실패가 failure_threshold 회 쌓이면 open -> reset_timeout 동안 즉시 거절,
+#   이후 half_open 에서 시험 호출 1건이 성공하면 closed, 실패하면 다시 open
+#   (시험 호출이 취소되면 release() 로 슬롯만 반환 -> 다음 호출이 다시 시험)
+# - hedged(): 첫 요청이 hedge_delay 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 끝난 결과 사용
+#   (지연 꼬리(p95 이상)만 중복 요청하므로 추가 호출은 대략 5% 수준)
+# - hedge_delay_from(): 최근 성공 지연시간 샘플의 p95 로 헤지 지연 계산
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출하지 않고 거절"""
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0          # 연속 실패 횟수
+        self._opened_at = None
+        self._trial_in_flight = False
+        self.rejected = 0
+
+    def _transition(self, state: str):
+        # _lock 보유 상태에서 호출
+        if self._state != state:
+            self._state = state
+            metrics.incr(f"breaker.{self.name}.{state}")
+            if state == OPEN:
+                self._opened_at = time.time()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.time() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """호출 가능 여부. half_open 에서는 시험 호출 1건만 허용"""
+        with self._lock:
+            if self._state == OPEN and time.time() - self._opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+                self._trial_in_flight = False
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            metrics.incr(f"breaker.{self.name}.rejected")
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self._transition(CLOSED)
+
+    def release(self):
+        """결과 없이 끝난 호출(취소 등): 상태는 그대로 두고 half_open 시험 호출 슬롯만 반환"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            retry_in = (max(0.0, self.reset_timeout - (time.time() - self._opened_at))
+                        if self._state == OPEN else 0.0)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "rejected": self.rejected,
+                "opened": metrics.get_counter(f"breaker.{self.name}.{OPEN}"),
+                "retry_in_sec": retry_in,
+            }
+
+def hedge_delay_from(samples_name: str, default: float, min_delay: float, min_samples: int = 20) -> float:
+    """최근 지연시간 샘플 p95 (샘플이 적으면 default), min_delay 이상으로 보정"""
+    summary = metrics.summarize(samples_name)
+    delay = summary["p95"] if summary["count"] >= min_samples else default
+    return max(min_delay, delay)
+
+async def hedged(coro_fn, hedge_delay: float, max_attempts: int = 2, name: str = None):
+    """
+    coro_fn() 을 실행하고 hedge_delay 안에 끝나지 않으면 (또는 실패하면) 다음 시도를 추가로 시작.
+    먼저 성공한 결과를 반환하고 나머지는 취소, 모두 실패하면 마지막 예외를 전달합니다.
+    """
+    first = asyncio.ensure_future(coro_fn())
+    pending = {first}
+    attempts, last_error = 1, None
+    try:
+        while pending:
+            can_hedge = attempts < max_attempts
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay if can_hedge else None,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if name and task is not first:
+                        metrics.incr(f"{name}.hedge_won")
+                    return task.result()
+                last_error = task.exception()
+            if can_hedge and (not done or not pending):
+                # 지연(p95 초과) 또는 실패 -> 같은 요청을 하나 더
+                if name:
+                    metrics.incr(f"{name}.hedged")
+                pending.add(asyncio.ensure_future(coro_fn()))
+                attempts += 1
+        raise last_error
+    finally:
+        for task in pending:
+            task.cancel()
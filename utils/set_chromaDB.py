@@ -1,4 +1,7 @@
 import os
+import json
+import hashlib
+from datetime import datetime
 import chromadb
 from chromadb.utils import embedding_functions
 from dotenv import load_dotenv
@@ -28,98 +31,175 @@ PERSIST_DIRECTORY = os.path.join(current_script_dir, "..", "data", "financial_te
 # 4. 경로를 깔끔하게 정리합니다 (예: /utils/../data -> /data)
 PERSIST_DIRECTORY = os.path.normpath(PERSIST_DIRECTORY)
 
-print(f"📍 확정된 저장 경로: {PERSIST_DIRECTORY}") # 확인용 출력
-
 COLLECTION_NAME = "financial_terms"
+EMBEDDING_MODEL = "text-embedding-3-large"
 BATCH_SIZE = 100
 
+# 구축 완료 시 기록하는 무결성 manifest (행 수 + 내용 해시)
+MANIFEST_PATH = os.path.join(PERSIST_DIRECTORY, "manifest.json")
+
 # ==========================================
-# 2. ChromaDB 초기화
+# 2. ChromaDB 초기화 (지연 생성)
 # ==========================================
-# OpenAI 임베딩 함수 설정
-openai_ef = embedding_functions.OpenAIEmbeddingFunction(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    model_name="text-embedding-3-large"
-)
+# import 만으로 클라이언트/컬렉션이 만들어지지 않도록 처음 사용할 때 생성
+_collection = None
+
+def get_collection():
+    global _collection
+    if _collection is None:
+        # OpenAI 임베딩 함수 설정
+        openai_ef = embedding_functions.OpenAIEmbeddingFunction(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            model_name=EMBEDDING_MODEL
+        )
+        # PersistentClient 설정 (데이터가 파일로 저장됨)
+        client = chromadb.PersistentClient(path=PERSIST_DIRECTORY)
+        # 컬렉션 가져오기 또는 생성
+        _collection = client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            embedding_function=openai_ef
+        )
+    return _collection
 
-# PersistentClient 설정 (데이터가 파일로 저장됨)
-client = chromadb.PersistentClient(path=PERSIST_DIRECTORY)
+# ==========================================
+# 3. 무결성 manifest
+# ==========================================
+def load_rows() -> list:
+    sql = "SELECT id, word, definition FROM terms WHERE definition IS NOT NULL"
+    return get_data(sql) or []  # DB 연결/커서/해제 로직이 이 함수 안에 다 있음
+
+def compute_content_hash(rows: list) -> str:
+    """id 순으로 정렬한 (id, word, definition) 전체의 sha256"""
+    digest = hashlib.sha256()
+    for row in sorted(rows, key=lambda r: str(r['id'])):
+        digest.update(f"{row['id']}\t{row['word']}\t{row['definition']}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def read_manifest() -> dict | None:
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_manifest(rows: list) -> dict:
+    manifest = {
+        "collection": COLLECTION_NAME,
+        "model": EMBEDDING_MODEL,
+        "row_count": len(rows),
+        "content_hash": compute_content_hash(rows),
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    os.makedirs(PERSIST_DIRECTORY, exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+    return manifest
+
+def check_manifest(rows: list = None) -> tuple:
+    """
+    색인이 최신인지 확인. 반환: (정상 여부, 사유)
+    rows 가 None 이면 MySQL 비교 없이 manifest 와 컬렉션 행 수만 확인 (DB 연결 불가 시)
+    """
+    manifest = read_manifest()
+    if manifest is None:
+        return False, "manifest 없음"
+    if manifest.get("collection") != COLLECTION_NAME or manifest.get("model") != EMBEDDING_MODEL:
+        return False, "컬렉션/임베딩 모델 변경"
+    if rows is not None:
+        if manifest.get("row_count") != len(rows):
+            return False, f"행 수 불일치 (manifest {manifest.get('row_count')} / MySQL {len(rows)})"
+        if manifest.get("content_hash") != compute_content_hash(rows):
+            return False, "내용 해시 불일치"
+    stored = get_collection().count()
+    if stored != manifest.get("row_count"):
+        return False, f"컬렉션 행 수 불일치 (manifest {manifest.get('row_count')} / Chroma {stored})"
+    return True, "최신"
 
-# 컬렉션 가져오기 또는 생성
-collection = client.get_or_create_collection(
-    name=COLLECTION_NAME,
-    embedding_function=openai_ef
-)
+# ==========================================
+# 4. 동기화
+# ==========================================
+def build_index(rows: list = None, progress_callback=None) -> dict:
+    """
+    MySQL terms -> ChromaDB 동기화 후 manifest 기록 (실패 시 예외)
+    - 내용이 바뀌지 않은 문서는 다시 임베딩하지 않음 (중단된 구축 이어하기 / 기존 색인 manifest 보강)
+    - MySQL 에서 사라진 용어는 컬렉션에서도 삭제
+    progress_callback(done, total): 배치 저장마다 호출
+    """
+    rows = load_rows() if rows is None else rows
+    if not rows:
+        raise ValueError("저장할 데이터가 없습니다.")
+    print(f"📊 총 {len(rows)}개의 데이터를 가져왔습니다.")
+
+    collection = get_collection()
+
+    # ---------------------------------------------------------
+    # Step 1: 데이터 가공
+    # ---------------------------------------------------------
+    ids_list = []
+    documents_list = []
+    metadatas_list = []
+
+    for row in rows:
+        # ChromaDB ID는 반드시 문자열(String)이어야 함
+        ids_list.append(str(row['id']))
+        # 요청하신 포맷: "word: definition"
+        documents_list.append(f"{row['word']}: {row['definition']}")
+        # 메타데이터 구성
+        metadatas_list.append({
+            "original_id": row['id'],
+            "word": row['word']
+        })
+
+    # ---------------------------------------------------------
+    # Step 2: 변경분만 선별 (이미 같은 문서가 저장돼 있으면 임베딩 생략)
+    # ---------------------------------------------------------
+    existing = collection.get(include=["documents"])
+    stored = dict(zip(existing.get("ids") or [], existing.get("documents") or []))
+    pending = [i for i, doc_id in enumerate(ids_list) if stored.get(doc_id) != documents_list[i]]
+    removed = sorted(set(stored) - set(ids_list))
+    print(f"🔎 변경 {len(pending)}개 / 유지 {len(ids_list) - len(pending)}개 / 삭제 {len(removed)}개")
+
+    # ---------------------------------------------------------
+    # Step 3: 배치 단위로 ChromaDB에 저장 (Upsert)
+    # ---------------------------------------------------------
+    print("💾 ChromaDB 저장(Upsert) 시작...")
+    total_count = len(pending)
+    if progress_callback:
+        progress_callback(0, total_count)
+
+    for i in range(0, total_count, BATCH_SIZE):
+        batch = pending[i : i + BATCH_SIZE]
+        # Upsert (기존에 있으면 업데이트, 없으면 추가)
+        collection.upsert(
+            ids=[ids_list[j] for j in batch],
+            documents=[documents_list[j] for j in batch],
+            metadatas=[metadatas_list[j] for j in batch]
+        )
+
+        # 진행 상황 출력
+        current_progress = min(i + BATCH_SIZE, total_count)
+        print(f"   - Progress: {current_progress} / {total_count} 완료")
+        if progress_callback:
+            progress_callback(current_progress, total_count)
+
+    for i in range(0, len(removed), BATCH_SIZE):
+        collection.delete(ids=removed[i : i + BATCH_SIZE])
+
+    manifest = write_manifest(rows)
+    print(f"🧾 manifest 기록: 행 {manifest['row_count']}개, 해시 {manifest['content_hash'][:12]}")
+    return manifest
 
 def sync_mysql_to_chroma():
     print(f"📂 저장 경로: {os.path.abspath(PERSIST_DIRECTORY)}")
     print("🔄 MySQL 데이터 조회 시작...")
 
     try:
-        # ---------------------------------------------------------
-        # Step 1: handle_sql 모듈을 통해 데이터 조회 (매우 간결해짐!)
-        # ---------------------------------------------------------
-        sql = "SELECT id, word, definition FROM terms WHERE definition IS NOT NULL"
-        rows = get_data(sql)  # DB 연결/커서/해제 로직이 이 함수 안에 다 있음
-
-        if not rows:
-            print("⚠️ 저장할 데이터가 없습니다.")
-            return
-
-        print(f"📊 총 {len(rows)}개의 데이터를 가져왔습니다.")
-
-        # ---------------------------------------------------------
-        # Step 2: 데이터 가공
-        # ---------------------------------------------------------
-        ids_list = []
-        documents_list = []
-        metadatas_list = []
-
-        for row in rows:
-            # ChromaDB ID는 반드시 문자열(String)이어야 함
-            doc_id = str(row['id'])
-            
-            # 요청하신 포맷: "word: definition"
-            content = f"{row['word']}: {row['definition']}"
-            
-            # 메타데이터 구성
-            metadata = {
-                "original_id": row['id'],
-                "word": row['word']
-            }
-
-            ids_list.append(doc_id)
-            documents_list.append(content)
-            metadatas_list.append(metadata)
-
-        # ---------------------------------------------------------
-        # Step 3: 배치 단위로 ChromaDB에 저장 (Upsert)
-        # ---------------------------------------------------------
-        print("💾 ChromaDB 저장(Upsert) 시작...")
-        
-        total_count = len(ids_list)
-        
-        for i in range(0, total_count, BATCH_SIZE):
-            # 슬라이싱으로 배치 나누기
-            batch_ids = ids_list[i : i + BATCH_SIZE]
-            batch_docs = documents_list[i : i + BATCH_SIZE]
-            batch_metas = metadatas_list[i : i + BATCH_SIZE]
-
-            # Upsert (기존에 있으면 업데이트, 없으면 추가)
-            collection.upsert(
-                ids=batch_ids,
-                documents=batch_docs,
-                metadatas=batch_metas
-            )
-            
-            # 진행 상황 출력
-            current_progress = min(i + BATCH_SIZE, total_count)
-            print(f"   - Progress: {current_progress} / {total_count} 완료")
-
+        build_index()
         print("✅ 모든 데이터 동기화 완료!")
-
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
 
 if __name__ == "__main__":
-    sync_mysql_to_chroma()
\ No newline at end of file
+    sync_mysql_to_chroma()
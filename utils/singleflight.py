@@ -0,0 +1,149 @@
+import asyncio
+import threading
+
+# ==========================================
+# Single-flight: 같은 키의 동시 요청 중복 제거
+# ==========================================
+# 같은 키로 동시에 들어온 호출 중 첫 번째(leader)만 fn 을 실행하고,
+# 나머지(follower)는 leader 의 결과(또는 예외)를 그대로 돌려받습니다.
+# 완료 후에는 키가 제거되므로 결과 캐싱은 호출 측 책임입니다.
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0     # 실제 fn 실행 횟수
+        self.coalesced = 0    # leader 결과를 공유받은 호출 수
+
+    def do(self, key, fn):
+        """반환: (결과, shared) - shared 는 다른 호출의 결과를 공유받았는지 여부"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
+
+    def do_many(self, keys, fn):
+        """
+        여러 키의 일괄 버전 (임베딩 배치 등)
+        진행 중이 아닌 키는 모아서 fn(키 목록) 한 번으로 실행하고 (fn 은 같은 순서의 결과 목록 반환),
+        다른 호출이 이미 진행 중인 키는 그 결과를 기다립니다.
+        반환: {키: (결과, shared)}
+        """
+        led, joined = {}, {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get(key)
+                if call is not None:
+                    call.waiters += 1
+                    self.coalesced += 1
+                    joined[key] = call
+                else:
+                    led[key] = self._calls[key] = _Call()
+            if led:
+                self.executed += 1
+
+        out = {}
+        if led:
+            try:
+                results = list(fn(list(led)))
+                if len(results) != len(led):
+                    raise ValueError(f"do_many: 결과 {len(results)}개 != 키 {len(led)}개")
+                for (key, call), result in zip(led.items(), results):
+                    call.result = result
+                    out[key] = (result, False)
+            except BaseException as e:
+                for call in led.values():
+                    call.error = e
+                raise
+            finally:
+                with self._lock:
+                    for key in led:
+                        self._calls.pop(key, None)
+                for call in led.values():
+                    call.event.set()
+
+        # 자기 몫을 먼저 끝낸 뒤 기다리므로 호출끼리 서로 기다리며 멈추지 않음
+        for key, call in joined.items():
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            out[key] = (call.result, True)
+        return out
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), "executed": self.executed, "coalesced": self.coalesced}
+
+# ==========================================
+# 비동기 버전 (이벤트 루프 안의 코루틴용)
+# ==========================================
+# leader 의 코루틴을 Task 로 띄우고 모든 호출이 asyncio.shield 로 기다립니다.
+# 한 호출자가 취소(연결 종료 등)되어도 Task 는 계속 실행되어 나머지 호출자가 결과를 받습니다.
+# 이벤트 루프가 여러 개일 수 있으므로 (루프, 키) 단위로 묶습니다.
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def _forget(self, flight_key, task):
+        with self._lock:
+            if self._tasks.get(flight_key) is task:
+                del self._tasks[flight_key]
+        # 기다리는 호출자가 모두 취소된 경우 "exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key, coro_fn):
+        """반환: (결과, shared) - coro_fn 은 인자 없는 코루틴 함수 (leader 일 때만 호출)"""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(flight_key)
+            shared = task is not None
+            if shared:
+                self.coalesced += 1
+            else:
+                task = self._tasks[flight_key] = loop.create_task(coro_fn())
+                self.executed += 1
+        if not shared:
+            task.add_done_callback(lambda t: self._forget(flight_key, t))
+        return await asyncio.shield(task), shared
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._tasks), "executed": self.executed, "coalesced": self.coalesced}
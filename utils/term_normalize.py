@@ -0,0 +1,36 @@
+import re
+
+# ==========================================
+# 금융 용어 정규화 (공용)
+# ==========================================
+# PDF 목차/본문 대조(pdf_to_mysql, debug_pdf), 로컬 라우터, FinRAG 용어 색인이 모두 같은 규칙을 사용합니다.
+# 띄어쓰기/괄호/구두점을 제거하므로 "총부채 원리금 상환비율" 과 "총부채원리금상환비율" 은 같은 형태가 됩니다.
+
+_STRIP_PATTERN = re.compile(r'[\s\(\)\[\]\-\.,･・/]')
+
+# 정규화 함수 (비교용: 공백/특수문자 제거)
+def normalize(text):
+    if not text: return ""
+    return _STRIP_PATTERN.sub('', text)
+
+def normalize_term(text):
+    """검색용 정규화: normalize + 영문 소문자화 (DSR / dsr 동일 취급)"""
+    return normalize(text).lower()
+
+def normalize_term_with_breaks(text):
+    """
+    normalize_term 결과와, 제거된 공백/구두점이 있던 위치(정규화 문자열 기준 인덱스) 집합을 함께 반환
+    -> 정규화 후에도 어절 경계를 알 수 있음 ("금리 인하" 의 "금리" 는 어절 끝, "금리인하" 는 아님)
+    """
+    if not text: return "", set()
+    chars, breaks = [], set()
+    for ch in text:
+        if _STRIP_PATTERN.match(ch):
+            breaks.add(len(chars))
+        else:
+            chars.append(ch.lower())
+    normalized = "".join(chars)
+    if normalized != normalize_term(text):
+        # 소문자화로 길이가 바뀌는 문자 (드묾): 경계 정보 없이 반환
+        return normalize_term(text), set()
+    return normalized, breaks